@@ -5,6 +5,9 @@ Run:  flask run          (uses FLASK_APP=app.py automatically)
   or: python app.py      (dev server on port 5000)
 """
 
+import signal
+import sys
+
 from flask import Flask
 from config import Config
 from extensions import db, migrate, cors
@@ -17,7 +20,11 @@ def create_app(config_class=Config):
     # ── Initialise extensions ──
     db.init_app(app)
     migrate.init_app(app, db)
-    cors.init_app(app, resources={r"/*": {"origins": app.config["CORS_ORIGINS"]}})
+    cors.init_app(app, resources={r"/*": {"origins": app.config["CORS_ORIGINS"]}},
+                  expose_headers=["X-Next-Cursor"])
+
+    from middleware.token import verified_tokens
+    verified_tokens.max_size = app.config["JWT_CACHE_SIZE"]
 
     # ── Import models so Alembic can detect them ──
     import model  # noqa: F401
@@ -39,14 +46,20 @@ def create_app(config_class=Config):
     app.register_blueprint(doctor_bp)
     app.register_blueprint(payment_bp)
 
-    from services.videosdk import create_room, generate_token
-    import transcription_bot
+    from services.videosdk import generate_token
+    from services import room_pool, transcription_client
+
+    # Each worker keeps the shared room pool topped up once it serves traffic
+    @app.before_request
+    def start_room_pool():
+        room_pool.start(app)
 
     @app.route("/create-meeting", methods=["POST"])
     def legacy_create_meeting():
         from flask import jsonify
         try:
-            room_id = create_room()
+            room_id = room_pool.acquire()
+            db.session.commit()
             token   = generate_token()
             return jsonify({"meetingId": room_id, "token": token})
         except Exception as e:
@@ -57,8 +70,9 @@ def create_app(config_class=Config):
         from flask import jsonify
         try:
             token = generate_token()
-            transcription_bot.start(meeting_id, token)
-            return jsonify({"status": "Transcription started", "meetingId": meeting_id})
+            started = transcription_client.start(meeting_id, token)
+            status  = "Transcription started" if started else "Transcription already running"
+            return jsonify({"status": status, "meetingId": meeting_id})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
@@ -66,7 +80,7 @@ def create_app(config_class=Config):
     def legacy_stop_transcription(meeting_id):
         from flask import jsonify
         try:
-            transcription_bot.stop(meeting_id)
+            transcription_client.stop(meeting_id)
             return jsonify({"status": "Transcription stopped", "meetingId": meeting_id})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
@@ -81,8 +95,13 @@ def create_app(config_class=Config):
 
 
 # ── Dev server entry-point ──
-app = create_app()
+# Spawned helper processes (password hashing pool) re-import the script they
+# were started from as __mp_main__; they must not build a second app.
+if __name__ != "__mp_main__":
+    app = create_app()
 
 if __name__ == "__main__":
+    # Exit normally on SIGTERM so atexit handlers (bots leaving, transcripts sealed) run
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
     print("\nBackend running on http://localhost:5000\n")
     app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""
+archive_transcripts.py – retention and compaction pass over TRANSCRIPTS_DIR.
+
+Deletes meetings older than TRANSCRIPT_RETENTION_DAYS (0 = keep forever),
+and their search index entries.
+Moves transcripts from the old flat layout into per-meeting subdirectories.
+Seals and compresses segments left behind by bots that died. Merges the
+segments of every meeting idle for TRANSCRIPT_COMPACT_AFTER seconds (one per
+rejoin) into a single compressed archive. Safe to run while bots are live;
+meant for cron.
+
+Run:  cd backend && python archive_transcripts.py
+"""
+
+from datetime import datetime, timedelta, timezone
+
+from config import Config
+from services import transcript_index
+from services.transcript_store import maintain
+
+
+def main():
+    stats = maintain(
+        Config.TRANSCRIPTS_DIR,
+        codec=Config.TRANSCRIPT_COMPRESSION,
+        compact_after=Config.TRANSCRIPT_COMPACT_AFTER,
+        retention_days=Config.TRANSCRIPT_RETENTION_DAYS,
+    )
+    if Config.TRANSCRIPT_RETENTION_DAYS and Config.SQLALCHEMY_DATABASE_URI:
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(days=Config.TRANSCRIPT_RETENTION_DAYS)
+        stats["index_pruned"] = transcript_index.prune(Config.SQLALCHEMY_DATABASE_URI, cutoff)
+    for key in ("relocated", "deleted", "sealed", "compressed", "compacted", "segments_merged", "index_pruned"):
+        print(f"  {key:<16} {stats.get(key, 0)}")
+
+
+if __name__ == "__main__":
+    main()
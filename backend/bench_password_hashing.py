@@ -0,0 +1,62 @@
+"""
+bench_password_hashing.py – login (password verification) throughput vs. cores.
+
+Simulates a login storm: many request threads verify passwords at once,
+first inline on the request threads, then through services.passwords'
+process pool with 1, 2, 4 … cpu_count workers.
+
+Run:  cd backend && python bench_password_hashing.py [logins] [method]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from services import passwords
+
+LOGINS  = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+METHOD  = sys.argv[2] if len(sys.argv) > 2 else "scrypt:32768:8:1"
+THREADS = 32                                   # concurrent request threads
+
+
+def run(workers: int) -> float:
+    """Return verified logins per second with *workers* hashing processes (0 = inline)."""
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_METHOD=METHOD, PASSWORD_HASH_WORKERS=workers)
+    stored = generate_password_hash("correct horse", METHOD)
+
+    def login(_):
+        with app.app_context():
+            assert passwords.verify_password(stored, "correct horse")
+
+    with app.app_context():
+        if workers:
+            passwords.verify_password(stored, "warm-up")     # spawn the pool first
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=THREADS) as pool:
+        list(pool.map(login, range(LOGINS)))
+    elapsed = time.perf_counter() - start
+
+    passwords.shutdown()
+    return LOGINS / elapsed
+
+
+if __name__ == "__main__":
+    cores = os.cpu_count() or 1
+    print(f"{LOGINS} logins, {THREADS} request threads, method {METHOD}, {cores} cores\n")
+
+    baseline = run(0)
+    print(f"  inline (request threads) : {baseline:8.1f} logins/s")
+
+    workers = 1
+    while True:
+        rate = run(workers)
+        print(f"  pool, {workers:2d} worker(s)       : {rate:8.1f} logins/s  ({rate / baseline:.2f}x)")
+        if workers >= cores:
+            break
+        workers = min(workers * 2, cores)
@@ -0,0 +1,51 @@
+"""
+bench_transcript_writer.py – transcript lines/sec, per-line open/close vs. buffered.
+
+Run:  cd backend && python bench_transcript_writer.py [lines]
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from services.transcript_writer import TranscriptWriter
+
+LINES = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+LINE  = "Dr. Ananya Sharma: What is the purpose and agenda of today's consultation?"
+
+
+def per_line_open(path: str):
+    """The previous _append: open, write one line, close."""
+    for _ in range(LINES):
+        ts = datetime.now().strftime("%H:%M:%S")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(f"[{ts}] {LINE}\n")
+
+
+def buffered(path: str):
+    writer = TranscriptWriter(path)
+    for _ in range(LINES):
+        ts = datetime.now().strftime("%H:%M:%S")
+        writer.write(f"[{ts}] {LINE}")
+    writer.close()
+
+
+def measure(fn) -> float:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.txt")
+        start = time.perf_counter()
+        fn(path)
+        elapsed = time.perf_counter() - start
+        with open(path, encoding="utf-8") as f:
+            assert sum(1 for _ in f) == LINES, "lines were lost"
+    return LINES / elapsed
+
+
+if __name__ == "__main__":
+    before = measure(per_line_open)
+    after  = measure(buffered)
+    print(f"{LINES} lines")
+    print(f"  open/write/close per line : {before:12,.0f} lines/s")
+    print(f"  buffered writer           : {after:12,.0f} lines/s  ({after / before:.1f}x)")
@@ -8,11 +8,14 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+DEFAULT_SECRET_KEY = "change-me-in-production"
+
+
 class Config:
     """Base configuration."""
 
     # ── Flask ──
-    SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-production")
+    SECRET_KEY = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
 
     # ── Database ──
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
@@ -21,7 +24,54 @@ class Config:
     # ── VideoSDK ──
     VIDEOSDK_API_KEY    = os.getenv("VIDEOSDK_API_KEY")
     VIDEOSDK_SECRET_KEY = os.getenv("VIDEOSDK_SECRET_KEY")
-    VIDEOSDK_API_ENDPOINT = "https://api.videosdk.live/v2/rooms"
+    VIDEOSDK_API_ENDPOINT = os.getenv("VIDEOSDK_API_ENDPOINT", "https://api.videosdk.live/v2/rooms")
+    VIDEOSDK_CONNECT_TIMEOUT = float(os.getenv("VIDEOSDK_CONNECT_TIMEOUT", "3"))    # seconds
+    VIDEOSDK_READ_TIMEOUT    = float(os.getenv("VIDEOSDK_READ_TIMEOUT", "10"))      # seconds
+    VIDEOSDK_RETRIES         = int(os.getenv("VIDEOSDK_RETRIES", "2"))
+    VIDEOSDK_BACKOFF         = float(os.getenv("VIDEOSDK_BACKOFF", "0.5"))          # doubled per retry, jittered
+    VIDEOSDK_POOL_SIZE       = int(os.getenv("VIDEOSDK_POOL_SIZE", "10"))           # keep-alive connections
+    # Pre-created rooms (services/room_pool.py). The pool holds as many rooms as
+    # were claimed in the last ROOM_POOL_WINDOW seconds, within MIN..MAX (MAX 0 = off).
+    ROOM_POOL_MIN             = int(os.getenv("ROOM_POOL_MIN", "2"))
+    ROOM_POOL_MAX             = int(os.getenv("ROOM_POOL_MAX", "50"))
+    ROOM_POOL_WINDOW          = int(os.getenv("ROOM_POOL_WINDOW", "900"))           # seconds
+    ROOM_POOL_MAX_AGE         = int(os.getenv("ROOM_POOL_MAX_AGE", str(12 * 3600)))  # seconds before recycling
+    ROOM_POOL_REFILL_INTERVAL = float(os.getenv("ROOM_POOL_REFILL_INTERVAL", "30"))  # seconds
+
+    # ── Transcription bots ──
+    TRANSCRIPTS_DIR = os.getenv("TRANSCRIPTS_DIR") or os.path.join(os.path.dirname(__file__), "transcripts")
+    # Segments roll over at this size and are compressed once sealed: "gzip", "zstd"
+    # (needs the optional zstandard package, else gzip is used) or "none".
+    TRANSCRIPT_SEGMENT_BYTES  = int(os.getenv("TRANSCRIPT_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+    TRANSCRIPT_COMPRESSION    = os.getenv("TRANSCRIPT_COMPRESSION", "gzip")
+    TRANSCRIPT_COMPACT_AFTER  = int(os.getenv("TRANSCRIPT_COMPACT_AFTER", str(6 * 3600)))   # idle seconds
+    TRANSCRIPT_RETENTION_DAYS = float(os.getenv("TRANSCRIPT_RETENTION_DAYS", "0"))          # 0 = keep forever
+    # Empty address = bots run inside the API process. Otherwise "host:port" or a
+    # Unix socket path of the worker supervisor (python transcription_workers.py).
+    TRANSCRIPTION_WORKER_ADDRESS  = os.getenv("TRANSCRIPTION_WORKER_ADDRESS", "")
+    TRANSCRIPTION_WORKER_KEY      = os.getenv("TRANSCRIPTION_WORKER_KEY", "")   # socket authkey; default SECRET_KEY
+    TRANSCRIPTION_WORKERS         = int(os.getenv("TRANSCRIPTION_WORKERS", str(os.cpu_count() or 1)))
+    TRANSCRIPTION_MEETING_FACTORY = os.getenv("TRANSCRIPTION_MEETING_FACTORY", "")  # "module:callable", tests only
+    TRANSCRIPTION_JOIN_TIMEOUT    = float(os.getenv("TRANSCRIPTION_JOIN_TIMEOUT", "15"))  # seconds per attempt
+    TRANSCRIPTION_JOIN_RETRIES    = int(os.getenv("TRANSCRIPTION_JOIN_RETRIES", "3"))
+    TRANSCRIPTION_JOIN_BACKOFF    = float(os.getenv("TRANSCRIPTION_JOIN_BACKOFF", "1"))   # doubled per retry, jittered
+
+    # ── Auth ──
+    PRINCIPAL_CACHE_TTL  = int(os.getenv("PRINCIPAL_CACHE_TTL", "60"))      # seconds
+    PRINCIPAL_CACHE_SIZE = int(os.getenv("PRINCIPAL_CACHE_SIZE", "10000"))
+    JWT_CACHE_SIZE       = int(os.getenv("JWT_CACHE_SIZE", "10000"))      # verified tokens kept
+
+    # Revoked-token Bloom filter (see middleware/revocation.py)
+    REVOCATION_BLOOM_CAPACITY   = int(os.getenv("REVOCATION_BLOOM_CAPACITY", "100000"))
+    REVOCATION_BLOOM_ERROR_RATE = float(os.getenv("REVOCATION_BLOOM_ERROR_RATE", "0.001"))
+    REVOCATION_SYNC_INTERVAL    = int(os.getenv("REVOCATION_SYNC_INTERVAL", "5"))       # seconds
+    REVOCATION_REBUILD_INTERVAL = int(os.getenv("REVOCATION_REBUILD_INTERVAL", "3600")) # seconds
+
+    # Full werkzeug method string incl. cost, e.g. "scrypt:32768:8:1" or
+    # "pbkdf2:sha256:1000000". Stored hashes with other parameters are
+    # upgraded on the next successful login.
+    PASSWORD_HASH_METHOD  = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 1)))  # 0 = inline
 
     # ── CORS ──
     CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*")
@@ -0,0 +1,122 @@
+"""
+convert_transcripts.py – turn legacy ``.txt`` transcripts into JSONL.
+
+Old transcripts are ``<meeting_id>_<YYYYmmdd_HHMMSS>.txt`` files of
+``[HH:MM:SS] name: text`` lines, one file per (re)join. All files of a
+meeting are merged, in order, into ``<meeting_id>.jsonl`` plus its index
+(see services/transcript_store.py), compressed once written. Interim hypotheses are collapsed with
+the utterance stabilizer unless ``--raw`` is given, in which case every line
+is kept as a non-final record.
+
+Run:  cd backend && python convert_transcripts.py [--raw] [--delete] [files...]
+      (default: every .txt file in TRANSCRIPTS_DIR)
+"""
+
+import argparse
+import glob
+import os
+import re
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from config import Config
+from services.transcript_stabilizer import UtteranceStabilizer
+from services.transcript_store import TranscriptLog, read_meta
+
+FILE_NAME = re.compile(r"^(?P<meeting>.+)_(?P<stamp>\d{8}_\d{6})\.txt$")
+LINE      = re.compile(r"^\[(\d{2}):(\d{2}):(\d{2})\] (.*)$")
+STATE     = "State changed → "
+
+
+def _parse_file(path: str, opened: datetime):
+    """Yield (epoch seconds, kind, speaker, text) for each line of a legacy file."""
+    day, previous = opened.date(), None
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            match = LINE.match(raw.rstrip("\n"))
+            if not match:
+                continue
+            hours, minutes, seconds, content = match.groups()
+            at = datetime.combine(day, datetime.min.time()) + timedelta(
+                hours=int(hours), minutes=int(minutes), seconds=int(seconds))
+            if previous is not None and at < previous:
+                day += timedelta(days=1)            # crossed midnight
+                at  += timedelta(days=1)
+            previous = at
+
+            if content.startswith("==="):
+                kind, speaker, text = "session", None, "ended" if "ended" in content else "started"
+            elif content.startswith(STATE):
+                kind, speaker, text = "state", None, content[len(STATE):]
+            else:
+                speaker, sep, text = content.partition(": ")
+                kind = "text"
+                if not sep:
+                    speaker, text = None, content
+            yield at.timestamp(), kind, speaker, text
+
+
+def convert_meeting(directory: str, meeting_id: str, files: list, raw: bool = False) -> bool:
+    """Merge a meeting's legacy files (oldest first) into its JSONL transcript."""
+    log = None
+    stabilizer = UtteranceStabilizer()
+
+    def write_utterances(utterances, now):
+        for u in utterances:
+            log.append("text", u.text, speaker=u.name, started_at=u.started, t=now - log.epoch)
+
+    now = None
+    for path, opened in files:
+        for now, kind, speaker, text in _parse_file(path, opened):
+            if log is None:
+                log = TranscriptLog(directory, meeting_id, epoch=now,
+                                    segment_bytes=Config.TRANSCRIPT_SEGMENT_BYTES,
+                                    codec=Config.TRANSCRIPT_COMPRESSION)
+            if kind == "text" and not raw:
+                write_utterances(stabilizer.feed(speaker or "", speaker or "Unknown", text, now=now), now)
+                continue
+            if kind == "session" and text == "ended":
+                write_utterances(stabilizer.flush(), now)
+            log.append(kind, text, speaker=speaker, final=kind != "text", t=now - log.epoch)
+        if log is not None:
+            write_utterances(stabilizer.flush(), now)   # each file was one bot session
+
+    if log is None:
+        return False
+    log.close()
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("files", nargs="*", help="legacy .txt transcripts (default: all in TRANSCRIPTS_DIR)")
+    parser.add_argument("--raw", action="store_true", help="keep every interim line as a non-final record")
+    parser.add_argument("--delete", action="store_true", help="remove the .txt files once converted")
+    args = parser.parse_args()
+
+    directory = Config.TRANSCRIPTS_DIR
+    paths = args.files or glob.glob(os.path.join(directory, "*.txt"))
+
+    meetings = defaultdict(list)
+    for path in paths:
+        match = FILE_NAME.match(os.path.basename(path))
+        if not match:
+            print(f"  skip  {path} (not <meeting>_<YYYYmmdd_HHMMSS>.txt)")
+            continue
+        opened = datetime.strptime(match["stamp"], "%Y%m%d_%H%M%S")
+        meetings[match["meeting"]].append((path, opened))
+
+    for meeting_id, files in sorted(meetings.items()):
+        if read_meta(directory, meeting_id) is not None:
+            print(f"  skip  {meeting_id} (already has a JSONL transcript)")
+            continue
+        files.sort(key=lambda item: item[1])
+        converted = convert_meeting(directory, meeting_id, files, raw=args.raw)
+        print(f"  {'wrote' if converted else 'empty'} {meeting_id}  ({len(files)} file(s))")
+        if args.delete and converted:
+            for path, _ in files:
+                os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
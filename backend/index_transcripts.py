@@ -0,0 +1,57 @@
+"""
+index_transcripts.py – backfill the transcript search index.
+
+Bots index utterances as they are finalized; this adds transcripts written
+before the index existed (or converted with convert_transcripts.py). Meetings
+that already have entries, or have no appointment, are skipped.
+
+Run:  cd backend && python index_transcripts.py [meeting_ids...]
+      (default: every meeting in TRANSCRIPTS_DIR)
+"""
+
+import argparse
+
+from sqlalchemy import select
+
+from config import Config
+from model import TranscriptEntry
+from services.transcript_index import MAX_BATCH, IndexWriter
+from services.transcript_store import list_meetings, read, read_meta
+
+
+def index_meeting(writer: IndexWriter, directory: str, meeting_id: str) -> int:
+    """Insert every finalized utterance of *meeting_id*; returns the number indexed."""
+    epoch = read_meta(directory, meeting_id)["epoch"]
+    indexed, batch = 0, []
+    for record in read(directory, meeting_id):
+        if record.get("kind") != "text" or not record.get("final"):
+            continue
+        batch.append((meeting_id, epoch, record))
+        if len(batch) >= MAX_BATCH:
+            indexed += writer.flush(batch)
+            batch = []
+    return indexed + (writer.flush(batch) if batch else 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("meetings", nargs="*", help="meeting ids (default: all in TRANSCRIPTS_DIR)")
+    args = parser.parse_args()
+
+    directory = Config.TRANSCRIPTS_DIR
+    writer = IndexWriter(Config.SQLALCHEMY_DATABASE_URI)
+    with writer.engine.connect() as conn:
+        done = set(conn.scalars(select(TranscriptEntry.meeting_id).distinct()))
+
+    for meeting_id in args.meetings or list_meetings(directory):
+        if meeting_id in done:
+            print(f"  skip  {meeting_id} (already indexed)")
+            continue
+        if read_meta(directory, meeting_id) is None:
+            print(f"  skip  {meeting_id} (no transcript)")
+            continue
+        print(f"  {index_meeting(writer, directory, meeting_id):>5} {meeting_id}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 from middleware.auth import token_required, role_required
-from middleware.token import generate_tokens, create_token, decode_token
+from middleware.principal import Principal, load_principal
+from middleware.revocation import revocations
+from middleware.token import generate_tokens, create_token, decode_token, verified_tokens
 
 __all__ = [
     "token_required",
     "role_required",
+    "Principal",
+    "load_principal",
+    "revocations",
     "generate_tokens",
     "create_token",
     "decode_token",
+    "verified_tokens",
 ]
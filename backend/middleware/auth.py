@@ -20,14 +20,19 @@ Usage
 from functools import wraps
 
 import jwt
-from flask import request, jsonify
+from flask import g, request, jsonify
 
+from middleware.principal import load_principal
+from middleware.revocation import revocations
 from middleware.token import decode_token
-from model import get_account_by_role
 
 
 def token_required(f):
-    """Validate the Bearer access token and inject ``current_user`` into kwargs."""
+    """Validate the Bearer access token and inject ``current_user`` into kwargs.
+
+    ``current_user`` is a :class:`~middleware.principal.Principal`: ``id`` and
+    ``role`` come from the token, other attributes load the account lazily.
+    """
 
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -49,11 +54,15 @@ def token_required(f):
         if payload.get("type") != "access":
             return jsonify({"error": "Invalid token type"}), 401
 
+        if revocations.is_revoked(payload.get("jti")):
+            return jsonify({"error": "Token has been revoked"}), 401
+
         role = payload.get("role", "user")
-        account = get_account_by_role(role, int(payload["sub"]))
+        account = load_principal(role, int(payload["sub"]))
         if not account:
             return jsonify({"error": "Account not found"}), 401
 
+        g.token_payload = payload
         kwargs["current_user"] = account
         return f(*args, **kwargs)
 
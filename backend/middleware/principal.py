@@ -0,0 +1,113 @@
+"""
+Authenticated principal – identity of the caller without a DB round-trip.
+
+``token_required`` used to load the full User/Doctor row on every request
+just to confirm the account still exists. Instead, accounts that were seen
+recently are remembered in a bounded TTL/LRU cache keyed by ``(role, sub)``
+and the handler receives a lightweight :class:`Principal`. Reading ``id`` or
+``role`` is free; any other attribute loads the ORM row on first use.
+
+Entries are dropped after any commit that updates or deletes the account
+(profile edits, password changes, deletion), and expire after
+``PRINCIPAL_CACHE_TTL`` seconds so other workers converge too.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from flask import abort, current_app, jsonify, make_response
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from extensions import db
+from model import Doctor, User, get_account_by_role
+
+_lock  = threading.Lock()
+_cache: OrderedDict = OrderedDict()         # (role, id)  →  expiry (monotonic)
+
+
+class Principal:
+    """The authenticated caller. Proxies to the ORM row, loaded lazily."""
+
+    __slots__ = ("id", "role", "_account")
+
+    def __init__(self, account_id: int, role: str, account=None):
+        object.__setattr__(self, "id", account_id)
+        object.__setattr__(self, "role", role)
+        object.__setattr__(self, "_account", account)
+
+    @property
+    def account(self):
+        """The User/Doctor row (loaded on first access)."""
+        if self._account is None:
+            account = get_account_by_role(self.role, self.id)
+            if account is None:
+                # Deleted by another worker within the cache TTL
+                forget(self.role, self.id)
+                abort(make_response(jsonify({"error": "Account not found"}), 401))
+            object.__setattr__(self, "_account", account)
+        return self._account
+
+    def __getattr__(self, name):
+        return getattr(self.account, name)
+
+    def __setattr__(self, name, value):
+        if name in Principal.__slots__:
+            raise AttributeError(f"{name} is read-only on a Principal")
+        setattr(self.account, name, value)
+
+    def __repr__(self):
+        return f"<Principal {self.role}:{self.id}>"
+
+
+def load_principal(role: str, account_id: int):
+    """Return a Principal for a verified token, or None if the account is gone."""
+    key = (role, account_id)
+    now = time.monotonic()
+
+    with _lock:
+        expiry = _cache.get(key)
+        if expiry is not None and expiry > now:
+            _cache.move_to_end(key)
+            return Principal(account_id, role)
+
+    account = get_account_by_role(role, account_id)
+    if account is None:
+        forget(role, account_id)
+        return None
+
+    ttl  = current_app.config.get("PRINCIPAL_CACHE_TTL", 60)
+    size = current_app.config.get("PRINCIPAL_CACHE_SIZE", 10_000)
+    with _lock:
+        _cache[key] = now + ttl
+        _cache.move_to_end(key)
+        while len(_cache) > size:
+            _cache.popitem(last=False)
+    return Principal(account_id, role, account)
+
+
+def forget(role: str, account_id: int):
+    """Drop a cached principal (e.g. after its account changed)."""
+    with _lock:
+        _cache.pop((role, account_id), None)
+
+
+# ── Invalidate when an account row is updated or deleted ──
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+@event.listens_for(Doctor, "after_update")
+@event.listens_for(Doctor, "after_delete")
+def _mark_changed(mapper, connection, target):
+    object_session(target).info.setdefault("principals_dirty", set()).add((target.role, target.id))
+
+
+@event.listens_for(db.session, "after_commit")
+def _after_commit(session):
+    for role, account_id in session.info.pop("principals_dirty", ()):
+        forget(role, account_id)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("principals_dirty", None)
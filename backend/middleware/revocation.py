@@ -0,0 +1,163 @@
+"""
+Token revocation – Bloom filter in front of the ``revoked_tokens`` denylist.
+
+Every authenticated request must ask "was this jti revoked?", and the answer
+is almost always no. Each process keeps a Bloom filter of revoked jtis, so
+that case is answered from memory with no I/O. Only a Bloom hit (a real
+revocation or a rare false positive) is confirmed against the database.
+
+Other workers' revocations reach the local filter through an incremental
+sync every ``REVOCATION_SYNC_INTERVAL`` seconds. Every
+``REVOCATION_REBUILD_INTERVAL`` seconds a background thread prunes expired
+denylist rows and rebuilds the filter, so no request waits on the DELETE;
+requests keep using the previous filter until the new one is swapped in.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from model import RevokedToken
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on SHA-256)."""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity    = max(capacity, 1)
+        self.size   = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits   = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha256(key.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class RevocationStore:
+    """Process-local view of the revoked-token denylist."""
+
+    def __init__(self):
+        self._lock         = threading.Lock()
+        self._bloom        = None
+        self._watermark    = None        # newest revoked_at already in the filter
+        self._next_sync    = 0.0
+        self._next_rebuild = 0.0
+        self._rebuilding   = False
+
+    # ── maintenance ──
+    def _build(self):
+        """A fresh filter of the live denylist and the time it was read."""
+        now = datetime.utcnow()
+        with db.engine.connect() as conn:
+            jtis = conn.execute(select(RevokedToken.jti)).scalars().all()
+
+        config = current_app.config
+        bloom  = BloomFilter(max(config["REVOCATION_BLOOM_CAPACITY"], 2 * len(jtis)),
+                             config["REVOCATION_BLOOM_ERROR_RATE"])
+        for jti in jtis:
+            bloom.add(jti)
+        return bloom, now
+
+    def _rebuild_in_background(self, app):
+        """Prune expired rows, then swap in a filter without them."""
+        try:
+            with app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(delete(RevokedToken).where(RevokedToken.expires_at < datetime.utcnow()))
+                bloom, watermark = self._build()
+                with self._lock:
+                    old = self._bloom
+                    self._bloom, self._watermark = bloom, watermark
+                    try:
+                        self._sync()        # revocations committed while the new filter was built
+                    except Exception:
+                        self._bloom = old
+                        raise
+        except Exception as e:
+            print(f"[Revocation] rebuild failed, keeping the current filter: {e!r}")
+        finally:
+            self._rebuilding = False
+
+    def _sync(self):
+        """Add jtis revoked by other workers since the last sync."""
+        # Overlap by one interval to tolerate clock skew between hosts
+        since = self._watermark - timedelta(seconds=2 * current_app.config["REVOCATION_SYNC_INTERVAL"])
+        now = datetime.utcnow()
+        with db.engine.connect() as conn:
+            jtis = conn.execute(
+                select(RevokedToken.jti).where(RevokedToken.revoked_at >= since)
+            ).scalars().all()
+        for jti in jtis:
+            self._bloom.add(jti)
+        self._watermark = now
+
+    def _refresh(self):
+        now = time.monotonic()
+        if self._bloom is not None and now < self._next_sync:
+            return
+        config = current_app.config
+        with self._lock:
+            if self._bloom is None:                 # first use: nothing to answer from yet
+                self._bloom, self._watermark = self._build()
+                self._next_rebuild = now + config["REVOCATION_REBUILD_INTERVAL"]
+            elif now >= self._next_sync:
+                self._sync()
+            self._next_sync = now + config["REVOCATION_SYNC_INTERVAL"]
+
+            if now >= self._next_rebuild and not self._rebuilding:
+                self._rebuilding = True
+                self._next_rebuild = now + config["REVOCATION_REBUILD_INTERVAL"]
+                threading.Thread(target=self._rebuild_in_background, args=(current_app._get_current_object(),),
+                                 name="revocation-rebuild", daemon=True).start()
+
+    # ── public API ──
+    def is_revoked(self, jti) -> bool:
+        """True if *jti* is on the denylist. No I/O unless the filter matches."""
+        if not jti:
+            return False                # legacy token issued before jti existed
+        self._refresh()
+        if jti not in self._bloom:
+            return False
+        return db.session.get(RevokedToken, jti) is not None
+
+    def revoke(self, jti, exp: int) -> bool:
+        """Denylist *jti* until *exp* (epoch seconds).
+
+        Returns False if it was already revoked – the insert is the atomic
+        "first one wins" check used by refresh-token rotation – or if it has
+        no jti and so cannot be revoked at all.
+        """
+        if not jti:
+            return False
+        expires_at = datetime.fromtimestamp(exp, timezone.utc).replace(tzinfo=None)
+        db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            return False
+
+        self._refresh()
+        with self._lock:
+            self._bloom.add(jti)
+        return True
+
+
+revocations = RevocationStore()
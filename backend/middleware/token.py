@@ -5,6 +5,11 @@ Access  token : 15 min   – sent with every authenticated request.
 Refresh token : 30 days  – used only to obtain a new access token.
 """
 
+import hashlib
+import threading
+import uuid
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
 
 import jwt
@@ -21,12 +26,13 @@ def create_token(
     expires_delta: timedelta,
     token_type: str = "access",
 ) -> str:
-    """Return a signed HS256 JWT string."""
+    """Return a signed HS256 JWT string with a unique ``jti``."""
     now = datetime.now(timezone.utc)
     payload = {
         "sub":  str(user_id),
         "role": role,
         "type": token_type,
+        "jti":  uuid.uuid4().hex,          # lets a single token be revoked
         "iat":  now,
         "exp":  now + expires_delta,
     }
@@ -41,6 +47,75 @@ def generate_tokens(user) -> dict:
     }
 
 
+class VerifiedTokenCache:
+    """Bounded LRU of already-verified JWT payloads, keyed by token digest.
+
+    Clients poll with the same access token every few seconds; remembering the
+    payload until its ``exp`` skips the base64/JSON/HMAC work on repeat calls.
+    Only signature + expiry verification is cached – revocation is checked by
+    the caller on every request.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self.hits     = 0
+        self.misses   = 0
+        self._lock    = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()   # digest → (secret, payload)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str, secret: str):
+        """Return a copy of the cached payload, or None on a miss."""
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != secret:
+                self.misses += 1
+                return None
+            payload = entry[1]
+            if payload["exp"] <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(payload)
+
+    def put(self, token: str, secret: str, payload: dict):
+        if "exp" not in payload:
+            return                                  # never cache non-expiring tokens
+        with self._lock:
+            self._entries[self._digest(token)] = (secret, dict(payload))
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+verified_tokens = VerifiedTokenCache()
+
+
 def decode_token(token: str) -> dict:
-    """Decode and verify a JWT. Raises jwt.InvalidTokenError on failure."""
-    return jwt.decode(token, current_app.config["SECRET_KEY"], algorithms=["HS256"])
+    """Decode and verify a JWT. Raises jwt.InvalidTokenError on failure.
+
+    Previously verified tokens are served from ``verified_tokens`` until they
+    expire; an expired cached token falls through to ``jwt.decode`` so the
+    caller still gets ``ExpiredSignatureError``.
+    """
+    secret = current_app.config["SECRET_KEY"]
+    payload = verified_tokens.get(token, secret)
+    if payload is not None:
+        return payload
+
+    payload = jwt.decode(token, secret, algorithms=["HS256"])
+    verified_tokens.put(token, secret, payload)
+    return payload
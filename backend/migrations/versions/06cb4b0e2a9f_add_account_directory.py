@@ -0,0 +1,40 @@
+"""Add account directory (email → role + id)
+
+Revision ID: 06cb4b0e2a9f
+Revises: a732d4cae84f
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '06cb4b0e2a9f'
+down_revision = 'a732d4cae84f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'account_directory',
+        sa.Column('email', sa.String(120), primary_key=True),
+        sa.Column('role', sa.String(10), nullable=False),
+        sa.Column('account_id', sa.Integer(), nullable=False),
+        sa.UniqueConstraint('role', 'account_id', name='uq_account_directory_role_account'),
+    )
+
+    # Backfill – fails loudly if an email is already shared by a user and a doctor
+    op.execute(
+        "INSERT INTO account_directory (email, role, account_id) "
+        "SELECT email, 'user', id FROM users"
+    )
+    op.execute(
+        "INSERT INTO account_directory (email, role, account_id) "
+        "SELECT email, 'doctor', id FROM doctors"
+    )
+
+
+def downgrade():
+    op.drop_table('account_directory')
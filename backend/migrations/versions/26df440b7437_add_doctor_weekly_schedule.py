@@ -0,0 +1,70 @@
+"""Add structured doctor weekly schedule
+
+Revision ID: 26df440b7437
+Revises: 8727d74f6966
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import re
+from datetime import datetime
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '26df440b7437'
+down_revision = '8727d74f6966'
+branch_labels = None
+depends_on = None
+
+
+# Same parser as model.parse_timings (migrations must not import the app)
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+TIMINGS_RE = re.compile(
+    r"(mon|tue|wed|thu|fri|sat|sun)\w*\s*[–-]\s*(mon|tue|wed|thu|fri|sat|sun)\w*\s*,\s*"
+    r"(\d{1,2}:\d{2}\s*[ap]m)\s*[–-]\s*(\d{1,2}:\d{2}\s*[ap]m)",
+    re.IGNORECASE,
+)
+
+
+def _parse_timings(timings):
+    match = TIMINGS_RE.search(timings or "")
+    if not match:
+        return None
+    first, last, start, end = match.groups()
+    start = datetime.strptime(start.upper().replace(" ", ""), "%I:%M%p").strftime("%H:%M")
+    end   = datetime.strptime(end.upper().replace(" ", ""), "%I:%M%p").strftime("%H:%M")
+    days  = WEEKDAYS[WEEKDAYS.index(first.lower()):WEEKDAYS.index(last.lower()) + 1]
+    return {day: [[start, end]] for day in days}
+
+
+def upgrade():
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('weekly_schedule', sa.JSON(), nullable=True))
+        batch_op.add_column(sa.Column('slot_minutes', sa.Integer(), server_default='30'))
+
+    # Backfill from the free-text timings; unparseable rows stay NULL and keep
+    # showing their legacy text. Skipped when only rendering --sql.
+    if context.is_offline_mode():
+        return
+
+    doctors = sa.table(
+        'doctors',
+        sa.column('id', sa.Integer),
+        sa.column('timings', sa.String),
+        sa.column('weekly_schedule', sa.JSON),
+    )
+    bind = op.get_bind()
+    for row in bind.execute(sa.select(doctors.c.id, doctors.c.timings)).fetchall():
+        schedule = _parse_timings(row.timings)
+        if schedule:
+            bind.execute(
+                doctors.update().where(doctors.c.id == row.id).values(weekly_schedule=schedule)
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('doctors', schema=None) as batch_op:
+        batch_op.drop_column('slot_minutes')
+        batch_op.drop_column('weekly_schedule')
@@ -0,0 +1,59 @@
+"""Add searchable transcript entries
+
+Revision ID: 3f1b7c9a2d64
+Revises: 8d94f6c23180
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1b7c9a2d64'
+down_revision = '8d94f6c23180'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'transcript_entries',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('appointment_id', sa.Integer(),
+                  sa.ForeignKey('appointments.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('patient_id', sa.Integer(), nullable=False),
+        sa.Column('doctor_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('meeting_id', sa.String(120), nullable=False),
+        sa.Column('offset_seconds', sa.Float(), nullable=False),
+        sa.Column('spoken_at', sa.DateTime(), nullable=False),
+        sa.Column('speaker', sa.String(200)),
+        sa.Column('text', sa.Text(), nullable=False),
+    )
+    op.create_index('ix_transcript_entries_appointment_id', 'transcript_entries', ['appointment_id'])
+    op.create_index('ix_transcript_entries_patient_spoken', 'transcript_entries', ['patient_id', 'spoken_at'])
+    op.create_index('ix_transcript_entries_doctor_spoken', 'transcript_entries', ['doctor_id', 'spoken_at'])
+    op.create_index('ix_transcript_entries_user_spoken', 'transcript_entries', ['user_id', 'spoken_at'])
+
+    # SQLite has no tsvector; the app falls back to an in-process index there.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute(
+        "ALTER TABLE transcript_entries ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('simple', text)) STORED"
+    )
+    op.create_index(
+        'ix_transcript_entries_search_vector', 'transcript_entries', ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'postgresql':
+        op.drop_index('ix_transcript_entries_search_vector', table_name='transcript_entries')
+    op.drop_index('ix_transcript_entries_user_spoken', table_name='transcript_entries')
+    op.drop_index('ix_transcript_entries_doctor_spoken', table_name='transcript_entries')
+    op.drop_index('ix_transcript_entries_patient_spoken', table_name='transcript_entries')
+    op.drop_index('ix_transcript_entries_appointment_id', table_name='transcript_entries')
+    op.drop_table('transcript_entries')
@@ -0,0 +1,40 @@
+"""Add pre-created VideoSDK room pool
+
+Revision ID: 5e8a1d3c7b92
+Revises: 3f1b7c9a2d64
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e8a1d3c7b92'
+down_revision = '3f1b7c9a2d64'
+branch_labels = None
+depends_on = None
+
+READY = "claimed_at IS NULL"
+
+
+def upgrade():
+    op.create_table(
+        'video_rooms',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('room_id', sa.String(120), nullable=False, unique=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('claimed_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_video_rooms_claimed_at', 'video_rooms', ['claimed_at'])
+    op.create_index(
+        'ix_video_rooms_ready', 'video_rooms', ['created_at'],
+        postgresql_where=sa.text(READY),
+        sqlite_where=sa.text(READY),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_video_rooms_ready', table_name='video_rooms')
+    op.drop_index('ix_video_rooms_claimed_at', table_name='video_rooms')
+    op.drop_table('video_rooms')
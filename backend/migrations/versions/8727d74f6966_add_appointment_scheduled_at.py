@@ -0,0 +1,98 @@
+"""Add appointment scheduled_at timestamp
+
+Revision ID: 8727d74f6966
+Revises: ed1969985c8c
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from contextlib import nullcontext
+from datetime import datetime
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8727d74f6966'
+down_revision = 'ed1969985c8c'
+branch_labels = None
+depends_on = None
+
+
+# Same formats as model.SCHEDULE_FORMATS (migrations must not import the app)
+SCHEDULE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %I:%M %p", "%Y-%m-%d %H:%M:%S")
+BATCH_SIZE = 1000
+
+INDEXES = [
+    ('ix_appointments_doctor_scheduled', 'appointments', ['doctor_id', 'scheduled_at']),
+    ('ix_appointments_user_scheduled',   'appointments', ['user_id', 'scheduled_at']),
+]
+
+
+def _parse(date, time):
+    if not date or not time:
+        return None
+    for fmt in SCHEDULE_FORMATS:
+        try:
+            return datetime.strptime(f"{date.strip()} {time.strip()}", fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _online_block():
+    """CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction on Postgres."""
+    if op.get_bind().dialect.name == 'postgresql':
+        return op.get_context().autocommit_block()
+    return nullcontext()
+
+
+def upgrade():
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scheduled_at', sa.DateTime(), nullable=True))
+
+    # ── Backfill from the legacy date/time strings, in id order ──
+    # (needs live rows, so it is skipped when only rendering --sql)
+    if not context.is_offline_mode():
+        _backfill()
+
+    with _online_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def _backfill():
+    appointments = sa.table(
+        'appointments',
+        sa.column('id', sa.Integer),
+        sa.column('date', sa.String),
+        sa.column('time', sa.String),
+        sa.column('scheduled_at', sa.DateTime),
+    )
+    bind = op.get_bind()
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(appointments.c.id, appointments.c.date, appointments.c.time)
+            .where(appointments.c.id > last_id)
+            .order_by(appointments.c.id)
+            .limit(BATCH_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+        for row in rows:
+            bind.execute(
+                appointments.update()
+                .where(appointments.c.id == row.id)
+                .values(scheduled_at=_parse(row.date, row.time))
+            )
+        last_id = rows[-1].id
+
+
+def downgrade():
+    with _online_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    with op.batch_alter_table('appointments', schema=None) as batch_op:
+        batch_op.drop_column('scheduled_at')
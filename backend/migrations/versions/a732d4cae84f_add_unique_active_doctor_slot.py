@@ -0,0 +1,59 @@
+"""Add partial unique index on active doctor slots
+
+Revision ID: a732d4cae84f
+Revises: 26df440b7437
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from contextlib import nullcontext
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a732d4cae84f'
+down_revision = '26df440b7437'
+branch_labels = None
+depends_on = None
+
+
+INDEX_NAME = 'uq_appointments_doctor_slot_active'
+ACTIVE     = "status <> 'Cancelled'"
+
+
+def _online_block():
+    """CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction on Postgres."""
+    if op.get_bind().dialect.name == 'postgresql':
+        return op.get_context().autocommit_block()
+    return nullcontext()
+
+
+def upgrade():
+    # Existing double bookings must be resolved by hand – we will not cancel
+    # paid appointments automatically.
+    if not context.is_offline_mode():
+        clashes = op.get_bind().execute(sa.text(f"""
+            SELECT doctor_id, scheduled_at FROM appointments
+            WHERE scheduled_at IS NOT NULL AND {ACTIVE}
+            GROUP BY doctor_id, scheduled_at HAVING count(*) > 1
+        """)).fetchall()
+        if clashes:
+            raise RuntimeError(
+                f"{len(clashes)} doctor slots are double-booked; cancel the duplicates "
+                f"before applying this migration: {clashes[:10]}"
+            )
+
+    with _online_block():
+        op.create_index(
+            INDEX_NAME, 'appointments', ['doctor_id', 'scheduled_at'],
+            unique=True,
+            postgresql_where=sa.text(ACTIVE),
+            sqlite_where=sa.text(ACTIVE),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with _online_block():
+        op.drop_index(INDEX_NAME, table_name='appointments', postgresql_concurrently=True)
@@ -0,0 +1,51 @@
+"""Add doctor full-text search vector
+
+Revision ID: c6d62b340011
+Revises: fcd99aac42bb
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6d62b340011'
+down_revision = 'fcd99aac42bb'
+branch_labels = None
+depends_on = None
+
+
+# Weighted so name matches outrank specialty, which outranks bio mentions.
+# Kept in sync with the field weights in services/doctor_search.py.
+SEARCH_VECTOR = """
+    setweight(to_tsvector('simple', coalesce(full_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(specialization, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(department, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(qualification, '')), 'C') ||
+    setweight(to_tsvector('simple', replace(coalesce(languages, ''), ',', ' ')), 'C') ||
+    setweight(to_tsvector('simple', coalesce(bio, '')), 'D')
+"""
+
+
+def upgrade():
+    # SQLite has no tsvector; the app falls back to an in-process index there.
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute(
+        f"ALTER TABLE doctors ADD COLUMN search_vector tsvector "
+        f"GENERATED ALWAYS AS ({SEARCH_VECTOR}) STORED"
+    )
+    op.create_index(
+        'ix_doctors_search_vector', 'doctors', ['search_vector'],
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_doctors_search_vector', table_name='doctors')
+    op.drop_column('doctors', 'search_vector')
@@ -0,0 +1,51 @@
+"""Add composite indexes for hot lookup paths
+
+Revision ID: ed1969985c8c
+Revises: c6d62b340011
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from contextlib import nullcontext
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ed1969985c8c'
+down_revision = 'c6d62b340011'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) – matched to the queries in routes/ and model.py
+INDEXES = [
+    # Dashboard lists: filter by owner, optionally by status, newest first
+    ('ix_appointments_doctor_created',        'appointments', ['doctor_id', 'created_at', 'id']),
+    ('ix_appointments_doctor_status_created', 'appointments', ['doctor_id', 'status', 'created_at', 'id']),
+    ('ix_appointments_user_created',          'appointments', ['user_id', 'created_at', 'id']),
+    ('ix_appointments_user_status_created',   'appointments', ['user_id', 'status', 'created_at', 'id']),
+    # generate_summary looks appointments up by their VideoSDK room
+    ('ix_appointments_meeting_link',          'appointments', ['meeting_link']),
+    # list_patients
+    ('ix_patients_user_created',              'patients',     ['user_id', 'created_at']),
+]
+
+
+def _online_block():
+    """CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction on Postgres."""
+    if op.get_bind().dialect.name == 'postgresql':
+        return op.get_context().autocommit_block()
+    return nullcontext()
+
+
+def upgrade():
+    with _online_block():
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=True)
+
+
+def downgrade():
+    with _online_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
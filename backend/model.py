@@ -4,10 +4,95 @@ Two separate schemas: User (patient/caretaker) and Doctor.
 Plus: Patient (belongs to User) and Appointment (links Patient ↔ Doctor).
 """
 
+import re
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import and_, event, inspect
+from sqlalchemy.orm import joinedload
 from extensions import db
 
+# Accepted appointment time formats ("14:30", "02:30 PM", "14:30:00")
+SCHEDULE_FORMATS = ("%Y-%m-%d %H:%M", "%Y-%m-%d %I:%M %p", "%Y-%m-%d %H:%M:%S")
+
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# "Mon–Sat, 9:00 AM – 1:00 PM" – the free-text format of the legacy timings column
+_TIMINGS_RE = re.compile(
+    r"(mon|tue|wed|thu|fri|sat|sun)\w*\s*[–-]\s*(mon|tue|wed|thu|fri|sat|sun)\w*\s*,\s*"
+    r"(\d{1,2}:\d{2}\s*[ap]m)\s*[–-]\s*(\d{1,2}:\d{2}\s*[ap]m)",
+    re.IGNORECASE,
+)
+
+
+def parse_timings(timings: Optional[str]) -> Optional[dict]:
+    """Convert a legacy timings string into a weekly schedule, or None if unparseable."""
+    match = _TIMINGS_RE.search(timings or "")
+    if not match:
+        return None
+    first, last, start, end = match.groups()
+    start = datetime.strptime(start.upper().replace(" ", ""), "%I:%M%p").strftime("%H:%M")
+    end   = datetime.strptime(end.upper().replace(" ", ""), "%I:%M%p").strftime("%H:%M")
+    days  = WEEKDAYS[WEEKDAYS.index(first.lower()):WEEKDAYS.index(last.lower()) + 1]
+    return {day: [[start, end]] for day in days}
+
+
+def validate_schedule(schedule) -> dict:
+    """Normalise ``{"mon": [["09:00", "13:00"], …], …}``. Raises ValueError."""
+    if not isinstance(schedule, dict):
+        raise ValueError("schedule must be an object keyed by weekday")
+    clean = {}
+    for day, windows in schedule.items():
+        if day not in WEEKDAYS or not isinstance(windows, list):
+            raise ValueError(f"Invalid schedule day: {day}")
+        parsed = []
+        for window in windows:
+            start, end = (datetime.strptime(t, "%H:%M") for t in window)
+            if start >= end:
+                raise ValueError(f"Window must end after it starts: {window}")
+            parsed.append([start.strftime("%H:%M"), end.strftime("%H:%M")])
+        if parsed:
+            clean[day] = sorted(parsed)
+    return clean
+
+
+def format_schedule(schedule: dict) -> str:
+    """Human-readable summary, e.g. ``Mon–Sat, 9:00 AM – 1:00 PM``."""
+    if not schedule:
+        return "Currently Unavailable"
+
+    def clock(hhmm):
+        return datetime.strptime(hhmm, "%H:%M").strftime("%I:%M %p").lstrip("0")
+
+    groups = []                                 # [first_day, last_day, windows]
+    for day in WEEKDAYS:
+        windows = schedule.get(day)
+        if groups and windows and groups[-1][2] == windows \
+                and WEEKDAYS.index(groups[-1][1]) == WEEKDAYS.index(day) - 1:
+            groups[-1][1] = day
+        elif windows:
+            groups.append([day, day, windows])
+
+    parts = []
+    for first, last, windows in groups:
+        days  = first.title() if first == last else f"{first.title()}–{last.title()}"
+        hours = ", ".join(f"{clock(s)} – {clock(e)}" for s, e in windows)
+        parts.append(f"{days}, {hours}")
+    return "; ".join(parts)
+
+
+def parse_schedule(date: Optional[str], time: Optional[str]) -> Optional[datetime]:
+    """Combine an appointment's date + time strings into a naive wall-clock datetime."""
+    if not date or not time:
+        return None
+    value = f"{date.strip()} {time.strip()}"
+    for fmt in SCHEDULE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
 
 # ═══════════════════════════════════════════════════════
 #  USER  (patient / caretaker / relative)
@@ -74,7 +159,9 @@ class Doctor(db.Model):
     available      = db.Column(db.Boolean, default=True)
     department     = db.Column(db.String(80))
     bio            = db.Column(db.Text)
-    timings        = db.Column(db.String(120))
+    timings        = db.Column(db.String(120))   # legacy free text; superseded by weekly_schedule
+    weekly_schedule = db.Column(db.JSON)           # {"mon": [["09:00", "13:00"]], …}
+    slot_minutes   = db.Column(db.Integer, default=30)
     languages      = db.Column(db.Text)            # comma-separated
     rating         = db.Column(db.Float, default=0)
     successful_patients = db.Column(db.Integer, default=0)
@@ -106,7 +193,9 @@ class Doctor(db.Model):
             "available":          self.available,
             "department":         self.department,
             "bio":                self.bio,
-            "timings":            self.timings,
+            "timings":            format_schedule(self.weekly_schedule) if self.weekly_schedule is not None else self.timings,
+            "schedule":           self.weekly_schedule or {},
+            "slotMinutes":        self.slot_minutes,
             "languages":          self.languages.split(",") if self.languages else [],
             "rating":             self.rating,
             "successfulPatients": self.successful_patients,
@@ -122,6 +211,9 @@ class Doctor(db.Model):
 # ═══════════════════════════════════════════════════════
 class Patient(db.Model):
     __tablename__ = "patients"
+    __table_args__ = (
+        db.Index("ix_patients_user_created", "user_id", "created_at"),
+    )
 
     id        = db.Column(db.Integer, primary_key=True)
     user_id   = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
@@ -158,6 +250,20 @@ class Patient(db.Model):
 # ═══════════════════════════════════════════════════════
 class Appointment(db.Model):
     __tablename__ = "appointments"
+    __table_args__ = (
+        db.Index("ix_appointments_doctor_created",        "doctor_id", "created_at", "id"),
+        db.Index("ix_appointments_doctor_status_created", "doctor_id", "status", "created_at", "id"),
+        db.Index("ix_appointments_user_created",          "user_id", "created_at", "id"),
+        db.Index("ix_appointments_user_status_created",   "user_id", "status", "created_at", "id"),
+        db.Index("ix_appointments_meeting_link",          "meeting_link"),
+        db.Index("ix_appointments_doctor_scheduled",      "doctor_id", "scheduled_at"),
+        db.Index("ix_appointments_user_scheduled",        "user_id", "scheduled_at"),
+        # One live booking per doctor per slot – the database arbitrates races
+        db.Index("uq_appointments_doctor_slot_active",    "doctor_id", "scheduled_at",
+                 unique=True,
+                 postgresql_where=db.text("status <> 'Cancelled'"),
+                 sqlite_where=db.text("status <> 'Cancelled'")),
+    )
 
     id          = db.Column(db.Integer, primary_key=True)
     patient_id  = db.Column(db.Integer, db.ForeignKey("patients.id"), nullable=False)
@@ -168,6 +274,7 @@ class Appointment(db.Model):
     symptoms          = db.Column(db.Text)                           # comma-separated or JSON string
     date              = db.Column(db.String(20),  nullable=False)    # YYYY-MM-DD
     time              = db.Column(db.String(10),  nullable=False)    # HH:MM
+    scheduled_at      = db.Column(db.DateTime)                       # date + time, kept in sync on flush
     mobile            = db.Column(db.String(20))
     status            = db.Column(db.String(20),  nullable=False, default="Pending")  # Pending / Confirmed / Completed / Cancelled
     
@@ -182,9 +289,18 @@ class Appointment(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow,
                            onupdate=datetime.utcnow)
 
+    @classmethod
+    def with_parties(cls):
+        """Query that loads the doctor and patient in the same SELECT.
+
+        Use this for anything that ends in ``to_dict()`` so serialising N
+        appointments costs one query instead of 1 + 2N.
+        """
+        return cls.query.options(joinedload(cls.doctor), joinedload(cls.patient))
+
     def to_dict(self):
-        doc = Doctor.query.get(self.doctor_id)
-        pat = Patient.query.get(self.patient_id)
+        doc = self.doctor
+        pat = self.patient
         return {
             "id":               self.id,
             "patientId":        self.patient_id,
@@ -213,6 +329,158 @@ class Appointment(db.Model):
         return f"<Appointment {self.id} patient={self.patient_id} doctor={self.doctor_id} {self.status}>"
 
 
+@event.listens_for(Appointment, "before_insert")
+@event.listens_for(Appointment, "before_update")
+def _sync_scheduled_at(mapper, connection, target):
+    """Keep the indexed ``scheduled_at`` column derived from ``date`` + ``time``."""
+    target.scheduled_at = parse_schedule(target.date, target.time)
+
+
+# ═══════════════════════════════════════════════════════
+#  ACCOUNT DIRECTORY  (email → role + id across users and doctors)
+# ═══════════════════════════════════════════════════════
+class AccountDirectory(db.Model):
+    """One row per account, maintained by the ORM hooks below.
+
+    The primary key on ``email`` makes an email unique across both account
+    tables, so concurrent signups race on one index instead of two lookups.
+    """
+    __tablename__ = "account_directory"
+    __table_args__ = (
+        db.UniqueConstraint("role", "account_id", name="uq_account_directory_role_account"),
+    )
+
+    email      = db.Column(db.String(120), primary_key=True)
+    role       = db.Column(db.String(10),  nullable=False)     # user / doctor
+    account_id = db.Column(db.Integer,     nullable=False)
+
+    def __repr__(self):
+        return f"<AccountDirectory {self.email} → {self.role}:{self.account_id}>"
+
+
+@event.listens_for(User, "after_insert")
+@event.listens_for(Doctor, "after_insert")
+def _directory_insert(mapper, connection, target):
+    connection.execute(AccountDirectory.__table__.insert().values(
+        email=target.email, role=target.role, account_id=target.id,
+    ))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(Doctor, "after_update")
+def _directory_update(mapper, connection, target):
+    if not inspect(target).attrs.email.history.has_changes():
+        return
+    table = AccountDirectory.__table__
+    connection.execute(
+        table.update()
+        .where(and_(table.c.role == target.role, table.c.account_id == target.id))
+        .values(email=target.email)
+    )
+
+
+@event.listens_for(User, "after_delete")
+@event.listens_for(Doctor, "after_delete")
+def _directory_delete(mapper, connection, target):
+    table = AccountDirectory.__table__
+    connection.execute(
+        table.delete().where(and_(table.c.role == target.role, table.c.account_id == target.id))
+    )
+
+
+# ═══════════════════════════════════════════════════════
+#  REVOKED TOKEN  (persistent JWT denylist, see middleware/revocation.py)
+# ═══════════════════════════════════════════════════════
+class RevokedToken(db.Model):
+    __tablename__ = "revoked_tokens"
+
+    jti        = db.Column(db.String(32), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)   # pruned after this
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken {self.jti} until {self.expires_at}>"
+
+
+# ═══════════════════════════════════════════════════════
+#  TRANSCRIPT ENTRY  (searchable utterances, see services/transcript_index.py)
+# ═══════════════════════════════════════════════════════
+class TranscriptEntry(db.Model):
+    """One finalized utterance, keyed to its consultation.
+
+    The party columns are copied from the appointment so search can be scoped
+    without a join. On PostgreSQL a generated, GIN-indexed ``search_vector``
+    column is added by migration 3f1b7c9a2d64.
+    """
+    __tablename__ = "transcript_entries"
+    __table_args__ = (
+        db.Index("ix_transcript_entries_patient_spoken", "patient_id", "spoken_at"),
+        db.Index("ix_transcript_entries_doctor_spoken",  "doctor_id", "spoken_at"),
+        db.Index("ix_transcript_entries_user_spoken",    "user_id", "spoken_at"),
+    )
+
+    id             = db.Column(db.Integer, primary_key=True)
+    appointment_id = db.Column(db.Integer, db.ForeignKey("appointments.id", ondelete="CASCADE"),
+                               nullable=False, index=True)
+    patient_id     = db.Column(db.Integer, nullable=False)
+    doctor_id      = db.Column(db.Integer, nullable=False)
+    user_id        = db.Column(db.Integer, nullable=False)
+    meeting_id     = db.Column(db.String(120), nullable=False)
+    offset_seconds = db.Column(db.Float, nullable=False)       # "t" of the transcript record
+    spoken_at      = db.Column(db.DateTime, nullable=False)    # UTC
+    speaker        = db.Column(db.String(200))
+    text           = db.Column(db.Text, nullable=False)
+
+    def to_dict(self):
+        return {
+            "id":            self.id,
+            "appointmentId": self.appointment_id,
+            "patientId":     self.patient_id,
+            "doctorId":      self.doctor_id,
+            "meetingId":     self.meeting_id,
+            "offset":        self.offset_seconds,
+            "spokenAt":      self.spoken_at.isoformat(),
+            "speaker":       self.speaker,
+            "text":          self.text,
+        }
+
+    def __repr__(self):
+        return f"<TranscriptEntry {self.id} appointment={self.appointment_id} t={self.offset_seconds}>"
+
+
+@event.listens_for(Appointment, "before_delete")
+def _delete_transcript_entries(mapper, connection, target):
+    """ON DELETE CASCADE for databases that do not enforce it (SQLite without
+    ``PRAGMA foreign_keys``), so a deleted appointment leaves no searchable rows."""
+    if connection.dialect.name != "postgresql":
+        connection.execute(TranscriptEntry.__table__.delete()
+                           .where(TranscriptEntry.__table__.c.appointment_id == target.id))
+
+
+# ═══════════════════════════════════════════════════════
+#  VIDEO ROOM  (pre-created VideoSDK rooms, see services/room_pool.py)
+# ═══════════════════════════════════════════════════════
+class VideoRoom(db.Model):
+    """A pooled VideoSDK room. Claimed rows are kept for ``ROOM_POOL_WINDOW``
+    seconds so every API worker sees the same recent claim rate."""
+    __tablename__ = "video_rooms"
+
+    id         = db.Column(db.Integer, primary_key=True)
+    room_id    = db.Column(db.String(120), nullable=False, unique=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_at = db.Column(db.DateTime, index=True)
+
+    __table_args__ = (
+        # Ready rooms, oldest first – what claim() scans
+        db.Index("ix_video_rooms_ready", "created_at",
+                 postgresql_where=db.text("claimed_at IS NULL"),
+                 sqlite_where=db.text("claimed_at IS NULL")),
+    )
+
+    def __repr__(self):
+        return f"<VideoRoom {self.room_id} claimed={self.claimed_at}>"
+
+
 # ═══════════════════════════════════════════════════════
 #  HELPER – look up any account by role + id
 # ═══════════════════════════════════════════════════════
@@ -229,6 +497,21 @@ def find_account_by_email(email: str, role: Optional[str] = None):
         return Doctor.query.filter_by(email=email).first()
     if role == "user":
         return User.query.filter_by(email=email).first()
-    # No role hint – check both tables
-    return User.query.filter_by(email=email).first() or \
-           Doctor.query.filter_by(email=email).first()
+    # No role hint – one probe on the directory, joined to whichever table owns it
+    directory = AccountDirectory
+    row = (
+        db.session.query(User, Doctor)
+        .select_from(directory)
+        .outerjoin(User, and_(directory.role == "user", User.id == directory.account_id))
+        .outerjoin(Doctor, and_(directory.role == "doctor", Doctor.id == directory.account_id))
+        .filter(directory.email == email)
+        .first()
+    )
+    return (row[0] or row[1]) if row else None
+
+
+def email_registered(email: str) -> bool:
+    """True if any user or doctor already uses *email* (single index probe)."""
+    return db.session.query(
+        AccountDirectory.query.filter_by(email=email).exists()
+    ).scalar()
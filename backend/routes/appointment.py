@@ -3,13 +3,81 @@ Appointment routes – create, list, update status.
 Prefix: /api/appointments
 """
 
-from flask import Blueprint, request, jsonify
+import base64
+import json
+from datetime import datetime, timedelta
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from sqlalchemy import and_, or_
+from sqlalchemy.exc import IntegrityError
 from extensions import db
-from model import Appointment, Patient, Doctor
+from model import Appointment, Patient, Doctor, parse_schedule
 from middleware.auth import token_required
+from services import slots
 
 appointment_bp = Blueprint("appointment", __name__, url_prefix="/api/appointments")
 
+MAX_PAGE_SIZE   = 100
+STREAM_BATCH    = 200
+NEXT_GRACE      = timedelta(hours=1)    # a consultation stays "next" until 1h after its start
+SLOT_INDEX      = "uq_appointments_doctor_slot_active"
+
+
+# ── Keyset cursor helpers ──
+def _encode_cursor(appt) -> str:
+    """Opaque cursor pointing just past *appt* in (created_at, id) DESC order."""
+    raw = f"{appt.created_at.isoformat()}|{appt.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str):
+    """Return (created_at, id) from a cursor. Raises ValueError if malformed."""
+    try:
+        created_at, appt_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(appt_id)
+    except Exception as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _parse_bound(value: str, end: bool = False) -> datetime:
+    """Parse a ?from=/?to= bound. A bare date as *end* covers that whole day.
+
+    ``scheduled_at`` is a naive local wall-clock time (see ``parse_schedule``),
+    so an offset-aware bound is converted to the server's local time first.
+    """
+    bound = datetime.fromisoformat(value)
+    if bound.tzinfo is not None:
+        bound = bound.astimezone().replace(tzinfo=None)
+    if end and len(value) == 10:
+        bound += timedelta(days=1)
+    return bound
+
+
+def _slot_taken(error: IntegrityError) -> bool:
+    """True if *error* is the one-live-booking-per-slot index, not some other constraint."""
+    diag = getattr(error.orig, "diag", None)             # psycopg2
+    if diag is not None:
+        return getattr(diag, "constraint_name", None) == SLOT_INDEX
+    message = str(error.orig)                            # sqlite names the columns instead
+    return SLOT_INDEX in message or "appointments.doctor_id, appointments.scheduled_at" in message
+
+
+def _owned_by(current_user):
+    """Base appointment query scoped to the current user's role."""
+    if current_user.role == "doctor":
+        return Appointment.with_parties().filter_by(doctor_id=current_user.id)
+    return Appointment.with_parties().filter_by(user_id=current_user.id)
+
+
+def _stream_json_array(query):
+    """Yield a JSON array one appointment at a time from a server-side cursor."""
+    yield "["
+    first = True
+    for appt in query.yield_per(STREAM_BATCH):
+        yield ("" if first else ",") + json.dumps(appt.to_dict())
+        first = False
+    yield "]"
+
 
 # ── Create appointment ──
 @appointment_bp.route("", methods=["POST"])
@@ -55,6 +123,10 @@ def create_appointment(*, current_user):
         except Exception as e:
             return jsonify({"error": f"Payment verification error: {str(e)}"}), 500
 
+    scheduled_at = parse_schedule(data["date"], data["time"])
+    if scheduled_at is None:
+        return jsonify({"error": "date must be YYYY-MM-DD and time HH:MM"}), 400
+
     # Validate patient belongs to user
     patient = Patient.query.filter_by(id=data["patientId"], user_id=current_user.id).first()
     if not patient:
@@ -65,6 +137,9 @@ def create_appointment(*, current_user):
     if not doctor:
         return jsonify({"error": "Doctor not found"}), 404
 
+    if not slots.on_grid(doctor, scheduled_at):
+        return jsonify({"error": "Requested time is not one of the doctor's slots"}), 400
+
     # Normalise symptoms to comma-separated string
     symptoms = data.get("symptoms", "")
     if isinstance(symptoms, list):
@@ -84,9 +159,18 @@ def create_appointment(*, current_user):
         payment_status    = "Success"
     )
 
+    # Optimistic insert: the partial unique index on (doctor_id, scheduled_at)
+    # rejects a second live booking for the same slot, without table locks.
     db.session.add(appointment)
-    db.session.commit()
-
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        if not _slot_taken(e):
+            raise
+        return jsonify({"error": "This slot is already booked. Please choose another time."}), 409
+
+    appointment = Appointment.with_parties().get(appointment.id)
     return jsonify(appointment.to_dict()), 201
 
 
@@ -101,26 +185,99 @@ def list_appointments(*, current_user):
 
     Optional query params:
         ?status=Pending        filter by status
+        ?from=2026-03-01       scheduled at or after (date or ISO datetime)
+        ?to=2026-03-07         scheduled before the end of that day / instant
+        ?upcoming=true         scheduled from now onwards
+        ?limit=20              page size (max 100); the next page's cursor is
+                               returned in the ``X-Next-Cursor`` header
+        ?cursor=<token>        continue after the row the cursor points to
+        ?stream=true           stream the JSON array row by row instead of
+                               building it in memory
     """
     status_filter = request.args.get("status")
+    stream        = request.args.get("stream", "").lower() in ("true", "1", "yes")
 
-    if current_user.role == "doctor":
-        query = Appointment.query.filter_by(doctor_id=current_user.id)
-    else:
-        query = Appointment.query.filter_by(user_id=current_user.id)
+    try:
+        # Not get(type=int): that silently turns "abc" into "no limit"
+        limit = request.args.get("limit")
+        limit = int(limit) if limit is not None else None
+        if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+            raise ValueError
+    except ValueError:
+        return jsonify({"error": f"limit must be between 1 and {MAX_PAGE_SIZE}"}), 400
+
+    query = _owned_by(current_user)
 
     if status_filter:
         query = query.filter_by(status=status_filter)
 
-    appointments = query.order_by(Appointment.created_at.desc()).all()
-    return jsonify([a.to_dict() for a in appointments])
+    try:
+        if request.args.get("from"):
+            query = query.filter(Appointment.scheduled_at >= _parse_bound(request.args["from"]))
+        if request.args.get("to"):
+            query = query.filter(Appointment.scheduled_at < _parse_bound(request.args["to"], end=True))
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD or ISO datetimes"}), 400
+
+    if request.args.get("upcoming", "").lower() in ("true", "1", "yes"):
+        query = query.filter(Appointment.scheduled_at >= datetime.now())
+
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            created_at, appt_id = _decode_cursor(cursor)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        query = query.filter(or_(
+            Appointment.created_at < created_at,
+            and_(Appointment.created_at == created_at, Appointment.id < appt_id),
+        ))
+
+    query = query.order_by(Appointment.created_at.desc(), Appointment.id.desc())
+
+    if stream:
+        if limit:
+            query = query.limit(limit)
+        return Response(stream_with_context(_stream_json_array(query)),
+                        mimetype="application/json")
+
+    if limit is None:
+        return jsonify([a.to_dict() for a in query.all()])
+
+    # Fetch one extra row to learn whether another page exists
+    appointments = query.limit(limit + 1).all()
+    response = jsonify([a.to_dict() for a in appointments[:limit]])
+    if len(appointments) > limit:
+        response.headers["X-Next-Cursor"] = _encode_cursor(appointments[limit - 1])
+    return response
+
+
+# ── Next appointment ──
+@appointment_bp.route("/next", methods=["GET"])
+@token_required
+def next_appointment(*, current_user):
+    """Return the soonest active appointment (for the countdown timer).
+
+    One probe on the (owner, scheduled_at) index; an appointment still counts
+    as "next" for an hour after it starts so an ongoing call can be rejoined.
+    """
+    appt = (
+        _owned_by(current_user)
+        .filter(Appointment.scheduled_at >= datetime.now() - NEXT_GRACE)
+        .filter(Appointment.status.notin_(("Cancelled", "Completed")))
+        .order_by(Appointment.scheduled_at)
+        .first()
+    )
+    if not appt:
+        return jsonify({"error": "No upcoming appointment"}), 404
+    return jsonify(appt.to_dict())
 
 
 # ── Get single appointment ──
 @appointment_bp.route("/<int:appointment_id>", methods=["GET"])
 @token_required
 def get_appointment(appointment_id, *, current_user):
-    appt = Appointment.query.get(appointment_id)
+    appt = Appointment.with_parties().get(appointment_id)
     if not appt:
         return jsonify({"error": "Appointment not found"}), 404
 
@@ -142,7 +299,7 @@ def update_status(appointment_id, *, current_user):
     Doctors can: Pending → Confirmed, Confirmed → Scheduled/Completed, * → Cancelled
     Users  can: * → Cancelled
     """
-    appt = Appointment.query.get(appointment_id)
+    appt = Appointment.with_parties().get(appointment_id)
     if not appt:
         return jsonify({"error": "Appointment not found"}), 404
 
@@ -164,15 +321,23 @@ def update_status(appointment_id, *, current_user):
         return jsonify({"error": "You can only cancel appointments"}), 403
 
     if new_status == "Scheduled" and not appt.meeting_link:
-        from services.videosdk import create_room
+        from services import room_pool
         try:
-            appt.meeting_link = create_room()
+            appt.meeting_link = room_pool.acquire()     # claimed room is consumed by the commit below
         except Exception as e:
             return jsonify({"error": f"Failed to create video room: {str(e)}"}), 500
 
     appt.status = new_status
-    db.session.commit()
-
+    try:
+        db.session.commit()
+    except IntegrityError as e:
+        # Re-activating a cancelled booking whose slot has since been taken
+        db.session.rollback()
+        if not _slot_taken(e):
+            raise
+        return jsonify({"error": "This slot has been booked by someone else"}), 409
+
+    appt = Appointment.with_parties().get(appointment_id)
     return jsonify(appt.to_dict())
 
 
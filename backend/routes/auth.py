@@ -3,13 +3,16 @@ Auth routes – signup, login (JWT-based), token refresh, profile, password.
 Supports two separate schemas: User and Doctor.
 """
 
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, g, request, jsonify
 
-from model import User, Doctor, get_account_by_role, find_account_by_email
+from sqlalchemy.exc import IntegrityError
+
+from model import User, Doctor, get_account_by_role, find_account_by_email, email_registered, validate_schedule
 from extensions import db
-from middleware.token import generate_tokens, create_token, decode_token, ACCESS_TOKEN_EXPIRES
+from middleware.token import generate_tokens, decode_token
 from middleware.auth import token_required
+from middleware.revocation import revocations
+from services.passwords import hash_password, verify_password, needs_rehash
 
 import jwt
 
@@ -28,8 +31,8 @@ def signup():
 
     role = data.get("role", "user")
 
-    # Check both tables for duplicate email
-    if find_account_by_email(data["email"]):
+    # Cheap early exit; the account directory's unique email settles races below
+    if email_registered(data["email"]):
         return jsonify({"error": "Email already registered"}), 409
 
     if role == "doctor":
@@ -37,7 +40,7 @@ def signup():
             full_name      = data["fullName"],
             email          = data["email"],
             phone          = data.get("phone"),
-            password_hash  = generate_password_hash(data["password"]),
+            password_hash  = hash_password(data["password"]),
             specialization = data.get("specialization"),
             license_number = data.get("licenseNumber"),
         )
@@ -46,13 +49,17 @@ def signup():
             full_name     = data["fullName"],
             email         = data["email"],
             phone         = data.get("phone"),
-            password_hash = generate_password_hash(data["password"]),
+            password_hash = hash_password(data["password"]),
             address       = data.get("address"),
             city          = data.get("city"),
         )
 
     db.session.add(account)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Email or phone already registered"}), 409
 
     tokens = generate_tokens(account)
 
@@ -75,13 +82,18 @@ def login():
 
     account = find_account_by_email(data["email"], role_hint)
 
-    if not account or not check_password_hash(account.password_hash, data["password"]):
+    if not account or not verify_password(account.password_hash, data["password"]):
         return jsonify({"error": "Invalid email or password"}), 401
 
     # If the frontend sent a role, verify it matches the account found
     if role_hint and account.role != role_hint:
         return jsonify({"error": f"This account is not registered as {role_hint}"}), 403
 
+    # Upgrade hashes made with an outdated algorithm/cost while we have the password
+    if needs_rehash(account.password_hash):
+        account.password_hash = hash_password(data["password"])
+        db.session.commit()
+
     tokens = generate_tokens(account)
 
     return jsonify({
@@ -94,7 +106,11 @@ def login():
 # ──────────────────── REFRESH TOKEN ────────────────────
 @auth_bp.route("/refresh", methods=["POST"])
 def refresh():
-    """Exchange a valid refresh token for a new access token."""
+    """Exchange a valid refresh token for a new access + refresh token pair.
+
+    Refresh tokens are single-use: the presented one is revoked, so a leaked
+    token stops working as soon as either party rotates it.
+    """
     data = request.get_json() or {}
     refresh_token = data.get("refreshToken")
 
@@ -116,9 +132,15 @@ def refresh():
     if not account:
         return jsonify({"error": "Account not found"}), 401
 
-    new_access = create_token(account.id, account.role, ACCESS_TOKEN_EXPIRES, "access")
+    # Without a jti the token could never be revoked, so it is not accepted
+    if not payload.get("jti"):
+        return jsonify({"error": "Invalid refresh token, please login again"}), 401
+
+    # Revoking is the atomic "first use wins" check for concurrent refreshes
+    if not revocations.revoke(payload["jti"], payload["exp"]):
+        return jsonify({"error": "Refresh token has been revoked, please login again"}), 401
 
-    return jsonify({"accessToken": new_access}), 200
+    return jsonify(generate_tokens(account)), 200
 
 
 # ──────────────────── GET CURRENT USER ────────────────────
@@ -170,6 +192,16 @@ def update_profile(user_id, *, current_user):
             if api_field in data:
                 setattr(current_user, db_field, data[api_field])
 
+        if "schedule" in data:
+            try:
+                current_user.weekly_schedule = validate_schedule(data["schedule"])
+            except (TypeError, ValueError) as e:
+                return jsonify({"error": str(e)}), 400
+        if "slotMinutes" in data:
+            if not isinstance(data["slotMinutes"], int) or not 5 <= data["slotMinutes"] <= 240:
+                return jsonify({"error": "slotMinutes must be between 5 and 240"}), 400
+            current_user.slot_minutes = data["slotMinutes"]
+
     db.session.commit()
     return jsonify({"message": "Profile updated", "user": current_user.to_dict()}), 200
 
@@ -183,13 +215,13 @@ def change_password(*, current_user):
     if not data.get("currentPassword") or not data.get("newPassword"):
         return jsonify({"error": "currentPassword and newPassword are required"}), 400
 
-    if not check_password_hash(current_user.password_hash, data["currentPassword"]):
+    if not verify_password(current_user.password_hash, data["currentPassword"]):
         return jsonify({"error": "Current password is incorrect"}), 401
 
     if len(data["newPassword"]) < 6:
         return jsonify({"error": "New password must be at least 6 characters"}), 400
 
-    current_user.password_hash = generate_password_hash(data["newPassword"])
+    current_user.password_hash = hash_password(data["newPassword"])
     db.session.commit()
 
     return jsonify({"message": "Password changed successfully"}), 200
@@ -199,5 +231,22 @@ def change_password(*, current_user):
 @auth_bp.route("/logout", methods=["POST"])
 @token_required
 def logout(*, current_user):
-    """Logout endpoint - client-side token cleanup."""
+    """Revoke the access token and, if sent, the refresh token.
+
+    Optional JSON body: {"refreshToken": str}
+    """
+    payload = g.token_payload
+    revocations.revoke(payload.get("jti"), payload["exp"])
+
+    refresh_token = (request.get_json(silent=True) or {}).get("refreshToken")
+    if refresh_token:
+        try:
+            refresh_payload = decode_token(refresh_token)
+        except jwt.InvalidTokenError:
+            refresh_payload = None
+        if refresh_payload and refresh_payload.get("type") == "refresh" \
+                and refresh_payload.get("sub") == payload.get("sub") \
+                and refresh_payload.get("role") == payload.get("role"):
+            revocations.revoke(refresh_payload.get("jti"), refresh_payload["exp"])
+
     return jsonify({"message": "Logout successful"}), 200
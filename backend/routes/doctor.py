@@ -3,38 +3,128 @@ Doctor routes – public listing + detail.
 Prefix: /api/doctors
 """
 
-from flask import Blueprint, request, jsonify
+from datetime import date, datetime, timedelta
+
+from flask import Blueprint, Response, request, jsonify
 from model import Doctor
+from services import doctor_directory, doctor_search, slots
 
 doctor_bp = Blueprint("doctor", __name__, url_prefix="/api/doctors")
 
+MAX_SEARCH_RESULTS = 50
+MAX_SLOT_DAYS      = 62
+
+
+def _cached_response(entry):
+    """Build a JSON response carrying a strong ETag, honouring If-None-Match."""
+    body, etag = entry
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
 
 @doctor_bp.route("", methods=["GET"])
 def list_doctors():
     """Return all doctors (public endpoint – no auth required).
 
     Optional query params:
-        ?department=Cardiology     filter by department
+        ?department=Cardiology     filter by department (case-insensitive)
         ?available=true            only available doctors
-    """
-    query = Doctor.query
 
-    department = request.args.get("department")
+    Responses are served from the in-process directory cache and carry an
+    ETag; a matching ``If-None-Match`` gets a 304.
+    """
+    department = request.args.get("department", "").strip() or None
     if department:
-        query = query.filter_by(department=department)
+        department = doctor_directory.department(department)
+        if department is None:
+            # No doctor is in it; answered without a cache entry so arbitrary
+            # query strings cannot grow the cache
+            return jsonify([])
 
     available = request.args.get("available")
     if available is not None:
-        query = query.filter_by(available=available.lower() in ("true", "1", "yes"))
+        available = available.lower() in ("true", "1", "yes")
+
+    def build():
+        query = Doctor.query
+        if department:
+            query = query.filter_by(department=department)
+        if available is not None:
+            query = query.filter_by(available=available)
+        return [d.to_dict() for d in query.order_by(Doctor.full_name).all()]
+
+    entry = doctor_directory.get_or_build(("list", department, available), build)
+    return _cached_response(entry)
+
+
+@doctor_bp.route("/search", methods=["GET"])
+def search_doctors():
+    """Ranked full-text search across name, specialty, department, bio,
+    qualification and languages (public).
+
+    Query params:
+        ?q=chest pain              search text (last word matches as a prefix)
+        ?limit=20                  max results (default 20, max 50)
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+
+    limit = request.args.get("limit", 20, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
 
-    doctors = query.order_by(Doctor.full_name).all()
-    return jsonify([d.to_dict() for d in doctors])
+    return jsonify([d.to_dict() for d in doctor_search.search(q, limit)])
 
 
 @doctor_bp.route("/<int:doctor_id>", methods=["GET"])
 def get_doctor(doctor_id):
     """Return a single doctor's profile (public)."""
+
+    def build():
+        doctor = Doctor.query.get(doctor_id)
+        return doctor.to_dict() if doctor else None
+
+    entry = doctor_directory.get_or_build(("doctor", doctor_id), build)
+    if not entry:
+        return jsonify({"error": "Doctor not found"}), 404
+    return _cached_response(entry)
+
+
+@doctor_bp.route("/<int:doctor_id>/slots", methods=["GET"])
+def get_slots(doctor_id):
+    """Return the doctor's free consultation slots per day (public).
+
+    Query params:
+        ?from=2026-03-01           first day (default: today)
+        ?to=2026-03-07             last day, inclusive (default: from + 6 days)
+    """
     doctor = Doctor.query.get(doctor_id)
     if not doctor:
         return jsonify({"error": "Doctor not found"}), 404
-    return jsonify(doctor.to_dict())
+
+    try:
+        start = date.fromisoformat(request.args["from"]) if request.args.get("from") else date.today()
+        end   = date.fromisoformat(request.args["to"]) if request.args.get("to") else start + timedelta(days=6)
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+
+    if end < start or (end - start).days >= MAX_SLOT_DAYS:
+        return jsonify({"error": f"to must be on or after from, within {MAX_SLOT_DAYS} days"}), 400
+
+    free = slots.free_slots(doctor, start, end)
+
+    # Hide slots that have already started today (not cached – time moves on)
+    now = datetime.now()
+    if now.date() in free:
+        free[now.date()] = tuple(t for t in free[now.date()] if t > now.strftime("%H:%M"))
+
+    return jsonify({
+        "doctorId":    doctor.id,
+        "slotMinutes": doctor.slot_minutes,
+        "scheduled":   bool(doctor.weekly_schedule),     # False: any slotMinutes multiple is bookable
+        "days": [
+            {"date": day.isoformat(), "slots": list(times)}
+            for day, times in free.items()
+        ],
+    })
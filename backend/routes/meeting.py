@@ -1,20 +1,24 @@
 """
-Meeting routes – create VideoSDK rooms.
+Meeting routes – hand out VideoSDK rooms, summarize consultations.
 """
 
-from flask import Blueprint, jsonify, request
-from services.videosdk import create_room, generate_token
+from flask import Blueprint, current_app, jsonify, request
+from services import room_pool, transcript_summary, videosdk
+from services.videosdk import generate_token
 from extensions import db
 from model import Appointment
+from middleware.auth import token_required
+from routes.transcription import can_read
 
 meeting_bp = Blueprint("meeting", __name__, url_prefix="/api/meeting")
 
 
 @meeting_bp.route("/create", methods=["POST"])
 def create_meeting():
-    """Create a new VideoSDK room and return meetingId + token."""
+    """Hand out a VideoSDK room (pre-created if the pool has one) and return meetingId + token."""
     try:
-        room_id = create_room()
+        room_id = room_pool.acquire()
+        db.session.commit()
         token   = generate_token()
 
         return jsonify({
@@ -24,35 +28,43 @@ def create_meeting():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+
+@meeting_bp.route("/metrics", methods=["GET"])
+def videosdk_metrics():
+    """VideoSDK API calls in this process: counts, errors, retries, latency."""
+    return jsonify(videosdk.metrics())
+
+
 @meeting_bp.route("/generate-summary", methods=["POST"])
-def generate_summary():
-    """Mock LLM summarization of a meeting transcript."""
+@token_required
+def generate_summary(*, current_user):
+    """Extractive summary of a consultation (computed locally, see
+    services/transcript_summary.py).
+
+    Summarizes the bot's transcript of the meeting together with any
+    ``transcript`` text posted by a participant. Every call summarizes the
+    whole consultation so far and replaces the appointment's summary, so
+    rejoins and several participants never stack duplicate blocks. Only the
+    doctor and the booking user of the consultation may ask.
+    """
     data = request.get_json() or {}
     meeting_id = data.get("meetingId")
     transcript = data.get("transcript", "")
 
     if not meeting_id:
         return jsonify({"error": "meetingId is required"}), 400
+    if not can_read(current_user, meeting_id):
+        return jsonify({"error": "Meeting not found"}), 404
 
-    # Create mock diagnosis structure based on prompt
-    summary = (
-        "**Diagnosis:** Based on the transcript, a general evaluation of symptoms was performed.\\n"
-        "**Medicines:** Paracetamol prescribed for 3 days.\\n"
-        "**Key Points:** The patient discussed their current health concerns.\\n"
-        "**Follow-ups:** Schedule a check-up in 1 week if symptoms persist."
-    )
+    summary = transcript_summary.summarize(meeting_id, transcript, current_app.config["TRANSCRIPTS_DIR"])
 
     # Save to appointment
     appointment = Appointment.query.filter_by(meeting_link=meeting_id).first()
     if appointment:
-        # Only append a new summary block if there's actually a substantial new transcript
-        if len(transcript.strip()) > 10:
-            if appointment.meeting_summary:
-                appointment.meeting_summary = appointment.meeting_summary + "\n\n---\n**Supplemental Summary (Rejoined):**\n" + summary
-            else:
-                appointment.meeting_summary = summary
-        
+        if summary and summary != appointment.meeting_summary:
+            appointment.meeting_summary = summary
         appointment.status = "Completed"
         db.session.commit()
+        summary = appointment.meeting_summary
 
-    return jsonify({"summary": appointment.meeting_summary if appointment and appointment.meeting_summary else summary})
+    return jsonify({"summary": summary or "No transcript was captured for this consultation."})
@@ -6,7 +6,9 @@ Prefix: /api/payment
 import os
 import razorpay
 from flask import Blueprint, request, jsonify
+from model import Doctor, parse_schedule
 from middleware.auth import token_required
+from services import slots
 
 payment_bp = Blueprint("payment", __name__, url_prefix="/api/payment")
 
@@ -18,12 +20,32 @@ if os.getenv("RAZORPAY_KEY_ID") and os.getenv("RAZORPAY_KEY_SECRET"):
 @payment_bp.route("/create-order", methods=["POST"])
 @token_required
 def create_order(*, current_user):
-    """Create a Razorpay order for the consultation fee."""
+    """Create a Razorpay order for the consultation fee.
+
+    Expected JSON body: {"doctorId": int, "date": "YYYY-MM-DD", "time": "HH:MM"}.
+    The slot is checked here, before any money is taken, so a booking is not
+    refused after the payment has been captured.
+    """
+    data = request.get_json() or {}
+    if not all(data.get(f) for f in ("doctorId", "date", "time")):
+        return jsonify({"error": "doctorId, date and time are required"}), 400
+
+    scheduled_at = parse_schedule(data["date"], data["time"])
+    if scheduled_at is None:
+        return jsonify({"error": "date must be YYYY-MM-DD and time HH:MM"}), 400
+
+    doctor = Doctor.query.get(data["doctorId"])
+    if not doctor:
+        return jsonify({"error": "Doctor not found"}), 404
+    if not slots.on_grid(doctor, scheduled_at):
+        return jsonify({"error": "Requested time is not one of the doctor's slots"}), 400
+    if not slots.is_free(doctor, scheduled_at):
+        return jsonify({"error": "This slot is already booked. Please choose another time."}), 409
+
     if not razorpay_client:
         return jsonify({"error": "Payment gateway not configured"}), 500
 
     try:
-        data = request.get_json() or {}
         amount = 500  # Fixed consultation fee (₹500)
         
         # Razorpay amount is in paise
@@ -1,22 +1,29 @@
 """
-Transcription routes – start / stop the transcription bot.
+Transcription routes – start / stop the transcription bot, read, search
+and stream transcripts.
 """
 
-from flask import Blueprint, jsonify
-import transcription_bot
+from flask import Blueprint, Response, current_app, jsonify, request
+from extensions import db
+from model import Appointment
+from middleware.auth import token_required
+from services import transcript_index, transcript_stream, transcription_client
+from services.transcript_store import read, read_meta
 from services.videosdk import generate_token
 
 transcription_bp = Blueprint("transcription", __name__, url_prefix="/api/transcription")
 
+MAX_SEARCH_RESULTS = 50
+
 
 @transcription_bp.route("/start/<meeting_id>", methods=["POST"])
 def start_transcription(meeting_id):
     """Spawn a headless bot that joins the meeting and starts transcription."""
     try:
         token = generate_token()
-        transcription_bot.start(meeting_id, token)
+        started = transcription_client.start(meeting_id, token)
         return jsonify({
-            "status":    "Transcription started",
+            "status":    "Transcription started" if started else "Transcription already running",
             "meetingId": meeting_id,
         })
     except Exception as e:
@@ -27,10 +34,104 @@ def start_transcription(meeting_id):
 def stop_transcription(meeting_id):
     """Stop transcription and remove the bot from the meeting."""
     try:
-        transcription_bot.stop(meeting_id)
+        transcription_client.stop(meeting_id)
         return jsonify({
             "status":    "Transcription stopped",
             "meetingId": meeting_id,
         })
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+@transcription_bp.route("/metrics", methods=["GET"])
+def transcription_metrics():
+    """Bot startup latency per meeting: join attempts, time to join and to first text."""
+    try:
+        return jsonify(transcription_client.metrics())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+def can_read(current_user, meeting_id: str) -> bool:
+    """Only the doctor and the patient's account on the consultation may read it."""
+    owner = Appointment.doctor_id if current_user.role == "doctor" else Appointment.user_id
+    query = Appointment.query.filter(Appointment.meeting_link == meeting_id, owner == current_user.id)
+    return db.session.query(query.exists()).scalar()
+
+
+@transcription_bp.route("/search", methods=["GET"])
+@token_required
+def search_transcripts(*, current_user):
+    """Full-text search across the caller's own consultation transcripts,
+    newest utterance first.
+
+    Query params:
+        ?q=chest pain              search text (last word matches as a prefix)
+        ?patientId=7               only this patient's consultations
+        ?limit=20                  max results (default 20, max 50)
+    """
+    q = request.args.get("q", "").strip()
+    if not q:
+        return jsonify({"error": "q is required"}), 400
+
+    patient_id = request.args.get("patientId", type=int)
+    limit = request.args.get("limit", 20, type=int)
+    limit = max(1, min(limit, MAX_SEARCH_RESULTS))
+
+    hits = transcript_index.search(q, current_user, patient_id, limit)
+    return jsonify([h.to_dict() for h in hits])
+
+
+@transcription_bp.route("/<meeting_id>", methods=["GET"])
+@token_required
+def get_transcript(meeting_id, *, current_user):
+    """Transcript records of a meeting.
+
+    Optional ?from= / ?to= are offsets in seconds from the meeting start
+    (the ``epoch`` in the response); the index is used to seek to ``from``.
+    """
+    if not can_read(current_user, meeting_id):
+        return jsonify({"error": "Transcript not found"}), 404
+
+    try:
+        start = float(request.args["from"]) if request.args.get("from") else None
+        end   = float(request.args["to"])   if request.args.get("to")   else None
+    except ValueError:
+        return jsonify({"error": "from and to must be offsets in seconds"}), 400
+
+    directory = current_app.config["TRANSCRIPTS_DIR"]
+    meta = read_meta(directory, meeting_id)
+    if meta is None:
+        return jsonify({"error": "Transcript not found"}), 404
+
+    return jsonify({
+        "meetingId": meeting_id,
+        "epoch":     meta["epoch"],
+        "records":   list(read(directory, meeting_id, start, end)),
+    })
+
+
+@transcription_bp.route("/<meeting_id>/stream", methods=["GET"])
+@token_required
+def stream_transcript(meeting_id, *, current_user):
+    """Live captions as Server-Sent Events.
+
+    Events: ``caption`` (speaker, participantId, text, final – interim
+    captions are replaced by the next one), ``state`` and ``session``
+    (started / ended). Recent events are replayed after ``Last-Event-ID``
+    (header, or ``?lastEventId=`` on first connect); without it the whole
+    buffer is replayed. A client that falls too far behind gets a
+    ``dropped`` event and should reconnect.
+    """
+    if not can_read(current_user, meeting_id):
+        return jsonify({"error": "Transcript not found"}), 404
+
+    last = request.headers.get("Last-Event-ID") or request.args.get("lastEventId")
+    try:
+        last_id = int(last) if last else 0
+    except ValueError:
+        return jsonify({"error": "Last-Event-ID must be an event id"}), 400
+
+    subscriber = transcript_stream.hub.subscribe(meeting_id, last_id)
+    return Response(transcript_stream.sse(subscriber), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
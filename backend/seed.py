@@ -8,10 +8,23 @@ from datetime import datetime, timedelta
 from werkzeug.security import generate_password_hash
 from app import create_app
 from extensions import db
-from model import User, Doctor, Patient, Appointment
+from model import User, Doctor, Patient, Appointment, AccountDirectory, parse_timings
 
 app = create_app()
 
+UNAVAILABLE = "Currently Unavailable"
+
+
+def _schedule(doctor: dict) -> dict:
+    """Weekly schedule from the doctor's timings; only "Currently Unavailable" may be empty."""
+    schedule = parse_timings(doctor.get("timings"))
+    if schedule is not None:
+        return schedule
+    if doctor.get("timings") != UNAVAILABLE:
+        raise SystemExit(f"❌  Cannot parse timings {doctor.get('timings')!r} of {doctor['email']}")
+    print(f"ℹ️   {doctor['full_name']} is unavailable – seeded with an empty weekly schedule")
+    return {}
+
 # ── Dummy data ──────────────────────────────────────────
 
 USERS = [
@@ -208,6 +221,7 @@ def seed():
         Patient.query.delete()
         User.query.delete()
         Doctor.query.delete()
+        AccountDirectory.query.delete()
         db.session.commit()
 
         # ── Users ──
@@ -243,6 +257,7 @@ def seed():
                 department=d.get("department"),
                 bio=d.get("bio"),
                 timings=d.get("timings"),
+                weekly_schedule=_schedule(d),
                 languages=d.get("languages"),
                 rating=d.get("rating", 0),
                 successful_patients=d.get("successful_patients", 0),
@@ -0,0 +1,109 @@
+"""
+Doctor directory cache – serialised /api/doctors responses kept in-process.
+
+The directory is public, read on almost every page load and changes rarely,
+so each filter combination (and each single profile) is rendered to JSON once
+and served from memory with a strong ETag until a Doctor row is committed.
+At most ``ENTRIES_KEPT`` responses are kept, least recently used first out.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
+
+from extensions import db
+from model import Doctor
+
+ENTRIES_KEPT = 1024
+
+_lock        = threading.Lock()
+_entries: OrderedDict = OrderedDict()   # cache key  →  (body, etag)
+_departments: Optional[dict] = None     # lower-cased name  →  department as stored
+_generation  = 0                        # bumped on every invalidation
+
+
+def _render(data) -> tuple[str, str]:
+    """Return (body, etag) exactly as ``jsonify`` would serialise *data*."""
+    body = f"{current_app.json.dumps(data)}\n"
+    return body, hashlib.sha1(body.encode()).hexdigest()
+
+
+def get_or_build(key, build):
+    """Return cached (body, etag) for *key*, calling *build()* on a miss.
+
+    *build* returns the JSON-serialisable payload, or None for "not found"
+    (which is not cached).
+    """
+    with _lock:
+        hit = _entries.get(key)
+        generation = _generation
+        if hit:
+            _entries.move_to_end(key)
+    if hit:
+        return hit
+
+    data = build()
+    if data is None:
+        return None
+    entry = _render(data)
+
+    with _lock:
+        # Skip the store if a doctor changed while we were querying
+        if generation == _generation:
+            _entries[key] = entry
+            while len(_entries) > ENTRIES_KEPT:
+                _entries.popitem(last=False)
+    return entry
+
+
+def department(name: str) -> Optional[str]:
+    """The known department matching *name* (case and spacing aside), or None."""
+    global _departments
+    with _lock:
+        known = _departments
+        generation = _generation
+    if known is None:
+        rows = db.session.query(Doctor.department).filter(Doctor.department.isnot(None)).distinct()
+        known = {" ".join(d.split()).lower(): d for (d,) in rows}
+        with _lock:
+            if generation == _generation:
+                _departments = known
+    return known.get(" ".join(name.split()).lower())
+
+
+def generation() -> int:
+    """Counter that changes whenever the directory is invalidated."""
+    return _generation
+
+
+def invalidate():
+    """Drop every cached directory response."""
+    global _generation, _departments
+    with _lock:
+        _entries.clear()
+        _departments = None
+        _generation += 1
+
+
+# ── Invalidate when a Doctor row is committed ──
+@event.listens_for(Doctor, "after_insert")
+@event.listens_for(Doctor, "after_update")
+@event.listens_for(Doctor, "after_delete")
+def _mark_dirty(mapper, connection, target):
+    object_session(target).info["doctors_dirty"] = True
+
+
+@event.listens_for(db.session, "after_commit")
+def _after_commit(session):
+    if session.info.pop("doctors_dirty", False):
+        invalidate()
+
+
+@event.listens_for(db.session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("doctors_dirty", None)
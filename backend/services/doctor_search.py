@@ -0,0 +1,173 @@
+"""
+Doctor search – ranked full-text lookup over the doctor directory.
+
+On PostgreSQL the query runs against the ``doctors.search_vector`` tsvector
+column (GIN-indexed, see migration c6d62b340011). Other databases use an
+in-process inverted index built from the doctors table. After the doctor
+directory cache is invalidated a background thread rebuilds it; searches keep
+using the previous index until the new one is swapped in, so no request waits
+on the rebuild. Only the very first search builds the index itself.
+"""
+
+import heapq
+import re
+import threading
+from bisect import bisect_left
+
+from flask import current_app
+from sqlalchemy import text
+
+from extensions import db
+from model import Doctor
+from services import doctor_directory
+
+# Relative weight of a hit in each field – mirrors the A/B/C/D tsvector weights
+FIELD_WEIGHTS = {
+    "full_name":      1.0,
+    "specialization": 0.4,
+    "department":     0.4,
+    "qualification":  0.2,
+    "languages":      0.2,
+    "bio":            0.1,
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Cap on vocabulary words a trailing prefix expands to (e.g. "ca" → cardiology, care …)
+MAX_EXPANSIONS = 32
+
+
+def tokenize(value: str | None) -> list[str]:
+    """Lower-case alphanumeric tokens of *value*."""
+    return _TOKEN_RE.findall(value.lower()) if value else []
+
+
+# ──────────────────── IN-PROCESS INDEX ────────────────────
+class InvertedIndex:
+    """token → {doctor_id: weight} postings with prefix lookup on the last term."""
+
+    def __init__(self, rows):
+        self.postings: dict[str, dict[int, float]] = {}
+        for row in rows:
+            for field, weight in FIELD_WEIGHTS.items():
+                for token in tokenize(getattr(row, field)):
+                    posting = self.postings.setdefault(token, {})
+                    posting[row.id] = posting.get(row.id, 0.0) + weight
+        self.vocab = sorted(self.postings)
+
+    def _expand(self, prefix: str) -> list[dict[int, float]]:
+        """Postings of up to MAX_EXPANSIONS vocabulary words starting with *prefix*."""
+        exact = self.postings.get(prefix)
+        found = [exact] if exact else []
+        i = bisect_left(self.vocab, prefix)
+        while i < len(self.vocab) and len(found) < MAX_EXPANSIONS:
+            word = self.vocab[i]
+            if not word.startswith(prefix):
+                break
+            if word != prefix:
+                found.append(self.postings[word])
+            i += 1
+        return found
+
+    def search(self, terms: list[str], limit: int) -> list[int]:
+        """Return up to *limit* doctor ids matching every term, best first.
+
+        The last term is treated as a prefix so search-as-you-type works.
+        Candidates come from the rarest term; the others are only probed.
+        """
+        if not terms:
+            return []
+        groups = [[self.postings.get(t, {})] for t in terms[:-1]]
+        groups.append(self._expand(terms[-1]))
+        groups.sort(key=lambda g: sum(len(p) for p in g))
+
+        scores: dict[int, float] = {}
+        for posting in groups[0]:
+            for doc_id, weight in posting.items():
+                if weight > scores.get(doc_id, 0.0):
+                    scores[doc_id] = weight
+
+        for group in groups[1:]:
+            narrowed = {}
+            for doc_id, score in scores.items():
+                best = max((p.get(doc_id, 0.0) for p in group), default=0.0)
+                if best:
+                    narrowed[doc_id] = score + best
+            scores = narrowed
+            if not scores:
+                return []
+        return heapq.nlargest(limit, scores, key=lambda d: (scores[d], -d))
+
+
+_lock       = threading.Lock()
+_index      = None
+_index_gen  = -1
+_rebuilding = False
+
+
+def _build() -> InvertedIndex:
+    rows = db.session.query(Doctor.id, *(getattr(Doctor, f) for f in FIELD_WEIGHTS)).all()
+    return InvertedIndex(rows)
+
+
+def _rebuild_in_background(app, current: int):
+    """Build an index for generation *current* and swap it in."""
+    global _index, _index_gen, _rebuilding
+    try:
+        with app.app_context():
+            index = _build()
+        with _lock:
+            if current > _index_gen:
+                _index, _index_gen = index, current
+    except Exception as e:
+        print(f"[Doctor Search] index rebuild failed: {e!r}")
+    finally:
+        with _lock:
+            _rebuilding = False
+
+
+def _get_index() -> InvertedIndex:
+    global _index, _index_gen, _rebuilding
+    with _lock:
+        current = doctor_directory.generation()
+        if _index is None:
+            _index, _index_gen = _build(), current
+        elif _index_gen != current and not _rebuilding:
+            # A later invalidation while this runs is picked up by the next search
+            _rebuilding = True
+            threading.Thread(target=_rebuild_in_background, args=(current_app._get_current_object(), current),
+                             name="doctor-search-rebuild", daemon=True).start()
+        return _index
+
+
+# ──────────────────── POSTGRES ────────────────────
+_PG_SEARCH = text("""
+    SELECT id FROM doctors, to_tsquery('simple', :tsquery) AS q
+    WHERE search_vector @@ q
+    ORDER BY ts_rank(search_vector, q) DESC, id
+    LIMIT :limit
+""")
+
+
+def _search_postgres(terms: list[str], limit: int) -> list[int]:
+    # Tokens are alphanumeric only, so they are safe inside a tsquery
+    tsquery = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+    return list(db.session.execute(_PG_SEARCH, {"tsquery": tsquery, "limit": limit}).scalars())
+
+
+# ──────────────────── PUBLIC API ────────────────────
+def search(query: str, limit: int = 20) -> list[Doctor]:
+    """Return up to *limit* doctors matching *query*, best match first."""
+    terms = tokenize(query)
+    if not terms:
+        return []
+
+    if db.engine.dialect.name == "postgresql":
+        ids = _search_postgres(terms, limit)
+    else:
+        ids = _get_index().search(terms, limit)
+
+    if not ids:
+        return []
+    by_id = {d.id: d for d in Doctor.query.filter(Doctor.id.in_(ids))}
+    return [by_id[i] for i in ids if i in by_id]
@@ -0,0 +1,17 @@
+"""
+Password worker – the functions run inside the password hashing pool.
+
+Kept free of Flask, the models and the app factory: spawned workers import
+only this module and werkzeug, so starting one costs an interpreter, not a
+second application.
+"""
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+def hash_password(password: str, method: str) -> str:
+    return generate_password_hash(password, method)
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    return check_password_hash(password_hash, password)
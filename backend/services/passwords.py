@@ -0,0 +1,97 @@
+"""
+Password hashing – PBKDF2/scrypt work kept off the request threads.
+
+Hashing and verification run in a dedicated process pool, so a login storm
+uses every core and never holds the GIL the other endpoints need. The
+algorithm and cost come from ``Config.PASSWORD_HASH_METHOD``; hashes created
+with older parameters are reported by :func:`needs_rehash` so ``login`` can
+upgrade them transparently.
+
+Workers run services/password_worker.py only. A pool whose worker died
+(killed, out of memory) is replaced and the call retried once.
+
+Set ``PASSWORD_HASH_WORKERS = 0`` to hash inline (scripts, debugging).
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+
+from flask import current_app
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+
+from services import password_worker
+
+# werkzeug's defaults for parameters a method string may leave out
+_METHOD_DEFAULTS = {
+    "scrypt": ("32768", "8", "1"),
+    "pbkdf2": ("sha256", str(DEFAULT_PBKDF2_ITERATIONS)),
+}
+
+_pool      = None
+_pool_lock = threading.Lock()
+
+
+def _executor():
+    """Return the shared process pool (created on first use), or None for inline."""
+    global _pool
+    workers = current_app.config["PASSWORD_HASH_WORKERS"]
+    if workers == 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process is multi-threaded and holds DB sockets
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn"))
+        return _pool
+
+
+def _discard(pool):
+    """Drop *pool* if it is still the shared one, so the next call builds a new pool."""
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False)
+
+
+def _run(fn, *args):
+    pool = _executor()
+    if pool is None:
+        return fn(*args)
+    try:
+        return pool.submit(fn, *args).result()
+    except BrokenProcessPool:
+        _discard(pool)
+    return _executor().submit(fn, *args).result()
+
+
+def hash_password(password: str) -> str:
+    """Hash *password* with the configured method."""
+    return _run(password_worker.hash_password, password, current_app.config["PASSWORD_HASH_METHOD"])
+
+
+def verify_password(password_hash: str, password: str) -> bool:
+    """Check *password* against a stored werkzeug hash."""
+    return _run(password_worker.verify_password, password_hash, password)
+
+
+def _full_method(method: str) -> str:
+    """*method* with werkzeug's defaults filled in ("scrypt" → "scrypt:32768:8:1")."""
+    name, *params = method.split(":")
+    defaults = _METHOD_DEFAULTS.get(name, ())
+    return ":".join((name, *params, *defaults[len(params):]))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True if *password_hash* was made with a method/cost other than the configured one."""
+    return _full_method(password_hash.split("$", 1)[0]) != _full_method(current_app.config["PASSWORD_HASH_METHOD"])
+
+
+def shutdown():
+    """Stop the worker processes (tests, graceful shutdown)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
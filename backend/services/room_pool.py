@@ -0,0 +1,160 @@
+"""
+Room pool – pre-created VideoSDK rooms, so scheduling a consultation does
+not wait on the VideoSDK API.
+
+Rooms live in the ``video_rooms`` table, shared by every API worker.
+:func:`claim` takes the oldest ready room in the caller's transaction, with
+a single UPDATE (``FOR UPDATE SKIP LOCKED`` on PostgreSQL), so concurrent
+workers never get the same room and never wait on each other. If the
+transaction rolls back, the room goes back to the pool. When the pool is
+empty a room is created, added as ready in its own transaction and then
+claimed the same way, so a rollback returns it to the pool too (SQLite
+allows one writer, so there it is recorded in the caller's transaction).
+
+A background refiller per worker tops the pool up every
+``ROOM_POOL_REFILL_INTERVAL`` seconds, and straight after a claim. The
+target depth is the number of rooms claimed in the last
+``ROOM_POOL_WINDOW`` seconds, clamped to ``ROOM_POOL_MIN..ROOM_POOL_MAX``.
+Rooms older than ``ROOM_POOL_MAX_AGE`` are deactivated and replaced. On
+PostgreSQL an advisory lock lets only one worker refill at a time.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import delete, func, insert, select, text, update
+
+from extensions import db
+from model import VideoRoom
+from services import videosdk
+
+REFILL_BATCH = 10               # rooms created per pass, so one pass never runs long
+ADVISORY_KEY = 0x726F6F6D       # pg advisory lock id for the refiller ("room")
+
+_wake = threading.Event()
+_started = False
+_start_lock = threading.Lock()
+
+
+def _now() -> datetime:
+    return datetime.utcnow()
+
+
+def _fresh_after() -> datetime:
+    return _now() - timedelta(seconds=current_app.config["ROOM_POOL_MAX_AGE"])
+
+
+def claim():
+    """Take a ready room in the current transaction; None if the pool is empty."""
+    oldest = (select(VideoRoom.id)
+              .where(VideoRoom.claimed_at.is_(None), VideoRoom.created_at > _fresh_after())
+              .order_by(VideoRoom.created_at)
+              .limit(1)
+              .with_for_update(skip_locked=True)
+              .scalar_subquery())
+    room_id = db.session.execute(
+        update(VideoRoom)
+        .where(VideoRoom.id == oldest, VideoRoom.claimed_at.is_(None))
+        .values(claimed_at=_now())
+        .returning(VideoRoom.room_id)
+    ).scalar()
+    _wake.set()                                 # top up (or fill) the pool now
+    return room_id
+
+
+def acquire() -> str:
+    """A room for a consultation: from the pool if possible, else created now.
+    The caller commits (a pooled room is only consumed if it does)."""
+    if current_app.config["ROOM_POOL_MAX"] <= 0:
+        return videosdk.create_room()
+    room_id = claim()
+    if room_id is None and db.engine.dialect.name != "postgresql":
+        room_id = videosdk.create_room()
+        db.session.add(VideoRoom(room_id=room_id, claimed_at=_now()))    # a miss is demand too
+    while room_id is None:
+        with db.engine.begin() as conn:             # committed now, whatever the caller does
+            conn.execute(insert(VideoRoom).values(room_id=videosdk.create_room(), created_at=_now()))
+        room_id = claim()                           # a miss is demand too
+    return room_id
+
+
+# ──────────────────── REFILLER ────────────────────
+def target_depth() -> int:
+    """Rooms claimed during the last window, clamped to the configured bounds."""
+    config = current_app.config
+    since = _now() - timedelta(seconds=config["ROOM_POOL_WINDOW"])
+    claimed = db.session.scalar(select(func.count()).where(VideoRoom.claimed_at > since))
+    return max(config["ROOM_POOL_MIN"], min(config["ROOM_POOL_MAX"], claimed))
+
+
+def _recycle() -> int:
+    """Remove stale ready rooms (deactivating them upstream) and old claim history."""
+    stale = db.session.scalars(
+        delete(VideoRoom)
+        .where(VideoRoom.claimed_at.is_(None), VideoRoom.created_at <= _fresh_after())
+        .returning(VideoRoom.room_id)
+    ).all()
+    window = timedelta(seconds=current_app.config["ROOM_POOL_WINDOW"])
+    db.session.execute(delete(VideoRoom).where(VideoRoom.claimed_at < _now() - window))
+    db.session.commit()
+    for room_id in stale:
+        try:
+            videosdk.deactivate_room(room_id)
+        except Exception as e:
+            print(f"[Room Pool] could not deactivate {room_id}: {e!r}")
+    return len(stale)
+
+
+def refill() -> dict:
+    """One pass: recycle, then create rooms up to the target depth (bounded per pass)."""
+    stats = {"recycled": _recycle(), "created": 0}
+    ready = db.session.scalar(select(func.count()).where(
+        VideoRoom.claimed_at.is_(None), VideoRoom.created_at > _fresh_after()))
+    stats["target"] = target_depth()
+    for _ in range(min(stats["target"] - ready, REFILL_BATCH)):
+        db.session.add(VideoRoom(room_id=videosdk.create_room()))
+        db.session.commit()                     # claimable right away
+        stats["created"] += 1
+    stats["ready"] = ready + stats["created"]
+    return stats
+
+
+def _refill_exclusive():
+    """refill(), by one worker at a time on PostgreSQL."""
+    if db.engine.dialect.name != "postgresql":
+        return refill()
+    with db.engine.connect() as lock:
+        if not lock.scalar(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_KEY}):
+            return None                         # another worker is refilling
+        try:
+            return refill()
+        finally:
+            lock.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": ADVISORY_KEY})
+
+
+def _run(app):
+    interval = app.config["ROOM_POOL_REFILL_INTERVAL"]
+    while True:
+        with app.app_context():
+            try:
+                _refill_exclusive()
+            except Exception as e:
+                db.session.rollback()
+                print(f"[Room Pool] refill failed: {e!r}")
+            finally:
+                db.session.remove()
+        _wake.wait(interval)
+        _wake.clear()
+
+
+def start(app):
+    """Start this worker's refiller once (no-op if the pool is disabled or
+    VideoSDK is not configured)."""
+    global _started
+    if _started or app.config["ROOM_POOL_MAX"] <= 0 or not app.config["VIDEOSDK_API_KEY"]:
+        return
+    with _start_lock:
+        if not _started:
+            threading.Thread(target=_run, args=(app,), name="room-pool-refiller", daemon=True).start()
+            _started = True
@@ -0,0 +1,183 @@
+"""
+Slot availability – free consultation slots from a doctor's weekly schedule.
+
+For each day the doctor's schedule windows are cut into ``slot_minutes``
+slots, and every slot overlapping a booked (non-cancelled) appointment is
+dropped. Booked appointments are fetched once per request for all uncached
+days and kept as a sorted list of intervals, so each slot is checked with a
+binary search. Results are cached per (doctor, day) and invalidated whenever
+an appointment or the doctor's schedule changes; a result computed while
+such a change was committed is returned but not cached.
+"""
+
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import object_session
+
+from extensions import db
+from model import WEEKDAYS, Appointment, Doctor
+
+CACHE_SIZE = 10_000                         # (doctor, day) entries kept in memory
+
+_lock  = threading.Lock()
+_cache: OrderedDict = OrderedDict()         # (doctor_id, date)  →  tuple of "HH:MM"
+_generations: dict = {}                     # doctor_id  →  invalidation counter
+
+
+class BookedIntervals:
+    """Sorted, non-overlapping [start, end) intervals of booked time."""
+
+    def __init__(self, intervals):
+        self.starts: list[datetime] = []
+        self.ends:   list[datetime] = []
+        for start, end in sorted(intervals):
+            if self.ends and start <= self.ends[-1]:
+                self.ends[-1] = max(self.ends[-1], end)     # merge overlaps
+            else:
+                self.starts.append(start)
+                self.ends.append(end)
+
+    def overlaps(self, start: datetime, end: datetime) -> bool:
+        """True if [start, end) intersects any booked interval."""
+        i = bisect_right(self.starts, start) - 1
+        if i >= 0 and self.ends[i] > start:
+            return True
+        return i + 1 < len(self.starts) and self.starts[i + 1] < end
+
+
+def _windows(doctor: Doctor, day: date) -> list:
+    """The doctor's schedule windows on *day* as sorted, merged [open, close) datetimes."""
+    merged = []
+    for start, end in sorted((doctor.weekly_schedule or {}).get(WEEKDAYS[day.weekday()], [])):
+        open_  = datetime.combine(day, datetime.strptime(start, "%H:%M").time())
+        close  = datetime.combine(day, datetime.strptime(end, "%H:%M").time())
+        if merged and open_ <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], close)
+        else:
+            merged.append([open_, close])
+    return merged
+
+
+def _day_slots(doctor: Doctor, day: date, booked: BookedIntervals) -> tuple:
+    step  = timedelta(minutes=doctor.slot_minutes or 30)
+    slots = []
+    for cursor, close in _windows(doctor, day):
+        while cursor + step <= close:
+            if not booked.overlaps(cursor, cursor + step):
+                slots.append(cursor.strftime("%H:%M"))
+            cursor += step
+    return tuple(slots)
+
+
+def on_grid(doctor: Doctor, at: datetime) -> bool:
+    """True if *at* starts one of the doctor's slots (booked or not).
+
+    Doctors without weekly hours (no schedule, or an empty one) only have
+    their slot length to go by, so any multiple of it past midnight is
+    accepted for them.
+    """
+    if not doctor.weekly_schedule:
+        step = doctor.slot_minutes or 30
+        return at.second == 0 and (at.hour * 60 + at.minute) % step == 0
+    return at.second == 0 and at.strftime("%H:%M") in _day_slots(doctor, at.date(), BookedIntervals(()))
+
+
+def is_free(doctor: Doctor, at: datetime) -> bool:
+    """True if no live booking of the doctor overlaps the slot starting at *at*."""
+    step = timedelta(minutes=doctor.slot_minutes or 30)
+    taken = (
+        db.session.query(Appointment.id)
+        .filter(Appointment.doctor_id == doctor.id)
+        .filter(Appointment.scheduled_at > at - step, Appointment.scheduled_at < at + step)
+        .filter(Appointment.status != "Cancelled")
+        .first()
+    )
+    return taken is None
+
+
+def free_slots(doctor: Doctor, start: date, end: date) -> dict:
+    """Return ``{date: ("HH:MM", …)}`` for every day in [start, end]."""
+    days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+    result, missing = {}, []
+    with _lock:
+        generation = _generations.get(doctor.id, 0)
+        for day in days:
+            key = (doctor.id, day)
+            if key in _cache:
+                _cache.move_to_end(key)
+                result[day] = _cache[key]
+            else:
+                missing.append(day)
+
+    if missing:
+        step = timedelta(minutes=doctor.slot_minutes or 30)
+        rows = (
+            db.session.query(Appointment.scheduled_at)
+            .filter(Appointment.doctor_id == doctor.id)
+            .filter(Appointment.scheduled_at >= datetime.combine(missing[0], datetime.min.time()))
+            .filter(Appointment.scheduled_at < datetime.combine(missing[-1] + timedelta(days=1),
+                                                                datetime.min.time()))
+            .filter(Appointment.status != "Cancelled")
+            .all()
+        )
+        booked = BookedIntervals((at, at + step) for (at,) in rows)
+
+        computed = {day: _day_slots(doctor, day, booked) for day in missing}
+        result.update(computed)
+        with _lock:
+            # Skip the store if the doctor's bookings or schedule changed while we were querying
+            if generation == _generations.get(doctor.id, 0):
+                for day, slots in computed.items():
+                    _cache[(doctor.id, day)] = slots
+                while len(_cache) > CACHE_SIZE:
+                    _cache.popitem(last=False)
+
+    return {day: result[day] for day in days}
+
+
+def invalidate(doctor_id: int, day: date | None = None):
+    """Drop cached slots for one doctor-day, or all of the doctor's days."""
+    with _lock:
+        _generations[doctor_id] = _generations.get(doctor_id, 0) + 1
+        if day is not None:
+            _cache.pop((doctor_id, day), None)
+            return
+        for key in [k for k in _cache if k[0] == doctor_id]:
+            del _cache[key]
+
+
+# ── Invalidate on booking, cancellation, reschedule and schedule edits ──
+def _pending(session) -> set:
+    return session.info.setdefault("slots_dirty", set())
+
+
+@event.listens_for(Appointment, "after_insert")
+@event.listens_for(Appointment, "after_update")
+@event.listens_for(Appointment, "after_delete")
+def _mark_appointment(mapper, connection, target):
+    pending = _pending(object_session(target))
+    history = inspect(target).attrs.scheduled_at.history
+    for at in (*history.unchanged, *history.added, *history.deleted):
+        if at is not None:
+            pending.add((target.doctor_id, at.date()))
+
+
+@event.listens_for(Doctor, "after_update")
+def _mark_doctor(mapper, connection, target):
+    _pending(object_session(target)).add((target.id, None))
+
+
+@event.listens_for(db.session, "after_commit")
+def _after_commit(session):
+    for doctor_id, day in session.info.pop("slots_dirty", ()):
+        invalidate(doctor_id, day)
+
+
+@event.listens_for(db.session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("slots_dirty", None)
@@ -0,0 +1,102 @@
+"""
+Transcript archive – compression of sealed transcript segments.
+
+Closed segments are compressed by one background thread so bots never wait
+on it: gzip by default, or zstd if ``TRANSCRIPT_COMPRESSION = "zstd"`` and
+the optional ``zstandard`` package is installed. :func:`open_segment` opens
+any segment as a plain binary stream, decompressing transparently, so
+readers never see the codec.
+"""
+
+import atexit
+import gzip
+import io
+import os
+import queue
+import shutil
+import threading
+
+try:
+    import zstandard
+except ImportError:                 # optional – zstd falls back to gzip
+    zstandard = None
+
+SUFFIXES = {"gzip": ".gz", "zstd": ".zst", "none": ""}
+COPY_CHUNK = 1024 * 1024
+
+_queue: "queue.Queue[tuple[str, str]]" = queue.Queue()
+_worker_lock = threading.Lock()
+_worker = None
+
+
+def resolve_codec(codec: str) -> str:
+    """*codec* if usable here; zstd without ``zstandard`` installed becomes gzip."""
+    if codec not in SUFFIXES:
+        raise ValueError(f"Unknown transcript compression {codec!r}")
+    if codec == "zstd" and zstandard is None:
+        return "gzip"
+    return codec
+
+
+def open_segment(path: str):
+    """Open a (possibly compressed) segment for binary, line-by-line reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} is zstd-compressed; install the 'zstandard' package")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True))
+    return open(path, "rb")
+
+
+def open_compressed_writer(path: str, codec: str):
+    """Binary writer for *path* (which must already carry the codec's suffix)."""
+    if codec == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=6).stream_writer(open(path, "wb"), closefd=True)
+    return open(path, "wb")
+
+
+def compress(path: str, codec: str) -> str:
+    """Compress *path* in place (atomic rename), remove the original, return the new path."""
+    codec = resolve_codec(codec)
+    if codec == "none" or not os.path.exists(path):
+        return path
+    target = path + SUFFIXES[codec]
+    tmp = target + ".tmp"
+    with open(path, "rb") as src, open_compressed_writer(tmp, codec) as dst:
+        shutil.copyfileobj(src, dst, COPY_CHUNK)
+    os.replace(tmp, target)
+    os.remove(path)
+    return target
+
+
+def _compress_loop():
+    while True:
+        path, codec = _queue.get()
+        try:
+            compress(path, codec)
+        except Exception as e:
+            print(f"[Transcript Archive] could not compress {path}: {e!r}")
+        finally:
+            _queue.task_done()
+
+
+def compress_later(path: str, codec: str):
+    """Queue *path* for compression on the background thread."""
+    global _worker
+    if resolve_codec(codec) == "none":
+        return
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=_compress_loop, name="transcript-compressor", daemon=True)
+            _worker.start()
+    _queue.put((path, codec))
+
+
+@atexit.register
+def drain():
+    """Wait for queued compressions (scripts, graceful shutdown)."""
+    if _worker is not None:
+        _queue.join()
@@ -0,0 +1,279 @@
+"""
+Transcript index – cross-meeting full-text search over finalized utterances.
+
+The bot hands every finalized utterance to :func:`index_utterance`, which
+queues it for one background thread. That thread resolves the meeting to its
+appointment (patient, doctor, booking user) once and batch-inserts rows into
+``transcript_entries``. It has its own engine, because bots also run in
+worker processes without a Flask app.
+
+Queries never touch transcript files. On PostgreSQL they run against the
+GIN-indexed ``search_vector`` column (migration 3f1b7c9a2d64). Other
+databases use an in-process inverted index that only loads rows added since
+the previous query. Rows deleted since (retention pruning, cascades) are
+evicted when they turn up missing in a result, which is then refilled, and
+when the table is found to hold fewer rows than the index – checked at most
+every ``COUNT_RECHECK`` seconds, or on the next query after this process
+deleted an appointment.
+"""
+
+import atexit
+import heapq
+import queue
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine, delete, event, func, insert, select, text
+from sqlalchemy.orm import object_session
+
+from config import Config
+from extensions import db
+from model import Appointment, TranscriptEntry
+from services.doctor_search import MAX_EXPANSIONS, tokenize
+
+FLUSH_INTERVAL = 1.0            # seconds an utterance may wait before it is inserted
+MAX_BATCH      = 500
+PARTY_RECHECK  = 60.0           # seconds before re-resolving a meeting with no appointment
+PARTIES_KEPT   = 10_000         # meetings whose appointment lookup is remembered
+LOAD_BATCH     = 5000
+COUNT_RECHECK  = 60.0           # seconds between row-count checks for deleted entries
+
+
+# ──────────────────── WRITER (bot side) ────────────────────
+class IndexWriter:
+    """Queues utterances and inserts them in batches from a background thread."""
+
+    def __init__(self, database_url: str):
+        self.engine   = create_engine(database_url, pool_pre_ping=True)
+        self._queue   = queue.Queue()
+        self._parties = OrderedDict()   # meeting_id → ((appointment, patient, doctor, user) | None, checked_at)
+        self._thread  = threading.Thread(target=self._run, name="transcript-indexer", daemon=True)
+        self._thread.start()
+
+    def add(self, meeting_id: str, epoch: float, record: dict):
+        self._queue.put((meeting_id, epoch, record))
+
+    def _resolve(self, conn, meeting_id: str):
+        parties, checked_at = self._parties.get(meeting_id, (None, float("-inf")))
+        if parties is None and time.monotonic() - checked_at >= PARTY_RECHECK:
+            row = conn.execute(
+                select(Appointment.id, Appointment.patient_id, Appointment.doctor_id, Appointment.user_id)
+                .where(Appointment.meeting_link == meeting_id)
+                .order_by(Appointment.id.desc())
+                .limit(1)
+            ).first()
+            parties = tuple(row) if row else None
+            self._parties[meeting_id] = (parties, time.monotonic())
+        if meeting_id in self._parties:
+            self._parties.move_to_end(meeting_id)
+            while len(self._parties) > PARTIES_KEPT:
+                self._parties.popitem(last=False)
+        return parties
+
+    def flush(self, batch: list):
+        """Insert *batch* of (meeting_id, epoch, record); utterances of meetings
+        without an appointment are not searchable by anyone and are dropped."""
+        rows = []
+        with self.engine.begin() as conn:
+            for meeting_id, epoch, record in batch:
+                parties = self._resolve(conn, meeting_id)
+                if parties is None or not record.get("text"):
+                    continue
+                appointment_id, patient_id, doctor_id, user_id = parties
+                rows.append({
+                    "appointment_id": appointment_id,
+                    "patient_id":     patient_id,
+                    "doctor_id":      doctor_id,
+                    "user_id":        user_id,
+                    "meeting_id":     meeting_id,
+                    "offset_seconds": record["t"],
+                    "spoken_at":      datetime.fromtimestamp(epoch + record["t"], timezone.utc).replace(tzinfo=None),
+                    "speaker":        record.get("speaker"),
+                    "text":           record["text"],
+                })
+            if rows:
+                conn.execute(insert(TranscriptEntry), rows)
+        return len(rows)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            while len(batch) < MAX_BATCH:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            try:
+                self.flush(batch)
+            except Exception as e:
+                print(f"[Transcript Index] dropped {len(batch)} utterances: {e!r}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def drain(self):
+        self._queue.join()
+
+
+_writer      = None
+_writer_lock = threading.Lock()
+
+
+def index_utterance(meeting_id: str, epoch: float, record: dict):
+    """Queue a finalized transcript record for indexing (no-op without a database)."""
+    global _writer
+    if _writer is None:
+        if not Config.SQLALCHEMY_DATABASE_URI:
+            return
+        with _writer_lock:
+            if _writer is None:
+                _writer = IndexWriter(Config.SQLALCHEMY_DATABASE_URI)
+    _writer.add(meeting_id, epoch, record)
+
+
+@atexit.register
+def drain():
+    """Wait until queued utterances are inserted (scripts, graceful shutdown)."""
+    if _writer is not None:
+        _writer.drain()
+
+
+def prune(database_url: str, before: datetime) -> int:
+    """Delete entries spoken before *before* (transcript retention)."""
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        return conn.execute(delete(TranscriptEntry).where(TranscriptEntry.spoken_at < before)).rowcount
+
+
+# ──────────────────── IN-PROCESS INDEX ────────────────────
+class _MemoryIndex:
+    """token → entry ids, loaded incrementally by id."""
+
+    def __init__(self):
+        self.postings: dict[str, set[int]] = {}
+        self.entries:  dict[int, tuple]    = {}     # id → (patient_id, doctor_id, user_id, spoken_at)
+        self.vocab:    list[str]           = []
+        self.last_id = 0
+        self.dead    = 0                            # evicted ids still listed in postings
+        self.stale   = False                        # an appointment was deleted here
+        self.next_reconcile = 0.0
+
+    def refresh(self):
+        rows = (db.session.query(TranscriptEntry.id, TranscriptEntry.patient_id, TranscriptEntry.doctor_id,
+                                 TranscriptEntry.user_id, TranscriptEntry.spoken_at, TranscriptEntry.text)
+                .filter(TranscriptEntry.id > self.last_id)
+                .order_by(TranscriptEntry.id)
+                .yield_per(LOAD_BATCH))
+        added = False
+        for entry_id, patient_id, doctor_id, user_id, spoken_at, body in rows:
+            self.entries[entry_id] = (patient_id, doctor_id, user_id, spoken_at)
+            for token in set(tokenize(body)):
+                posting = self.postings.get(token)
+                if posting is None:
+                    posting = self.postings[token] = set()
+                    added = True
+                posting.add(entry_id)
+            self.last_id = entry_id
+        if added:
+            self.vocab = sorted(self.postings)
+
+        now = time.monotonic()
+        if self.stale or now >= self.next_reconcile:
+            self.stale, self.next_reconcile = False, now + COUNT_RECHECK
+            # Fewer rows than entries: some were deleted (retention pruning, cascades)
+            if db.session.query(func.count(TranscriptEntry.id)).scalar() < len(self.entries):
+                live = set(db.session.scalars(select(TranscriptEntry.id)))
+                self.evict([i for i in self.entries if i not in live])
+
+    def evict(self, ids):
+        """Forget deleted entries; postings are compacted once they are mostly dead."""
+        for entry_id in ids:
+            if self.entries.pop(entry_id, None) is not None:
+                self.dead += 1
+        if self.dead and self.dead >= len(self.entries):
+            for token in list(self.postings):
+                live = {i for i in self.postings[token] if i in self.entries}
+                if live:
+                    self.postings[token] = live
+                else:
+                    del self.postings[token]
+            self.vocab = sorted(self.postings)
+            self.dead = 0
+
+    def _expand(self, prefix: str) -> set[int]:
+        found = set(self.postings.get(prefix, ()))
+        i, taken = bisect_left(self.vocab, prefix), 0
+        while i < len(self.vocab) and taken < MAX_EXPANSIONS and self.vocab[i].startswith(prefix):
+            found |= self.postings[self.vocab[i]]
+            i, taken = i + 1, taken + 1
+        return found
+
+    def search(self, terms: list[str], scope: int, owner_id: int, patient_id, limit: int) -> list[int]:
+        """Newest entry ids containing every term (last one as a prefix) within scope."""
+        groups = [self.postings.get(t, set()) for t in terms[:-1]] + [self._expand(terms[-1])]
+        groups.sort(key=len)
+        hits = []
+        for entry_id in groups[0]:
+            meta = self.entries.get(entry_id)
+            if meta is None or meta[scope] != owner_id or (patient_id is not None and meta[0] != patient_id):
+                continue
+            if all(entry_id in group for group in groups[1:]):
+                hits.append(entry_id)
+        return heapq.nlargest(limit, hits, key=lambda i: (self.entries[i][3], i))
+
+
+_lock  = threading.Lock()
+_index = _MemoryIndex()
+
+
+@event.listens_for(Appointment, "after_delete")
+def _mark_deleted(mapper, connection, target):
+    object_session(target).info["transcript_entries_deleted"] = True
+
+
+@event.listens_for(db.session, "after_commit")
+def _after_commit(session):
+    if session.info.pop("transcript_entries_deleted", False):
+        _index.stale = True
+
+
+@event.listens_for(db.session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop("transcript_entries_deleted", None)
+
+
+# ──────────────────── PUBLIC API ────────────────────
+def search(query: str, current_user, patient_id: int | None = None, limit: int = 20) -> list[TranscriptEntry]:
+    """Utterances matching every word of *query*, newest first, limited to the
+    caller's own consultations (a doctor's, or the booking user's)."""
+    terms = tokenize(query)
+    if not terms:
+        return []
+    is_doctor = current_user.role == "doctor"
+
+    if db.engine.dialect.name == "postgresql":
+        # Tokens are alphanumeric only, so they are safe inside a tsquery
+        tsquery = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+        owner = TranscriptEntry.doctor_id if is_doctor else TranscriptEntry.user_id
+        q = TranscriptEntry.query.filter(owner == current_user.id,
+                                         text("search_vector @@ to_tsquery('simple', :tsquery)"))
+        if patient_id is not None:
+            q = q.filter(TranscriptEntry.patient_id == patient_id)
+        return (q.params(tsquery=tsquery)
+                 .order_by(TranscriptEntry.spoken_at.desc(), TranscriptEntry.id.desc())
+                 .limit(limit).all())
+
+    with _lock:
+        _index.refresh()
+        while True:
+            ids = _index.search(terms, 1 if is_doctor else 2, current_user.id, patient_id, limit)
+            if not ids:
+                return []
+            by_id = {e.id: e for e in TranscriptEntry.query.filter(TranscriptEntry.id.in_(ids))}
+            if len(by_id) == len(ids):
+                return [by_id[i] for i in ids]
+            _index.evict([i for i in ids if i not in by_id])     # deleted since loaded – refill
@@ -0,0 +1,163 @@
+"""
+Transcript stabilizer – collapse streaming partial hypotheses into utterances.
+
+Realtime transcription re-sends the utterance in progress every time the
+recogniser revises it ("help patients" → "help patients with" → …), often
+several identical copies in a row. Writing each one inflates transcripts by
+an order of magnitude. The stabilizer keeps the latest hypothesis per
+participant and only emits it once it is *final*:
+
+* duplicate           – same text (ignoring case/punctuation): dropped
+* prefix growth       – new text extends the pending one: replaces it
+* rewrite             – long shared prefix, or a lone unpunctuated word
+                        ("Whether" → "Without"): replaces it
+* anything else       – a new utterance: the pending one is emitted
+
+The recogniser also sometimes re-sends the previous, already emitted
+utterance in front of the current one ("purpose and agenda? So today, we
+are"), or re-sends an interim piece of it just after it was emitted. Within
+``RESEND_WINDOW`` seconds of an emission that echo is stripped, and
+non-final resends are dropped. Final hypotheses are never dropped, so a
+patient answering "Yes." twice keeps both answers.
+
+Each decision is a single common-prefix scan, O(length) per event.
+"""
+
+import time
+from typing import NamedTuple, Optional
+
+REWRITE_RATIO = 0.4             # shared prefix ≥ 40% of the pending text ⇒ same utterance
+IDLE_FINALIZE = 3.0             # seconds without revisions before a hypothesis is final
+RESEND_WINDOW = 2.0             # seconds after an emission in which echoes/resends of it are expected
+
+
+class Utterance(NamedTuple):
+    participant_id: str
+    name:           str
+    text:           str
+    started:        float       # time.time() of the first hypothesis
+
+
+class _Pending:
+    __slots__ = ("name", "text", "norm", "started", "updated")
+
+    def __init__(self, name: str, text: str, norm: str, now: float):
+        self.name, self.text, self.norm = name, text, norm
+        self.started = self.updated = now
+
+
+def _normalise(text: str) -> str:
+    """Lower-case words without punctuation, single-spaced."""
+    out, space = [], False
+    for ch in text.lower():
+        if ch.isalnum():
+            if space and out:
+                out.append(" ")
+            out.append(ch)
+            space = False
+        else:
+            space = True
+    return "".join(out)
+
+
+def _drop_words(text: str, count: int) -> str:
+    """Return *text* after its first *count* alphanumeric words."""
+    i, n = 0, len(text)
+    for _ in range(count):
+        while i < n and not text[i].isalnum():
+            i += 1
+        while i < n and text[i].isalnum():
+            i += 1
+    while i < n and not text[i].isalnum():
+        i += 1
+    return text[i:]
+
+
+def _common_prefix(a: str, b: str) -> int:
+    n = min(len(a), len(b))
+    i = 0
+    while i < n and a[i] == b[i]:
+        i += 1
+    return i
+
+
+class UtteranceStabilizer:
+    """Per-participant hypothesis tracker for one meeting."""
+
+    def __init__(self, rewrite_ratio: float = REWRITE_RATIO, idle_finalize: float = IDLE_FINALIZE,
+                 resend_window: float = RESEND_WINDOW):
+        self.rewrite_ratio = rewrite_ratio
+        self.idle_finalize = idle_finalize
+        self.resend_window = resend_window
+        self._pending: dict[str, _Pending] = {}
+        self._last:    dict[str, tuple]    = {}      # participant → (last emitted, normalised; when)
+
+    def feed(self, participant_id: str, name: str, text: str,
+             final: bool = False, now: Optional[float] = None) -> list[Utterance]:
+        """Consume one hypothesis; return the utterances that became final."""
+        now  = time.time() if now is None else now
+        text = text.strip()
+        norm = _normalise(text)
+        emitted = self.flush_idle(now, exclude=participant_id)
+
+        last = self._recent(participant_id, now)
+        if last and norm.startswith(last + " "):
+            text = _drop_words(text, last.count(" ") + 1)  # echo of the emitted utterance
+            norm = norm[len(last) + 1:]
+        elif last and not final and last.startswith(norm):
+            norm = ""                                       # late interim resend of what we emitted
+        if not norm:
+            return emitted
+
+        pending = self._pending.get(participant_id)
+        if pending is not None and not self._same_utterance(pending, norm):
+            emitted.append(self._emit(participant_id))
+            pending = None
+
+        if pending is None:
+            pending = self._pending[participant_id] = _Pending(name, text, norm, now)
+        elif not pending.norm.startswith(norm) or len(norm) == len(pending.norm):
+            # growth, rewrite or re-punctuated duplicate – keep the newest wording
+            # (a shorter prefix of what we already have is a stale resend)
+            pending.text, pending.norm = text, norm
+        pending.updated = now
+
+        if final:
+            emitted.append(self._emit(participant_id, now))
+        return emitted
+
+    def _same_utterance(self, pending: _Pending, new: str) -> bool:
+        old    = pending.norm
+        shared = _common_prefix(old, new)
+        if shared == len(old) or shared == len(new):
+            return True                                  # duplicate / growth / stale resend
+        if shared >= self.rewrite_ratio * len(old):
+            return True                                  # revised tail
+        # A lone unpunctuated word is still being recognised ("Whether" → "Without")
+        return " " not in old and pending.text[-1:] not in ".?!"
+
+    def _recent(self, participant_id: str, now: float) -> Optional[str]:
+        """The participant's last emitted text, if emitted within the resend window."""
+        last = self._last.get(participant_id)
+        if last is None:
+            return None
+        if now - last[1] > self.resend_window:
+            del self._last[participant_id]
+            return None
+        return last[0]
+
+    def _emit(self, participant_id: str, now: Optional[float] = None) -> Utterance:
+        p = self._pending.pop(participant_id)
+        self._last[participant_id] = (p.norm, p.updated if now is None else now)
+        return Utterance(participant_id, p.name, p.text, p.started)
+
+    def flush_idle(self, now: Optional[float] = None, exclude: Optional[str] = None) -> list[Utterance]:
+        """Emit hypotheses that have not been revised for ``idle_finalize`` seconds."""
+        now = time.time() if now is None else now
+        idle = [pid for pid, p in self._pending.items()
+                if pid != exclude and now - p.updated >= self.idle_finalize]
+        return [self._emit(pid, now) for pid in idle]
+
+    def flush(self) -> list[Utterance]:
+        """Emit everything still pending (meeting stopped)."""
+        return [self._emit(pid) for pid in list(self._pending)]
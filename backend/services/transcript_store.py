@@ -0,0 +1,425 @@
+"""
+Transcript store – structured, append-only JSONL transcripts per meeting.
+
+A meeting's transcript is a sequence of segments kept in its own
+``<meeting_id>/`` subdirectory, so finding them never lists other meetings'
+files. Records are appended to the active segment ``<meeting_id>.jsonl``;
+when it reaches ``TRANSCRIPT_SEGMENT_BYTES``, or the bot session ends, it is
+sealed as ``<meeting_id>.<n>.jsonl`` and compressed in the background
+(services/transcript_archive.py). Every segment starts with a ``meta``
+record holding the meeting's wall-clock ``epoch``; every other line is one
+record::
+
+    {"t": 12.48, "kind": "text", "speaker": "Dr. Sharma", "participantId": "x1",
+     "text": "How are you feeling?", "final": true, "start": 9.9}
+
+``t`` is seconds since the epoch at which the record was written. It is
+monotonic within a bot session and never decreases across rejoins, so
+segments are sorted by ``t``, in order. ``start`` is when the utterance
+began. ``kind`` is ``text``, ``state`` (transcription state changes) or
+``session`` (bot started/ended).
+
+Each segment has a sidecar ``.idx`` holding one ``t<TAB>byte offset`` line
+every ``INDEX_EVERY`` seconds; offsets are into the uncompressed stream.
+:func:`read` uses the index to skip whole segments and to seek within
+one instead of parsing the whole transcript. :func:`maintain` is the
+retention/compaction pass (archive_transcripts.py).
+"""
+
+import bisect
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from typing import Iterator, Optional
+
+from services import transcript_archive
+from services.transcript_writer import TranscriptWriter
+
+INDEX_EVERY   = 10.0                # seconds of transcript between index entries
+SEGMENT_BYTES = 4 * 1024 * 1024     # active segment size that triggers rollover
+COMPRESSION   = "gzip"
+
+TRANSCRIPT_SUFFIX = ".jsonl"
+INDEX_SUFFIX      = ".idx"
+
+# <meeting>[.<segment>].jsonl[.gz|.zst]  and  <meeting>[.<segment>].idx
+_FILE_NAME = re.compile(r"^(?P<meeting>[^.]+)(?:\.(?P<segment>\d{6}))?"
+                        r"\.(?P<ext>jsonl(?:\.gz|\.zst)?|idx)$")
+
+
+def meeting_dir(directory: str, meeting_id: str) -> str:
+    """Subdirectory holding all of the meeting's segments."""
+    return os.path.join(directory, meeting_id)
+
+
+def transcript_path(directory: str, meeting_id: str) -> str:
+    """Path of the meeting's active segment."""
+    return os.path.join(meeting_dir(directory, meeting_id), f"{meeting_id}{TRANSCRIPT_SUFFIX}")
+
+
+def index_path(directory: str, meeting_id: str) -> str:
+    return os.path.join(meeting_dir(directory, meeting_id), f"{meeting_id}{INDEX_SUFFIX}")
+
+
+def _segment_base(directory: str, meeting_id: str, segment: int) -> str:
+    return os.path.join(meeting_dir(directory, meeting_id), f"{meeting_id}.{segment:06d}")
+
+
+def _dumps(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":"))
+
+
+def _load_index(path: str, data_path: Optional[str] = None) -> tuple[list[float], list[int]]:
+    """Index entries of a segment. For an uncompressed *data_path*, entries
+    pointing past its end (data lost in a crash) are dropped."""
+    times, offsets = [], []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                t, _, offset = line.partition("\t")
+                try:
+                    times.append(float(t))
+                    offsets.append(int(offset))
+                except ValueError:
+                    break                               # torn last line after a crash
+    except FileNotFoundError:
+        pass
+    if data_path is not None and data_path.endswith(TRANSCRIPT_SUFFIX):
+        try:
+            size = os.path.getsize(data_path)
+        except FileNotFoundError:
+            return times, offsets                       # compressed meanwhile
+        keep = bisect.bisect_left(offsets, size)        # offsets only grow
+        del times[keep:], offsets[keep:]
+    return times, offsets
+
+
+def list_meetings(directory: str) -> list[str]:
+    """Ids of every meeting with a transcript directory in *directory*."""
+    with os.scandir(directory) as entries:
+        return sorted(e.name for e in entries if e.is_dir() and "." not in e.name)
+
+
+def _scan(directory: str, meeting_id: str) -> list[tuple[re.Match, str, os.DirEntry]]:
+    """``(name match, path, entry)`` of every transcript file of the meeting."""
+    try:
+        with os.scandir(meeting_dir(directory, meeting_id)) as entries:
+            return [(match, entry.path, entry) for entry in entries
+                    if (match := _FILE_NAME.match(entry.name)) and match["meeting"] == meeting_id]
+    except FileNotFoundError:
+        return []
+
+
+def _sealed(files) -> list[tuple[int, str]]:
+    """Sealed data segments among *files* (``(name match, path, …)``), in order.
+
+    While a segment is being compressed both files exist; the compressed one wins.
+    """
+    found = {}
+    for match, path, *_ in files:
+        if match["segment"] is None or match["ext"] == "idx":
+            continue
+        segment = int(match["segment"])
+        if segment not in found or match["ext"] != "jsonl":
+            found[segment] = path
+    return sorted(found.items())
+
+
+def sealed_segments(directory: str, meeting_id: str) -> list[tuple[int, str]]:
+    """``(segment number, data path)`` of the meeting's sealed segments, in order."""
+    return _sealed(_scan(directory, meeting_id))
+
+
+def _parts(directory: str, meeting_id: str) -> list[tuple[str, str]]:
+    """``(data path, index path)`` of every segment, oldest first, active last."""
+    parts = [(path, _segment_base(directory, meeting_id, segment) + INDEX_SUFFIX)
+             for segment, path in sealed_segments(directory, meeting_id)]
+    active = transcript_path(directory, meeting_id)
+    if os.path.exists(active):
+        parts.append((active, index_path(directory, meeting_id)))
+    return parts
+
+
+def _open_part(path: str):
+    """Open a segment, following it if it was compressed since it was listed."""
+    for candidate in (path, *(path + suffix for suffix in transcript_archive.SUFFIXES.values() if suffix)):
+        try:
+            return transcript_archive.open_segment(candidate)
+        except FileNotFoundError:
+            continue
+    raise FileNotFoundError(path)
+
+
+def read_meta(directory: str, meeting_id: str) -> Optional[dict]:
+    """The meeting's ``meta`` record, or None if it has no transcript."""
+    for path, _ in _parts(directory, meeting_id)[:1]:
+        try:
+            with _open_part(path) as f:
+                record = json.loads(f.readline() or "null")
+        except (FileNotFoundError, ValueError):
+            return None
+        return record if record and record.get("kind") == "meta" else None
+    return None
+
+
+def _seal(directory: str, meeting_id: str, codec: str, later: bool = True) -> Optional[str]:
+    """Turn the active segment into the next numbered one and compress it."""
+    active = transcript_path(directory, meeting_id)
+    if not os.path.exists(active):
+        return None
+    existing = sealed_segments(directory, meeting_id)
+    base = _segment_base(directory, meeting_id, existing[-1][0] + 1 if existing else 0)
+    if os.path.exists(index_path(directory, meeting_id)):
+        os.replace(index_path(directory, meeting_id), base + INDEX_SUFFIX)
+    os.replace(active, base + TRANSCRIPT_SUFFIX)
+    if later:
+        transcript_archive.compress_later(base + TRANSCRIPT_SUFFIX, codec)
+        return base + TRANSCRIPT_SUFFIX
+    return transcript_archive.compress(base + TRANSCRIPT_SUFFIX, codec)
+
+
+class TranscriptLog:
+    """Appends records to a meeting's transcript, rolling segments over."""
+
+    def __init__(self, directory: str, meeting_id: str, epoch: Optional[float] = None,
+                 index_every: float = INDEX_EVERY, segment_bytes: int = SEGMENT_BYTES,
+                 codec: str = COMPRESSION):
+        self.directory     = directory
+        self.meeting_id    = meeting_id
+        self.path          = transcript_path(directory, meeting_id)
+        self.index_every   = index_every
+        self.segment_bytes = segment_bytes
+        self.codec         = codec
+
+        meta  = read_meta(directory, meeting_id)
+        parts = _parts(directory, meeting_id)
+        times, _ = _load_index(parts[-1][1], parts[-1][0]) if parts else ([], [])
+        self.epoch = meta["epoch"] if meta else (time.time() if epoch is None else epoch)
+        self._open()
+
+        # Rejoin: continue from wall-clock time, never behind what is already indexed
+        self._last = times[-1] if times else 0.0
+        self._base = max(time.time() - self.epoch, self._last)
+        self._mono = time.monotonic()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        new = not os.path.exists(self.path)
+        self._data  = TranscriptWriter(self.path)
+        self._index = TranscriptWriter(index_path(self.directory, self.meeting_id), follows=self._data)
+        if new:
+            self._data.write(_dumps({"t": 0.0, "kind": "meta", "meetingId": self.meeting_id, "epoch": self.epoch}))
+        self._next_index = float("-inf")                # index the first record of every segment
+
+    def _roll(self):
+        self._data.close()
+        self._index.close()
+        _seal(self.directory, self.meeting_id, self.codec)
+        self._open()
+
+    @property
+    def closed(self) -> bool:
+        return self._data.closed
+
+    def offset(self) -> float:
+        """Seconds since the meeting epoch, now."""
+        return self._base + time.monotonic() - self._mono
+
+    def append(self, kind: str, text: str, speaker: Optional[str] = None,
+               participant_id: Optional[str] = None, final: bool = True,
+               started_at: Optional[float] = None, t: Optional[float] = None):
+        """Write one record and return it. *started_at* is the wall-clock start of
+        the utterance; *t* overrides the record offset (conversion of old transcripts)."""
+        t = max(self.offset() if t is None else t, self._last)
+        self._last = t
+        record = {"t": round(t, 3), "kind": kind}
+        if speaker is not None:
+            record["speaker"] = speaker
+        if participant_id is not None:
+            record["participantId"] = participant_id
+        record["text"]  = text
+        record["final"] = final
+        if started_at is not None:
+            record["start"] = round(max(0.0, min(t, started_at - self.epoch)), 3)
+
+        position = self._data.write(_dumps(record))
+        if t >= self._next_index:
+            self._index.write(f"{t:.3f}\t{position}")
+            self._next_index = t + self.index_every
+        if position >= self.segment_bytes:
+            self._roll()
+        return record
+
+    def close(self) -> Optional[str]:
+        """Flush, close and seal the active segment; returns the sealed segment's path."""
+        if self._data.closed:
+            return None
+        self._data.close()
+        self._index.close()
+        return _seal(self.directory, self.meeting_id, self.codec)
+
+
+def _skip(f, count: int):
+    """Advance a forward-only (zstd) stream by *count* bytes."""
+    while count > 0:
+        chunk = f.read(min(count, 1024 * 1024))
+        if not chunk:
+            return
+        count -= len(chunk)
+
+
+def _read_part(path: str, times: list, offsets: list, start, end) -> Iterator[dict]:
+    position = 0
+    if start is not None:
+        at = bisect.bisect_left(times, start) - 1
+        if at >= 0:
+            position = offsets[at]
+    try:
+        f = _open_part(path)
+    except FileNotFoundError:
+        return                                          # sealed and compacted away meanwhile
+    with f:
+        if position and f.seekable():
+            f.seek(position)
+        elif position:
+            _skip(f, position)
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue                                # torn last line
+            t = record.get("t", 0.0)
+            if record.get("kind") == "meta" or (start is not None and t < start):
+                continue
+            if end is not None and t > end:
+                return
+            yield record
+
+
+def read(directory: str, meeting_id: str, start: Optional[float] = None,
+         end: Optional[float] = None) -> Iterator[dict]:
+    """Yield the meeting's records with ``start <= t <= end`` (offsets in seconds)."""
+    parts = [(path, *_load_index(idx, path)) for path, idx in _parts(directory, meeting_id)]
+    for i, (path, times, offsets) in enumerate(parts):
+        if end is not None and times and times[0] > end:
+            return
+        following = parts[i + 1][1] if i + 1 < len(parts) else None
+        if start is not None and following and following[0] < start:
+            continue                                    # whole segment before the window
+        yield from _read_part(path, times, offsets, start, end)
+
+
+# ──────────────────── RETENTION / COMPACTION ────────────────────
+def _compact(directory: str, meeting_id: str, codec: str, index_every: float = INDEX_EVERY) -> int:
+    """Merge a meeting's sealed segments into one; returns how many were merged."""
+    segments = sealed_segments(directory, meeting_id)
+    if len(segments) < 2:
+        return 0
+    last = _segment_base(directory, meeting_id, segments[-1][0])
+    codec = transcript_archive.resolve_codec(codec)
+    target = last + TRANSCRIPT_SUFFIX + transcript_archive.SUFFIXES[codec]
+    tmp_data, tmp_index = target + ".tmp", last + INDEX_SUFFIX + ".tmp"
+
+    position, next_index, wrote_meta = 0, float("-inf"), False
+    with transcript_archive.open_compressed_writer(tmp_data, codec) as out, \
+            open(tmp_index, "w", encoding="utf-8", newline="\n") as index:
+        for _, path in segments:
+            with _open_part(path) as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        continue                        # torn last line
+                    record = json.loads(line)
+                    if record.get("kind") == "meta":
+                        if wrote_meta:
+                            continue
+                        wrote_meta = True
+                    elif record["t"] >= next_index:
+                        index.write(f"{record['t']:.3f}\t{position}\n")
+                        next_index = record["t"] + index_every
+                    out.write(line)
+                    position += len(line)
+
+    # Replace the newest segment first, so readers see duplicates briefly, never gaps
+    for suffix in (TRANSCRIPT_SUFFIX, *(TRANSCRIPT_SUFFIX + s for s in transcript_archive.SUFFIXES.values() if s)):
+        if last + suffix != target and os.path.exists(last + suffix):
+            os.remove(last + suffix)
+    os.replace(tmp_data, target)
+    os.replace(tmp_index, last + INDEX_SUFFIX)
+    for segment, path in segments[:-1]:
+        os.remove(path)
+        idx = _segment_base(directory, meeting_id, segment) + INDEX_SUFFIX
+        if os.path.exists(idx):
+            os.remove(idx)
+    return len(segments)
+
+
+def maintain(directory: str, codec: str = COMPRESSION, compact_after: float = 6 * 3600,
+             retention_days: float = 0, now: Optional[float] = None) -> dict:
+    """One retention/compaction pass over *directory*.
+
+    * meetings untouched for ``retention_days`` are deleted (0 = keep forever)
+    * active segments untouched for ``compact_after`` seconds (bot died) are sealed
+    * sealed segments left uncompressed (process exit) are compressed
+    * meetings untouched for ``compact_after`` have their segments merged into one
+
+    Transcripts written before meetings had their own subdirectories are
+    moved into them first.
+    """
+    now = time.time() if now is None else now
+    stats = defaultdict(int)
+    relocated = _relocate_flat(directory)
+    if relocated:
+        stats["relocated"] = relocated
+
+    files = {meeting_id: _scan(directory, meeting_id) for meeting_id in list_meetings(directory)}
+
+    for meeting_id, entries in files.items():
+        if not entries:
+            continue
+        newest = max(entry.stat().st_mtime for _, _, entry in entries)
+        if retention_days and newest < now - retention_days * 86400:
+            for _, path, _ in entries:
+                os.remove(path)
+            _remove_dir(meeting_dir(directory, meeting_id))
+            stats["deleted"] += 1
+            continue
+        if newest >= now - compact_after:
+            continue                                    # possibly still live
+
+        sealed = _sealed(entries)
+        if any(match["segment"] is None and match["ext"] == "jsonl" for match, _, _ in entries):
+            _seal(directory, meeting_id, codec, later=False)
+            stats["sealed"] += 1
+            sealed = sealed_segments(directory, meeting_id)
+        for _, path in sealed:
+            if path.endswith(TRANSCRIPT_SUFFIX) and transcript_archive.resolve_codec(codec) != "none":
+                transcript_archive.compress(path, codec)
+                stats["compressed"] += 1
+        merged = _compact(directory, meeting_id, codec) if len(sealed) > 1 else 0
+        if merged:
+            stats["compacted"] += 1
+            stats["segments_merged"] += merged
+    return dict(stats)
+
+
+def _remove_dir(path: str):
+    try:
+        os.rmdir(path)
+    except OSError:
+        pass                                            # not empty: a bot rejoined meanwhile
+
+
+def _relocate_flat(directory: str) -> int:
+    """Move transcript files still lying directly in *directory* into their meeting's subdirectory."""
+    moved = set()
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            match = _FILE_NAME.match(entry.name) if entry.is_file() else None
+            if match:
+                target = meeting_dir(directory, match["meeting"])
+                os.makedirs(target, exist_ok=True)
+                os.replace(entry.path, os.path.join(target, entry.name))
+                moved.add(match["meeting"])
+    return len(moved)
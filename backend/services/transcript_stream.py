@@ -0,0 +1,162 @@
+"""
+Transcript stream – live captions over Server-Sent Events.
+
+The bot side keeps a bounded :class:`CaptionBuffer` per meeting, filled by
+the transcription event handler. Event ids are consecutive and start at
+the buffer's creation time in milliseconds, so a ``Last-Event-ID`` stays
+meaningful across bot restarts and worker processes.
+
+The API side has one :class:`Hub`. For every meeting with at least one
+subscriber, a single pump thread polls the bot for new events (in-process
+or through the worker supervisor, see transcription_client) and fans them
+out to per-subscriber queues. Subscribers therefore cost a bounded queue
+each, not a bot round-trip or a thread. A queue holds more than the whole
+buffer, so joining late never overflows it. A subscriber whose queue fills
+up is dropped once it has been sent what was already queued; its client
+reconnects with ``Last-Event-ID`` and is replayed from the buffer.
+"""
+
+import json
+import queue
+import threading
+import time
+from collections import deque
+from itertools import islice
+
+from flask import current_app
+
+from services import transcription_client
+
+BUFFER_SIZE      = 500          # caption events kept per meeting for replay
+SUBSCRIBER_QUEUE = 2 * BUFFER_SIZE  # events a subscriber may fall behind before it is dropped
+POLL_INTERVAL    = 0.25         # seconds between bot polls per watched meeting
+HEARTBEAT        = 15           # seconds of silence before a keep-alive comment
+
+
+# ──────────────────── BOT SIDE ────────────────────
+class CaptionBuffer:
+    """Ring of the most recent caption events of one meeting (thread-safe)."""
+
+    def __init__(self, size: int = BUFFER_SIZE):
+        self._events: deque = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._next_id = int(time.time() * 1000)
+
+    def push(self, kind: str, **data) -> int:
+        with self._lock:
+            event_id = self._next_id
+            self._next_id += 1
+            self._events.append((event_id, {"type": kind, **data}))
+        return event_id
+
+    def since(self, after: int) -> list:
+        """Buffered ``(id, event)`` pairs with an id greater than *after*."""
+        with self._lock:
+            if not self._events or self._events[-1][0] <= after:
+                return []
+            skip = max(0, after + 1 - self._events[0][0])   # ids are consecutive
+            return list(islice(self._events, skip, None))
+
+
+# ──────────────────── API SIDE ────────────────────
+class Subscriber:
+    def __init__(self, meeting_id: str, last_id: int):
+        self.meeting_id = meeting_id
+        self.last_id = last_id
+        self.queue: queue.Queue = queue.Queue(SUBSCRIBER_QUEUE)
+        self.dropped = False
+
+
+class _Feed:
+    """Polls one meeting's caption buffer on behalf of all its subscribers."""
+
+    def __init__(self, hub: "Hub", meeting_id: str, app):
+        self.hub = hub
+        self.meeting_id = meeting_id
+        self.app = app
+        self.subscribers: set = set()
+        self.wake = threading.Event()
+        threading.Thread(target=self._pump, name=f"caption-feed-{meeting_id}", daemon=True).start()
+
+    def _pump(self):
+        with self.app.app_context():
+            while True:
+                with self.hub.lock:
+                    subscribers = [s for s in self.subscribers if not s.dropped]
+                    if not subscribers:
+                        del self.hub.feeds[self.meeting_id]
+                        return
+                try:
+                    events = transcription_client.captions(self.meeting_id, min(s.last_id for s in subscribers))
+                except Exception as e:
+                    print(f"[Transcript Stream] polling {self.meeting_id} failed: {e!r}")
+                    events = []
+                for subscriber in subscribers:
+                    self._deliver(subscriber, events)
+                self.wake.wait(POLL_INTERVAL)
+                self.wake.clear()
+
+    @staticmethod
+    def _deliver(subscriber: Subscriber, events: list):
+        for event_id, event in events:
+            if event_id <= subscriber.last_id:
+                continue
+            try:
+                subscriber.queue.put_nowait((event_id, event))
+            except queue.Full:
+                subscriber.dropped = True          # too slow – let it reconnect and replay
+                return
+            subscriber.last_id = event_id
+
+
+class Hub:
+    """Meeting → feed registry; feeds exist only while someone is listening."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.feeds: dict[str, _Feed] = {}
+
+    def subscribe(self, meeting_id: str, last_id: int = 0) -> Subscriber:
+        """Listen to *meeting_id*; events after *last_id* are replayed (must run in an app context)."""
+        subscriber = Subscriber(meeting_id, last_id)
+        with self.lock:
+            feed = self.feeds.get(meeting_id)
+            if feed is None:
+                feed = self.feeds[meeting_id] = _Feed(self, meeting_id, current_app._get_current_object())
+            feed.subscribers.add(subscriber)
+        feed.wake.set()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        with self.lock:
+            feed = self.feeds.get(subscriber.meeting_id)
+            if feed:
+                feed.subscribers.discard(subscriber)
+
+    def subscriber_count(self) -> int:
+        with self.lock:
+            return sum(len(feed.subscribers) for feed in self.feeds.values())
+
+
+hub = Hub()
+
+
+def sse(subscriber: Subscriber):
+    """Yield the subscriber's events as an SSE body until it disconnects or is dropped."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                if subscriber.dropped:              # send what is queued, so the reconnect resumes after it
+                    event_id, event = subscriber.queue.get_nowait()
+                else:
+                    event_id, event = subscriber.queue.get(timeout=HEARTBEAT)
+            except queue.Empty:
+                if subscriber.dropped:
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        yield "event: dropped\ndata: {}\n\n"
+    finally:
+        hub.unsubscribe(subscriber)
@@ -0,0 +1,296 @@
+"""
+Transcript summary – local extractive summaries of consultations.
+
+Sentences are ranked with TextRank (word-overlap similarity, PageRank by
+power iteration in NumPy) weighted by their TF-IDF density. The similarity
+graph is kept as edge lists, so memory grows with the number of shared-term
+pairs rather than with the square of the sentence count, and each iteration
+is a sparse matrix-vector product. The top-ranked
+sentences are sorted into Diagnosis / Medicines / Key Points / Follow-ups
+by cue words. Nothing leaves the process.
+
+Work is incremental per meeting. While a bot is transcribing a meeting
+(:func:`follow`, called when the API starts it), one background thread reads
+the new part of its transcript every ``FOLLOW_EVERY`` seconds, so sentences
+are tokenized and linked into the similarity graph as the call goes on. This
+tails the transcript file rather than hooking the bot, so it works the same
+when bots run in worker processes. Only sentences not seen before are added,
+each read resumes where the previous one stopped, and PageRank is
+warm-started from the previous scores, so summarizing at the end of a long
+call costs roughly the last few seconds of it. Summaries are memoized by a running hash of the
+meeting's content, so several participants asking for the same summary
+share one computation. Incremental states are evicted least recently used
+once together they exceed ``STATES_BYTES``.
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+from array import array
+from collections import Counter, OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from services.doctor_search import tokenize
+from services.transcript_store import read
+
+DAMPING       = 0.85
+MAX_ITER      = 100
+TOLERANCE     = 1e-6
+MIN_TERMS     = 3           # sentences with fewer content words ("Okay.", "Yes, doctor.") are never picked
+PER_SECTION   = 2
+KEY_POINTS    = 3
+STATES_BYTES  = 64 << 20    # approximate memory all incremental meeting states may use
+SENTENCE_BYTES = 600        # per-sentence bookkeeping besides its text and edges (terms, postings, …)
+SUMMARIES_KEPT = 1024
+FOLLOW_EVERY  = 5.0         # seconds between reads of a live meeting's transcript
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+
+STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be been before being but by can could did do
+    does doing don down for from had has have having he her here hers him his how i if in into is
+    it its just me more most my no nor not now of off on once only or other our out over own same
+    she should so some such than that the their them then there these they this those through to
+    too under until up very was we were what when where which while who whom why will with would
+    you your yours okay ok yeah yes hmm um uh right well like so oh hello hi thank thanks please
+""".split())
+
+# Cue words (prefixes) that route a sentence into a section
+SECTIONS = {
+    "Diagnosis":  ("diagnos", "infection", "condition", "likely", "suggest", "viral", "bacterial",
+                   "allerg", "deficien", "inflam", "pressure", "sugar"),
+    "Medicines":  ("mg", "tablet", "capsule", "dose", "dosage", "prescri", "medicine", "medication",
+                   "syrup", "antibiotic", "ointment", "inhaler", "drops", "twice", "thrice"),
+    "Follow-ups": ("follow", "review", "revisit", "schedule", "test", "scan", "ray", "report",
+                   "appointment", "week", "month", "come"),
+}
+EMPTY_SECTION = "Not discussed."
+
+
+class MeetingSummarizer:
+    """Incremental sentence graph of one meeting."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sentences: list[str] = []
+        self.terms: list[Counter] = []
+        self.cursor = 0.0                       # offset of the last transcript record read
+        self._seen: set = set()
+        self._postings: dict[str, list[int]] = {}       # term → sentences containing it
+        self._term_ids: dict[str, int] = {}
+        self._flat_ids: list[int] = []                  # term ids of all sentences, concatenated
+        self._flat_counts: list[int] = []
+        self._starts: list[int] = []                    # where each sentence begins in the flat lists
+        self._src = array("i")                          # similarity edges, both directions
+        self._dst = array("i")
+        self._weight = array("d")
+        self._out: list[float] = []                     # total edge weight leaving each sentence
+        self._text_bytes = 0
+        self._scores = np.zeros(0)
+        self._digest = hashlib.sha256()
+
+    @property
+    def digest(self) -> str:
+        return self._digest.hexdigest()
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory held by this state."""
+        edges = len(self._src) * (self._src.itemsize + self._dst.itemsize + self._weight.itemsize)
+        return edges + self._text_bytes + SENTENCE_BYTES * len(self.sentences)
+
+    def add(self, text: str) -> int:
+        """Add the sentences of *text* not already known; returns how many were new."""
+        added = 0
+        for sentence in _SENTENCE_RE.split(text):
+            sentence = sentence.strip()
+            key = " ".join(tokenize(sentence))
+            if not key or key in self._seen:
+                continue
+            self._seen.add(key)
+            self._digest.update(key.encode() + b"\n")
+            self._link(sentence, Counter(t for t in key.split() if t not in STOPWORDS and len(t) > 1))
+            added += 1
+        return added
+
+    def _link(self, sentence: str, terms: Counter):
+        """Append a sentence and its overlap edges to every earlier sentence sharing a term."""
+        i = len(self.sentences)
+        self.sentences.append(sentence)
+        self.terms.append(terms)
+        self._out.append(0.0)
+        self._text_bytes += len(sentence)
+
+        overlap = Counter(j for term in terms for j in self._postings.get(term, ()))
+        size = len(terms)
+        for j, shared in overlap.items():
+            other = len(self.terms[j])
+            if size > 1 and other > 1:
+                weight = shared / (math.log(size) + math.log(other))
+                self._src.extend((i, j))
+                self._dst.extend((j, i))
+                self._weight.extend((weight, weight))
+                self._out[i] += weight
+                self._out[j] += weight
+        self._starts.append(len(self._flat_ids))
+        for term, count in terms.items():
+            self._postings.setdefault(term, []).append(i)
+            self._flat_ids.append(self._term_ids.setdefault(term, len(self._term_ids)))
+            self._flat_counts.append(count)
+
+    def rank(self) -> np.ndarray:
+        """TextRank scores × TF-IDF density, one per sentence."""
+        n = len(self.sentences)
+        if n == 0:
+            return np.zeros(0)
+        src = np.frombuffer(self._src, dtype=np.int32)
+        dst = np.frombuffer(self._dst, dtype=np.int32)
+        out = np.asarray(self._out)
+        share = np.frombuffer(self._weight) / out[src]     # row-normalised edge weights
+        dangling = out == 0                                  # isolated sentences jump uniformly
+
+        scores = np.full(n, 1.0 / n)
+        scores[:len(self._scores)] = self._scores[:n]        # warm start: only the new tail moves much
+        scores /= scores.sum()
+        for _ in range(MAX_ITER):
+            spread = np.bincount(dst, weights=share * scores[src], minlength=n) + scores[dangling].sum() / n
+            updated = (1 - DAMPING) / n + DAMPING * spread
+            done = np.abs(updated - scores).sum() < TOLERANCE
+            scores = updated
+            if done:
+                break
+        self._scores = scores
+
+        ids, counts = np.asarray(self._flat_ids), np.asarray(self._flat_counts, dtype=float)
+        density = np.zeros(n)
+        if len(ids):
+            df = np.bincount(ids, minlength=len(self._term_ids))
+            idf = np.log(n / df) + 1.0
+            starts = np.asarray(self._starts)
+            present = np.diff(starts, append=len(ids)) > 0     # sentences with at least one term
+            weighted = np.add.reduceat(counts * idf[ids], starts[present])
+            lengths = np.add.reduceat(counts, starts[present])
+            density[present] = weighted / lengths
+        return scores / scores.max() * (0.5 + 0.5 * density / (density.max() or 1.0))
+
+    def summary(self) -> Optional[str]:
+        """Markdown summary, or None while nothing substantial has been said."""
+        scores = self.rank()
+        eligible = [i for i in np.argsort(-scores, kind="stable") if sum(self.terms[i].values()) >= MIN_TERMS]
+        if not eligible:
+            return None
+
+        used, lines = set(), []
+        for section, cues in SECTIONS.items():
+            picked = [i for i in eligible if i not in used and _mentions(self.terms[i], cues)][:PER_SECTION]
+            used.update(picked)
+            lines.append((section, picked))
+        key_points = [i for i in eligible if i not in used][:KEY_POINTS]
+        lines.insert(2, ("Key Points", key_points))
+
+        return "\n\n".join(
+            f"**{section}:** " + (" ".join(_terminated(self.sentences[i]) for i in sorted(picked)) or EMPTY_SECTION)
+            for section, picked in lines
+        )
+
+
+def _terminated(sentence: str) -> str:
+    """Utterances often lack final punctuation; close them so picks read as sentences."""
+    return sentence if sentence[-1] in ".!?" else sentence + "."
+
+
+def _mentions(terms: Counter, cues: tuple) -> bool:
+    return any(term.startswith(cue) for term in terms for cue in cues)
+
+
+_lock   = threading.Lock()
+_states: OrderedDict = OrderedDict()        # meeting_id → MeetingSummarizer
+_memo:   OrderedDict = OrderedDict()        # content digest → summary
+_following: dict = {}                       # meeting_id → transcripts directory, while a bot runs
+_follower = None
+
+
+def _state(meeting_id: str) -> MeetingSummarizer:
+    with _lock:
+        state = _states.get(meeting_id)
+        if state is None:
+            state = _states[meeting_id] = MeetingSummarizer()
+        _states.move_to_end(meeting_id)
+        return state
+
+
+def _trim():
+    """Evict least recently used states until all of them fit in ``STATES_BYTES``."""
+    with _lock:
+        total = sum(state.nbytes for state in _states.values())
+        while total > STATES_BYTES and len(_states) > 1:     # the most recent one always stays
+            _, state = _states.popitem(last=False)
+            total -= state.nbytes
+
+
+def _ingest(state: MeetingSummarizer, directory: str, meeting_id: str):
+    """Add the transcript records written since the last read (caller holds state.lock)."""
+    for record in read(directory, meeting_id, start=state.cursor):
+        state.cursor = record["t"]
+        if record.get("kind") == "text" and record.get("final", True):
+            state.add(record["text"])
+
+
+def _follow_loop():
+    while True:
+        time.sleep(FOLLOW_EVERY)
+        with _lock:
+            following = list(_following.items())
+        for meeting_id, directory in following:
+            state = _state(meeting_id)
+            try:
+                with state.lock:
+                    _ingest(state, directory, meeting_id)
+            except Exception as e:
+                print(f"[Transcript Summary] reading {meeting_id} failed: {e!r}")
+        if following:
+            _trim()
+
+
+def follow(meeting_id: str, directory: str):
+    """Feed *meeting_id*'s summary state from its transcript until :func:`unfollow`."""
+    global _follower
+    with _lock:
+        _following[meeting_id] = directory
+        if _follower is None:
+            _follower = threading.Thread(target=_follow_loop, name="summary-follower", daemon=True)
+            _follower.start()
+
+
+def unfollow(meeting_id: str):
+    with _lock:
+        _following.pop(meeting_id, None)
+
+
+def summarize(meeting_id: str, transcript: str = "", directory: Optional[str] = None) -> Optional[str]:
+    """Summary of everything known about *meeting_id*: the bot's transcript in
+    *directory* (if any) plus *transcript* as posted by a participant.
+    None if there is nothing to summarize yet."""
+    state = _state(meeting_id)
+    with state.lock:                                # concurrent callers wait and reuse the result
+        if directory:
+            _ingest(state, directory, meeting_id)
+        if transcript:
+            state.add(transcript)
+        _trim()
+
+        digest = state.digest
+        with _lock:
+            if digest in _memo:
+                _memo.move_to_end(digest)
+                return _memo[digest]
+        summary = state.summary()
+        with _lock:
+            _memo[digest] = summary
+            while len(_memo) > SUMMARIES_KEPT:
+                _memo.popitem(last=False)
+        return summary
@@ -0,0 +1,124 @@
+"""
+Buffered transcript writer – one open file per meeting, lines batched.
+
+The bot receives several transcription events a second per speaker; opening
+and closing the transcript file for each of them is pure syscall overhead.
+A :class:`TranscriptWriter` keeps the file open and buffers lines in memory,
+flushing when the buffer reaches ``max_lines``/``max_bytes``, when
+``flush_interval`` seconds have passed (checked by one shared background
+thread for all writers), on :meth:`close`, and at interpreter exit.
+
+A writer can be made to *follow* another one (a sidecar index follows its
+data file): it flushes the followed writer before itself, so its lines never
+reach the disk ahead of the lines they refer to.
+"""
+
+import atexit
+import threading
+import time
+import weakref
+
+FLUSH_INTERVAL = 1.0            # seconds a line may sit in the buffer
+MAX_LINES      = 256
+MAX_BYTES      = 64 * 1024
+
+_writers: "weakref.WeakSet[TranscriptWriter]" = weakref.WeakSet()
+_flusher_lock = threading.Lock()
+_flusher      = None
+
+
+class TranscriptWriter:
+    """Append-only, buffered, thread-safe writer for one transcript file."""
+
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL,
+                 max_lines: int = MAX_LINES, max_bytes: int = MAX_BYTES,
+                 follows: "TranscriptWriter | None" = None):
+        self.path           = path
+        self.flush_interval = flush_interval
+        self.max_lines      = max_lines
+        self.max_bytes      = max_bytes
+        self.follows        = follows
+
+        self._file       = open(path, "a", encoding="utf-8", newline="\n")
+        self._position   = self._file.tell()    # byte offset where the next line starts
+        self._buffer     = []
+        self._bytes      = 0
+        self._lock       = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        _writers.add(self)
+        _ensure_flusher()
+
+    @property
+    def closed(self) -> bool:
+        return self._file is None
+
+    def write(self, line: str) -> int:
+        """Queue *line* (newline added) and flush if a size threshold is hit.
+
+        Returns the byte offset in the file at which the line will start.
+        """
+        with self._lock:
+            if self._file is None:
+                raise ValueError(f"Transcript writer for {self.path} is closed")
+            position = self._position
+            size = len(line.encode("utf-8")) + 1
+            self._buffer.append(line + "\n")
+            self._bytes    += size
+            self._position += size
+            if len(self._buffer) >= self.max_lines or self._bytes >= self.max_bytes:
+                self._flush_locked()
+            return position
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def flush_if_due(self, now: float):
+        """Flush if the oldest buffered line has waited ``flush_interval``."""
+        with self._lock:
+            if self._buffer and now - self._last_flush >= self.flush_interval:
+                self._flush_locked()
+
+    def close(self):
+        """Flush everything and close the file. Safe to call twice."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush_locked()
+            self._file.close()
+            self._file = None
+        _writers.discard(self)
+
+    def _flush_locked(self):
+        if self._buffer and self._file is not None:
+            if self.follows is not None:
+                self.follows.flush()
+            self._file.write("".join(self._buffer))
+            self._file.flush()
+            self._buffer.clear()
+            self._bytes = 0
+        self._last_flush = time.monotonic()
+
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL / 2)
+        now = time.monotonic()
+        for writer in list(_writers):
+            writer.flush_if_due(now)
+
+
+def _ensure_flusher():
+    global _flusher
+    with _flusher_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, name="transcript-flusher", daemon=True)
+            _flusher.start()
+
+
+@atexit.register
+def close_all():
+    """Flush and close every open writer (graceful shutdown)."""
+    for writer in list(_writers):
+        writer.close()
@@ -0,0 +1,80 @@
+"""
+Transcription client – how the API starts and stops transcription bots.
+
+Without ``TRANSCRIPTION_WORKER_ADDRESS`` the bots run inside the API process
+(transcription_bot). With it, requests go over a local
+``multiprocessing.connection`` socket to the worker supervisor
+(``python transcription_workers.py``), which shards meetings across
+processes. The socket is authenticated with ``TRANSCRIPTION_WORKER_KEY``, or
+``SECRET_KEY`` if that is unset.
+"""
+
+from multiprocessing.connection import Client
+
+from flask import current_app
+
+
+def parse_address(address: str):
+    """``"host:port"`` → TCP address tuple; anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit():
+        return host or "127.0.0.1", int(port)
+    return address
+
+
+def authkey(worker_key: str, secret_key: str) -> bytes:
+    return (worker_key or secret_key).encode()
+
+
+def request(address: str, key: bytes, op: str, meeting_id: str = None, token: str = None, after: int = None):
+    """Send one command to the supervisor and return its result."""
+    with Client(parse_address(address), authkey=key) as conn:
+        conn.send((op, meeting_id, token, after))
+        ok, result = conn.recv()
+    if not ok:
+        raise RuntimeError(f"Transcription worker error: {result}")
+    return result
+
+
+def _call(op: str, meeting_id: str = None, token: str = None, after: int = None):
+    config  = current_app.config
+    address = config["TRANSCRIPTION_WORKER_ADDRESS"]
+    if not address:
+        import transcription_bot        # in-process bots (imports the VideoSDK client)
+        if op == "start":
+            return transcription_bot.start(meeting_id, token)
+        if op == "stop":
+            return transcription_bot.stop(meeting_id)
+        if op == "captions":
+            return transcription_bot.captions(meeting_id, after)
+        return transcription_bot.metrics()
+    return request(address, authkey(config["TRANSCRIPTION_WORKER_KEY"], config["SECRET_KEY"]),
+                   op, meeting_id, token, after)
+
+
+def start(meeting_id: str, token: str) -> bool:
+    """Start a bot for *meeting_id*; False if one is already running.
+
+    Either way this process follows the transcript for the meeting's summary.
+    """
+    from services import transcript_summary     # not needed by the worker supervisor
+    started = _call("start", meeting_id, token)
+    transcript_summary.follow(meeting_id, current_app.config["TRANSCRIPTS_DIR"])
+    return started
+
+
+def stop(meeting_id: str):
+    """Stop the bot for *meeting_id*; returns the transcript path (or None)."""
+    from services import transcript_summary
+    transcript_summary.unfollow(meeting_id)
+    return _call("stop", meeting_id)
+
+
+def metrics() -> dict:
+    """Startup latency per recent meeting (see transcription_bot.metrics)."""
+    return _call("metrics")
+
+
+def captions(meeting_id: str, after: int = 0) -> list:
+    """Live caption events of *meeting_id* newer than event id *after*."""
+    return _call("captions", meeting_id, after=after)
@@ -1,12 +1,132 @@
 """
-VideoSDK service – token generation and room creation.
+VideoSDK service – token generation, room creation and deactivation.
 Keeps third-party API logic out of routes.
+
+Calls go through one pooled keep-alive ``requests.Session`` per process, so
+room creation reuses TLS connections instead of handshaking every time.
+Every call has a connect and a read timeout. Failures the API cannot have
+acted on (connect timeouts and refused connections, 429, 503) are retried
+with jittered exponential backoff. Read timeouts, connections dropped after
+the request went out, and other 5xx are retried only for idempotent calls.
+Latency and errors per operation are exposed by :func:`metrics`.
 """
 
 import datetime
+import random
+import threading
+import time
+from collections import deque
+
 import jwt
 import requests
 from flask import current_app
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+RETRY_STATUSES      = {429, 503}            # request was not processed – safe to repeat
+IDEMPOTENT_STATUSES = {500, 502, 504}       # outcome unknown – repeated only if idempotent
+MAX_BACKOFF         = 10.0                  # seconds, also caps Retry-After
+LATENCY_SAMPLES     = 500                   # recent calls per operation kept for percentiles
+
+_session = None
+_session_lock = threading.Lock()
+
+_stats: dict = {}                           # operation → counters and recent latencies
+_stats_lock = threading.Lock()
+
+
+def _http() -> requests.Session:
+    """The process-wide pooled session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            size = current_app.config["VIDEOSDK_POOL_SIZE"]
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=size, max_retries=0)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def _observe(op: str, seconds: float, failed: bool, retries: int):
+    with _stats_lock:
+        stats = _stats.get(op)
+        if stats is None:
+            stats = _stats[op] = {"calls": 0, "errors": 0, "retries": 0,
+                                  "latencies": deque(maxlen=LATENCY_SAMPLES)}
+        stats["calls"]   += 1
+        stats["errors"]  += failed
+        stats["retries"] += retries
+        stats["latencies"].append(seconds)
+
+
+def metrics() -> dict:
+    """Per operation: calls, errors, retries and recent latency percentiles (ms)."""
+    with _stats_lock:
+        snapshot = {op: (dict(s), sorted(s["latencies"])) for op, s in _stats.items()}
+    result = {}
+    for op, (stats, latencies) in snapshot.items():
+        pick = lambda q: round(latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000, 1)
+        result[op] = {
+            "calls":   stats["calls"],
+            "errors":  stats["errors"],
+            "retries": stats["retries"],
+            "p50Ms":   pick(0.50),
+            "p95Ms":   pick(0.95),
+            "maxMs":   round(latencies[-1] * 1000, 1),
+        }
+    return result
+
+
+def _retry_after(response: requests.Response):
+    try:
+        return min(float(response.headers["Retry-After"]), MAX_BACKOFF)
+    except (KeyError, ValueError):
+        return None
+
+
+def _not_sent(error: requests.ConnectionError) -> bool:
+    """True if *error* happened before the request reached the server."""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    if isinstance(reason, MaxRetryError):
+        reason = reason.reason
+    return isinstance(reason, NewConnectionError)       # refused, unreachable, DNS failure
+
+
+def _request(op: str, method: str, url: str, *, idempotent: bool, **kwargs) -> requests.Response:
+    """Send one API call with timeouts and bounded, jittered retries."""
+    config  = current_app.config
+    timeout = (config["VIDEOSDK_CONNECT_TIMEOUT"], config["VIDEOSDK_READ_TIMEOUT"])
+    retries = config["VIDEOSDK_RETRIES"]
+    backoff = config["VIDEOSDK_BACKOFF"]
+
+    started = time.perf_counter()
+    for attempt in range(retries + 1):
+        delay = None
+        try:
+            response = _http().request(method, url, timeout=timeout, **kwargs)
+        except requests.ReadTimeout:
+            if not idempotent or attempt == retries:
+                _observe(op, time.perf_counter() - started, True, attempt)
+                raise
+        except requests.ConnectionError as e:
+            # A dropped keep-alive socket may have carried the request already
+            if not (idempotent or _not_sent(e)) or attempt == retries:
+                _observe(op, time.perf_counter() - started, True, attempt)
+                raise
+        else:
+            status = response.status_code
+            retryable = status in RETRY_STATUSES or (idempotent and status in IDEMPOTENT_STATUSES)
+            if not retryable or attempt == retries:
+                _observe(op, time.perf_counter() - started, not response.ok, attempt)
+                return response
+            delay = _retry_after(response)
+            response.close()
+        time.sleep(delay if delay is not None else
+                   min(backoff * 2 ** attempt, MAX_BACKOFF) * random.uniform(0.5, 1.5))
 
 
 def generate_token() -> str:
@@ -38,6 +158,20 @@ def create_room() -> str:
         "Content-Type":  "application/json",
     }
 
-    response = requests.post(endpoint, headers=headers, json={})
+    # Not idempotent: a timed-out create may still have made a room
+    response = _request("create_room", "POST", endpoint, idempotent=False, headers=headers, json={})
     response.raise_for_status()
     return response.json()["roomId"]
+
+
+def deactivate_room(room_id: str):
+    """Deactivate a room (used to recycle pooled rooms that went unused)."""
+    endpoint = current_app.config["VIDEOSDK_API_ENDPOINT"].rstrip("/") + "/deactivate"
+    headers  = {
+        "authorization": generate_token(),
+        "Content-Type":  "application/json",
+    }
+
+    response = _request("deactivate_room", "POST", endpoint, idempotent=True,
+                        headers=headers, json={"roomId": room_id})
+    response.raise_for_status()
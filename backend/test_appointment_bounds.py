@@ -0,0 +1,42 @@
+"""
+Appointment list ?from=/?to= parsing checks – no server or database needed.
+
+Run:  python test_appointment_bounds.py   (or through pytest)
+"""
+
+import os
+import time
+from datetime import datetime
+
+os.environ["TZ"] = "Asia/Kolkata"           # +05:30, no DST
+time.tzset()
+
+from routes.appointment import _parse_bound
+
+
+def test_naive_bounds_are_local_wall_clock():
+    assert _parse_bound("2030-01-07T10:00") == datetime(2030, 1, 7, 10, 0)
+    assert _parse_bound("2030-01-07") == datetime(2030, 1, 7)
+    assert _parse_bound("2030-01-07", end=True) == datetime(2030, 1, 8)
+
+
+def test_offset_bounds_are_converted_to_local_time():
+    assert _parse_bound("2030-01-07T10:00:00+05:30") == datetime(2030, 1, 7, 10, 0)
+    assert _parse_bound("2030-01-07T04:30:00Z") == datetime(2030, 1, 7, 10, 0)
+    assert _parse_bound("2030-01-07T06:30:00+02:00", end=True) == datetime(2030, 1, 7, 10, 0)
+
+
+def test_garbage_is_rejected():
+    try:
+        _parse_bound("next tuesday")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"{name}: ok")
+    print("OK")
@@ -0,0 +1,78 @@
+"""
+Concurrency check for double-booking prevention.
+
+Fires many simultaneous bookings for the same doctor + slot at a running
+backend and verifies that exactly one succeeds and the rest get 409.
+
+Run:  python app.py            (in one terminal)
+      python test_booking_race.py [parallel_requests]
+"""
+
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+base_url = "http://localhost:5000/api"
+PARALLEL = 300
+SLOT     = {"date": "2030-01-07", "time": "10:00"}
+
+
+def login():
+    requests.post(f"{base_url}/auth/signup", json={
+        "fullName": "Race Tester",
+        "email":    "race-tester@example.com",
+        "password": "password123",
+        "role":     "user",
+    })
+    res = requests.post(f"{base_url}/auth/login", json={
+        "email":    "race-tester@example.com",
+        "password": "password123",
+        "role":     "user",
+    })
+    res.raise_for_status()
+    return {"Authorization": f"Bearer {res.json()['accessToken']}"}
+
+
+def main():
+    headers = login()
+
+    patient = requests.post(f"{base_url}/patients", json={
+        "fullName": "Race Patient", "relation": "Self", "age": "30", "gender": "Male",
+    }, headers=headers).json()
+    doctor = requests.get(f"{base_url}/doctors").json()[0]
+
+    booking = {
+        "patientId":         patient["id"],
+        "doctorId":          doctor["id"],
+        "consultationType":  "General",
+        "razorpayPaymentId": "simulated_payment",
+        "razorpayOrderId":   "simulated_order",
+        "razorpaySignature": "simulated_signature",
+        **SLOT,
+    }
+
+    def book(_):
+        return requests.post(f"{base_url}/appointments", json=booking, headers=headers).status_code
+
+    print(f"Firing {PARALLEL} parallel bookings at {doctor['name']} {SLOT['date']} {SLOT['time']} …")
+    with ThreadPoolExecutor(max_workers=PARALLEL) as pool:
+        codes = Counter(pool.map(book, range(PARALLEL)))
+    print("Status codes:", dict(codes))
+
+    assert codes[201] == 1, f"expected exactly one booking, got {codes[201]}"
+    assert codes[409] == PARALLEL - 1, "every other booking should be rejected with 409"
+    print("OK – exactly one booking won the slot")
+
+    # Clean up so the script can be re-run
+    mine = requests.get(f"{base_url}/appointments", headers=headers).json()
+    for appt in mine:
+        if appt["date"] == SLOT["date"] and appt["time"] == SLOT["time"]:
+            requests.delete(f"{base_url}/appointments/{appt['id']}", headers=headers)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        PARALLEL = int(sys.argv[1])
+    main()
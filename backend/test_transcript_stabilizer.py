@@ -0,0 +1,50 @@
+"""
+Transcript stabilizer regression checks – no server or recogniser needed.
+
+Run:  python test_transcript_stabilizer.py   (or through pytest)
+"""
+
+from services.transcript_stabilizer import RESEND_WINDOW, UtteranceStabilizer
+
+
+def texts(utterances):
+    return [u.text for u in utterances]
+
+
+def test_repeated_short_finals_are_kept():
+    s = UtteranceStabilizer()
+    out  = s.feed("p1", "Patient", "Yes.", final=True, now=0.0)
+    out += s.feed("p1", "Patient", "Yes.", final=True, now=0.5)
+    out += s.feed("p1", "Patient", "Yes", final=True, now=RESEND_WINDOW + 5)
+    assert texts(out) == ["Yes.", "Yes.", "Yes"], texts(out)
+
+
+def test_interim_resend_within_window_is_dropped():
+    s = UtteranceStabilizer()
+    out  = s.feed("p1", "Doctor", "How long have you had the fever?", final=True, now=0.0)
+    out += s.feed("p1", "Doctor", "How long have you", now=0.5)
+    assert texts(out) == ["How long have you had the fever?"], texts(out)
+    assert texts(s.flush()) == []
+
+
+def test_interim_after_window_is_a_new_utterance():
+    s = UtteranceStabilizer()
+    out  = s.feed("p1", "Doctor", "Take it twice a day.", final=True, now=0.0)
+    out += s.feed("p1", "Doctor", "Take it", now=RESEND_WINDOW + 1)
+    out += s.flush()
+    assert texts(out) == ["Take it twice a day.", "Take it"], texts(out)
+
+
+def test_echo_is_stripped():
+    s = UtteranceStabilizer()
+    out  = s.feed("p1", "Doctor", "purpose and agenda?", final=True, now=0.0)
+    out += s.feed("p1", "Doctor", "purpose and agenda? So today, we are", final=True, now=0.3)
+    assert texts(out) == ["purpose and agenda?", "So today, we are"], texts(out)
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"{name}: ok")
+    print("OK")
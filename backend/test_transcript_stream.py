@@ -0,0 +1,69 @@
+"""
+Live caption stream checks – in-process bots, no server or meeting needed.
+
+Run:  python test_transcript_stream.py   (or through pytest)
+"""
+
+import queue
+
+from flask import Flask
+
+import transcription_bot
+from services import transcript_stream
+from services.transcript_stream import BUFFER_SIZE, CaptionBuffer, Subscriber, sse
+
+
+def make_app():
+    app = Flask(__name__)
+    app.config["TRANSCRIPTION_WORKER_ADDRESS"] = ""
+    return app
+
+
+def events(body, count):
+    """The first *count* events of an SSE body, as (id, type) pairs."""
+    found = []
+    for chunk in body:
+        if chunk.startswith("id: "):
+            lines = chunk.split("\n")
+            found.append((int(lines[0][4:]), lines[1][7:]))
+            if len(found) == count:
+                break
+        elif chunk.startswith("event: dropped"):
+            break
+    return found
+
+
+def test_late_join_with_full_buffer_gets_the_whole_replay():
+    buffer = CaptionBuffer()
+    for i in range(BUFFER_SIZE + 100):
+        buffer.push("caption", text=f"line {i}")
+    transcription_bot._captions["late-join"] = buffer
+    ids = [event_id for event_id, _ in buffer.since(0)]
+
+    with make_app().app_context():
+        subscriber = transcript_stream.hub.subscribe("late-join")
+        body = sse(subscriber)
+        try:
+            assert [i for i, _ in events(body, BUFFER_SIZE)] == ids
+            assert not subscriber.dropped
+        finally:
+            body.close()
+    assert transcript_stream.hub.subscriber_count() == 0
+
+
+def test_dropped_subscriber_is_sent_what_was_queued():
+    subscriber = Subscriber("slow", 0)
+    subscriber.queue = queue.Queue(3)
+    transcript_stream._Feed._deliver(subscriber, [(i, {"type": "caption"}) for i in range(1, 6)])
+    assert subscriber.dropped
+
+    chunks = list(sse(subscriber))
+    assert [c.split("\n")[0] for c in chunks[1:]] == ["id: 1", "id: 2", "id: 3", "event: dropped"], chunks
+
+
+if __name__ == "__main__":
+    for name, check in list(globals().items()):
+        if name.startswith("test_"):
+            check()
+            print(f"{name}: ok")
+    print("OK")
@@ -0,0 +1,140 @@
+"""
+Worker-mode check for the transcription supervisor – no network needed.
+
+Starts a supervisor whose workers use a fake VideoSDK meeting, starts many
+meetings over the IPC socket, kills one worker and verifies that only its
+meetings move, that it is restarted, that live captions can be read through
+the supervisor, that a meeting whose session fails in its worker is
+forgotten, and that every meeting can be stopped.
+
+Run:  python test_transcription_workers.py [workers] [meetings]
+"""
+
+import os
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+WORKERS  = 4
+MEETINGS = 100
+
+
+class FakeMeeting:
+    """Stands in for videosdk.Meeting: joins after a moment, says one line.
+
+    The first join of every third meeting never completes, to exercise the
+    join timeout and retry.
+    """
+
+    attempts: dict = {}
+
+    def __init__(self, **config):
+        self.meeting_id = config["meeting_id"]
+        self.loop       = config["loop"]
+        self.handlers   = []
+
+    def add_event_listener(self, handler):
+        self.handlers.append(handler)
+
+    def remove_event_listener(self, handler):
+        self.handlers.remove(handler)
+
+    def join(self):
+        attempt = FakeMeeting.attempts[self.meeting_id] = FakeMeeting.attempts.get(self.meeting_id, 0) + 1
+        if attempt == 1 and int(self.meeting_id.rsplit("-", 1)[1]) % 3 == 0:
+            return
+        self.loop.call_later(0.05, lambda: [h.on_meeting_joined({}) for h in self.handlers])
+
+    def start_transcription(self, config=None):
+        if self.meeting_id.startswith("broken"):
+            raise RuntimeError("transcription refused")
+        for handler in self.handlers:
+            handler.on_transcription_text({
+                "participantId": "p1", "participantName": "Doctor",
+                "text": f"hello from {os.getpid()}", "type": "final",
+            })
+
+    def stop_transcription(self):
+        pass
+
+    def leave(self):
+        pass
+
+
+def fake_meeting(**config):
+    return FakeMeeting(**config)
+
+
+def main():
+    import transcription_workers as tw
+    from services.transcription_client import request
+    from services.transcript_store import read
+
+    os.environ["TRANSCRIPTS_DIR"] = tempfile.mkdtemp()
+    os.environ["TRANSCRIPTION_JOIN_TIMEOUT"] = "0.5"
+    os.environ["TRANSCRIPTION_JOIN_BACKOFF"] = "0.1"
+    address = os.path.join(tempfile.mkdtemp(), "workers.sock")
+    key     = b"test-key"
+    tw.SUPERVISE_EVERY = 0.2
+
+    supervisor = tw.Supervisor(WORKERS, "test_transcription_workers:fake_meeting")
+    threading.Thread(target=tw.serve, args=(address, key, supervisor), daemon=True).start()
+    time.sleep(0.5)
+    call = lambda *args: request(address, key, *args)
+
+    ids = [f"meeting-{i}" for i in range(MEETINGS)]
+    assert all(call("start", m, "token") for m in ids)
+    assert call("start", ids[0], "token") is False, "double start must be a no-op"
+
+    before = call("status")
+    print("per worker:", sorted(Counter(before["meetings"].values()).items()))
+
+    victim = before["meetings"][ids[0]]
+    os.kill(before["workers"][victim], signal.SIGKILL)
+    time.sleep(tw.RESTART_BACKOFF + 1)
+
+    after = call("status")
+    moved = [m for m in ids if after["meetings"][m] != before["meetings"][m]]
+    assert all(before["meetings"][m] == victim for m in moved), "only the victim's meetings move"
+    assert victim not in after["meetings"].values()
+    assert after["workers"][victim] != before["workers"][victim], "victim restarted"
+    print(f"killed worker {victim}: {len(moved)} meetings re-homed, new pid {after['workers'][victim]}")
+
+    time.sleep(1)
+    metrics = call("metrics")
+    retried = [m for m in ids if metrics[m]["joinAttempts"] > 1]
+    assert all(m in metrics and "firstTranscriptSeconds" in metrics[m] for m in ids), "every bot heard text"
+    print(f"startup: {len(retried)} meetings needed a second join, "
+          f"max time to first text {max(v['firstTranscriptSeconds'] for v in metrics.values())}s")
+
+    assert call("start", "broken-1", "token")
+    time.sleep(tw.SUPERVISE_EVERY * 3 + 0.5)
+    assert "broken-1" not in call("status")["meetings"], "a failed session is forgotten"
+    assert call("start", "broken-1", "token"), "and can be started again"
+    call("stop", "broken-1")
+    print("failed session dropped from the supervisor")
+
+    captions = call("captions", ids[0], None, 0)
+    assert any(e["type"] == "caption" for _, e in captions), "captions reach the API"
+    assert call("captions", ids[0], None, captions[-1][0]) == [], "nothing after the last event id"
+
+    paths = [call("stop", m) for m in ids]
+    assert all(paths), "every meeting has a transcript"
+    assert call("captions", ids[0], None, captions[-1][0])[-1][1] == {"type": "session", "state": "ended"}
+    assert call("stop", ids[0]) is None, "double stop must be a no-op"
+    for record in read(os.environ["TRANSCRIPTS_DIR"], ids[0]):
+        print(record)
+
+    supervisor.close()
+    print("OK")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        WORKERS = int(sys.argv[1])
+    if len(sys.argv) > 2:
+        MEETINGS = int(sys.argv[2])
+    main()
@@ -0,0 +1,156 @@
+"""
+VideoSDK client check against a local stub API – no network needed.
+
+Starts a keep-alive HTTP/1.1 stub of the rooms endpoint and verifies that
+room creation reuses pooled connections, retries 503s and refused
+connections, honours Retry-After, never retries a timed-out or dropped
+(non-idempotent) create, retries a dropped deactivate, gives up after
+VIDEOSDK_RETRIES, and records latency/error metrics.
+
+Run:  python test_videosdk_client.py [calls]
+"""
+
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CALLS = 200
+
+
+class StubAPI(BaseHTTPRequestHandler):
+    """``POST /v2/rooms``; behaviour for the next requests is queued in ``plan``."""
+
+    protocol_version = "HTTP/1.1"           # keep-alive
+    disable_nagle_algorithm = True          # headers and body go out as separate writes
+    connections = 0
+    requests = 0
+    plan: list = []                         # "ok" | "503" | "429" | "drop" | "stall"
+    lock = threading.Lock()
+
+    def setup(self):
+        super().setup()
+        with StubAPI.lock:
+            StubAPI.connections += 1
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        with StubAPI.lock:
+            StubAPI.requests += 1
+            action = StubAPI.plan.pop(0) if StubAPI.plan else "ok"
+        if action == "drop":
+            self.close_connection = True
+            self.connection.shutdown(2)
+            return
+        if action == "stall":
+            time.sleep(1.5)
+        if action in ("503", "429"):
+            self._reply(int(action), {"error": "busy"}, {"Retry-After": "0.1"} if action == "429" else {})
+        else:
+            self._reply(200, {"roomId": f"room-{StubAPI.requests}"})
+
+    def _reply(self, status, body, headers=()):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in dict(headers).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def expect_failure(call, exc_type):
+    try:
+        call()
+    except exc_type:
+        return
+    raise AssertionError(f"expected {exc_type.__name__}")
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    os.environ["VIDEOSDK_API_ENDPOINT"] = f"http://127.0.0.1:{server.server_port}/v2/rooms"
+    os.environ["VIDEOSDK_READ_TIMEOUT"]  = "0.5"
+    os.environ["VIDEOSDK_BACKOFF"]       = "0.05"
+    os.environ.setdefault("VIDEOSDK_API_KEY", "key")
+    os.environ.setdefault("VIDEOSDK_SECRET_KEY", "secret")
+
+    import requests
+    from flask import Flask
+    from config import Config
+    from services import videosdk
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+
+    with app.app_context():
+        started = time.perf_counter()
+        rooms = [videosdk.create_room() for _ in range(CALLS)]
+        elapsed = time.perf_counter() - started
+        assert len(set(rooms)) == CALLS
+        assert StubAPI.connections == 1, f"{StubAPI.connections} connections for sequential calls"
+        print(f"{CALLS} rooms over {StubAPI.connections} connection(s), {elapsed / CALLS * 1000:.2f} ms per call")
+
+        StubAPI.plan = ["503", "429", "ok"]
+        assert videosdk.create_room()
+        print("retried 503 and 429 (Retry-After)")
+
+        before = StubAPI.requests
+        StubAPI.plan = ["drop", "ok"]
+        expect_failure(videosdk.create_room, requests.ConnectionError)
+        assert StubAPI.requests == before + 1, "a create on a dropped connection must not be repeated"
+        StubAPI.plan = ["drop", "ok"]
+        videosdk.deactivate_room("room-1")
+        assert StubAPI.requests == before + 3, "an idempotent call is repeated"
+        print("dropped connection: create raised, deactivate retried")
+
+        refused = socket.socket()
+        refused.bind(("127.0.0.1", 0))
+        port = refused.getsockname()[1]
+        refused.close()                             # nothing listens there now
+        app.config["VIDEOSDK_API_ENDPOINT"] = f"http://127.0.0.1:{port}/v2/rooms"
+        expect_failure(videosdk.create_room, requests.ConnectionError)
+        assert videosdk.metrics()["create_room"]["retries"] >= 2 + Config.VIDEOSDK_RETRIES, "refused connects are retried"
+        app.config["VIDEOSDK_API_ENDPOINT"] = os.environ["VIDEOSDK_API_ENDPOINT"]
+        print("refused connection retried for a create")
+
+        before = StubAPI.requests
+        StubAPI.plan = ["stall"]
+        expect_failure(videosdk.create_room, requests.ReadTimeout)
+        assert StubAPI.requests == before + 1, "a timed-out create must not be repeated"
+        print("read timeout raised without retrying the create")
+
+        StubAPI.plan = ["503"] * (Config.VIDEOSDK_RETRIES + 1)
+        expect_failure(videosdk.create_room, requests.HTTPError)
+        print(f"gave up after {Config.VIDEOSDK_RETRIES} retries")
+
+        def create_in_context():
+            with app.app_context():
+                videosdk.create_room()
+
+        threads = [threading.Thread(target=create_in_context) for _ in range(50)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        print(f"50 concurrent calls, {StubAPI.connections} connections opened in total")
+
+        stats = videosdk.metrics()["create_room"]
+        print("metrics:", stats)
+        assert stats["calls"] == CALLS + 55 and stats["errors"] == 4 and stats["retries"] >= 6
+
+    server.shutdown()
+    print("OK")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        CALLS = int(sys.argv[1])
+    main()
@@ -1,15 +1,31 @@
 """
 Transcription Bot – joins a VideoSDK meeting as a headless participant
-and saves realtime transcription text to a file.
+and saves realtime transcription to the meeting's JSONL transcript
+(services/transcript_store.py).
+
+All meetings run as tasks on one shared event loop thread, so thread count
+and memory stay flat however many consultations are being transcribed.
+Transcription starts as soon as the SDK reports the bot has joined; a join
+that does not complete within ``TRANSCRIPTION_JOIN_TIMEOUT`` is retried
+with backoff.
 
 Reference: https://docs.videosdk.live/python/guide/video-and-audio-calling/
            transcription-and-summary/realtime-transcribe-meeting
 """
 
 import asyncio
+import atexit
 import os
+import random
 import threading
-from datetime import datetime
+import time
+from collections import OrderedDict
+from flask import current_app, has_app_context
+from config import Config
+from services import transcript_index
+from services.transcript_stream import CaptionBuffer
+from services.transcript_stabilizer import UtteranceStabilizer
+from services.transcript_store import TranscriptLog
 from videosdk import (
     MeetingConfig,
     VideoSDK,
@@ -19,111 +35,240 @@ from videosdk import (
 )
 
 # ── Directory where transcript files are stored ──
-TRANSCRIPTS_DIR = os.path.join(os.path.dirname(__file__), "transcripts")
-os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
+TRANSCRIPTS_DIR = Config.TRANSCRIPTS_DIR
+
+# ── Shared bot runtime: one event loop thread hosts every meeting session ──
+STOP_TIMEOUT = 10                   # seconds stop() waits for the bot to leave
+METRICS_KEPT = 1000                 # startup metrics remembered (most recent meetings)
+CAPTIONS_KEPT = 1000                # caption buffers remembered (most recent meetings)
+
+_loop = None                        # the runtime's asyncio loop (created on first start)
+_loop_lock = threading.Lock()
+_running: set = set()               # meeting_ids started and not yet stopped
+_running_lock = threading.Lock()
+
+# Replaceable for tests (worker mode accepts a dotted path, see transcription_workers)
+init_meeting = VideoSDK.init_meeting
 
-# ── keep track of active sessions so we can stop them later ──
+# Touched only from the runtime loop
 active_sessions: dict = {}          # meeting_id  →  meeting object
-_loops: dict = {}                   # meeting_id  →  asyncio loop
-_files: dict = {}                   # meeting_id  →  file path
+_tasks: dict = {}                   # meeting_id  →  asyncio.Task running the session
+_logs: dict = {}                    # meeting_id  →  TranscriptLog
+_handlers: dict = {}                # meeting_id  →  TranscriptionEventHandler
 
+# Startup latency per meeting, read from other threads via metrics()
+_metrics: OrderedDict = OrderedDict()   # meeting_id  →  {"joinAttempts", "joinSeconds", "firstTranscriptSeconds"}
+_metrics_lock = threading.Lock()
 
-def _get_transcript_path(meeting_id: str) -> str:
-    """Return the path such as  transcripts/<meeting_id>_<timestamp>.txt"""
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    return os.path.join(TRANSCRIPTS_DIR, f"{meeting_id}_{ts}.txt")
+# Live caption events per meeting, read from other threads via captions()
+_captions: OrderedDict = OrderedDict()  # meeting_id  →  CaptionBuffer (kept after stop for late readers)
+_captions_lock = threading.Lock()
 
 
-def _append(meeting_id: str, line: str):
-    """Append a timestamped line to the meeting's transcript file."""
-    path = _files.get(meeting_id)
-    if not path:
+def _append(meeting_id: str, kind: str, text: str, **fields):
+    """Append a record to the meeting's (buffered) transcript; finalized
+    utterances are also queued for cross-meeting search."""
+    log = _logs.get(meeting_id)
+    if not log:
         return
-    ts = datetime.now().strftime("%H:%M:%S")
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(f"[{ts}] {line}\n")
+    try:
+        record = log.append(kind, text, **fields)
+    except ValueError:
+        return                      # late event racing with stop() – meeting is over
+    if kind == "text" and record["final"]:
+        transcript_index.index_utterance(meeting_id, log.epoch, record)
+
+
+def _open_captions(meeting_id: str):
+    """Create the meeting's caption buffer (a rejoin keeps the existing one)."""
+    with _captions_lock:
+        if meeting_id not in _captions:
+            _captions[meeting_id] = CaptionBuffer()
+        _captions.move_to_end(meeting_id)
+        while len(_captions) > CAPTIONS_KEPT:
+            _captions.popitem(last=False)
+
+
+def _caption(meeting_id: str, kind: str, **data):
+    """Publish a live event to the meeting's SSE subscribers."""
+    buffer = _captions.get(meeting_id)
+    if buffer:
+        buffer.push(kind, **data)
 
 
 # ──────────────────── EVENT HANDLER ────────────────────
 class TranscriptionEventHandler(MeetingEventHandler):
-    """Handles transcription-related meeting events."""
+    """Handles transcription-related meeting events.
+
+    Interim hypotheses go through an :class:`UtteranceStabilizer`; only
+    finalized utterances reach the transcript. Live captions get both.
+    """
 
-    def __init__(self, meeting_id: str):
+    def __init__(self, meeting_id: str, requested_at: float):
         super().__init__()
         self._meeting_id = meeting_id
+        self._stabilizer = UtteranceStabilizer()
+        self.requested_at = requested_at       # time.monotonic() of start()
+        self._heard = False
+        self.joined = asyncio.Event()
+        self.join_error = None
+
+    def _write(self, utterances):
+        for u in utterances:
+            _append(self._meeting_id, "text", u.text, speaker=u.name,
+                    participant_id=u.participant_id, started_at=u.started)
+            _caption(self._meeting_id, "caption", speaker=u.name,
+                     participantId=u.participant_id, text=u.text, final=True)
+
+    def flush_idle(self):
+        """Write utterances that stopped being revised."""
+        self._write(self._stabilizer.flush_idle())
+
+    def flush(self):
+        """Write everything still pending (meeting stopped)."""
+        self._write(self._stabilizer.flush())
+
+    def on_meeting_joined(self, data):
+        self.joined.set()
+
+    def on_error(self, data):
+        print(f"\n[Transcription Bot] Error in meeting {self._meeting_id}: {data}\n")
+        if not self.joined.is_set():
+            self.join_error = data              # fail this join attempt early
+            self.joined.set()
 
     def on_transcription_state_changed(self, data):
-        msg = f"State changed → {data}"
-        print(f"\n[Transcription] {msg}\n")
-        _append(self._meeting_id, msg)
+        print(f"\n[Transcription] State changed → {data}\n")
+        _append(self._meeting_id, "state", str(data))
+        _caption(self._meeting_id, "state", state=str(data))
 
     def on_transcription_text(self, data):
         print(f"\n[Transcription] {data}\n")
+        if not self._heard:
+            self._heard = True
+            _record(self._meeting_id, firstTranscriptSeconds=round(time.monotonic() - self.requested_at, 3))
         # data is typically a dict with keys like participantName, text, etc.
         if isinstance(data, dict):
-            name = data.get("participantName", "Unknown")
-            text = data.get("text", str(data))
-            _append(self._meeting_id, f"{name}: {text}")
+            name  = data.get("participantName", "Unknown")
+            text  = data.get("text", str(data))
+            final = data.get("type") == "final" or bool(data.get("isFinal"))
+            if not final:
+                _caption(self._meeting_id, "caption", speaker=name,
+                         participantId=data.get("participantId"), text=text, final=False)
+            self._write(self._stabilizer.feed(data.get("participantId") or name, name, text, final))
         else:
-            _append(self._meeting_id, str(data))
+            _append(self._meeting_id, "text", str(data))
+            _caption(self._meeting_id, "caption", speaker=None, participantId=None, text=str(data), final=True)
 
 
 # ──────────────────── ASYNC CORE ────────────────────
-async def _start_bot(meeting_id: str, token: str):
-    """Initialise meeting, join, wait, then start transcription."""
-
-    # Create the transcript file for this meeting
-    _files[meeting_id] = _get_transcript_path(meeting_id)
-    _append(meeting_id, f"=== Transcript for meeting {meeting_id} ===\n")
-
-    meeting = VideoSDK.init_meeting(
-        **MeetingConfig(
-            meeting_id=meeting_id,
-            name="Transcription Bot",
-            mic_enabled=False,
-            webcam_enabled=False,
-            token=token,
+def _record(meeting_id: str, **values):
+    with _metrics_lock:
+        _metrics.setdefault(meeting_id, {}).update(values)
+        _metrics.move_to_end(meeting_id)
+        while len(_metrics) > METRICS_KEPT:
+            _metrics.popitem(last=False)
+
+
+def _join_settings() -> tuple:
+    """(timeout, retries, backoff) from the app config, or Config in a worker process."""
+    config = current_app.config if has_app_context() else vars(Config)
+    return (float(config.get("TRANSCRIPTION_JOIN_TIMEOUT", Config.TRANSCRIPTION_JOIN_TIMEOUT)),
+            int(config.get("TRANSCRIPTION_JOIN_RETRIES", Config.TRANSCRIPTION_JOIN_RETRIES)),
+            float(config.get("TRANSCRIPTION_JOIN_BACKOFF", Config.TRANSCRIPTION_JOIN_BACKOFF)))
+
+
+async def _join(meeting_id: str, token: str, handler: "TranscriptionEventHandler", settings: tuple):
+    """Join the meeting, waiting for the SDK's joined event; retry with backoff."""
+    timeout, retries, backoff = settings
+    for attempt in range(1, retries + 2):
+        handler.joined.clear()
+        handler.join_error = None
+        meeting = init_meeting(
+            **MeetingConfig(
+                meeting_id=meeting_id,
+                name="Transcription Bot",
+                mic_enabled=False,
+                webcam_enabled=False,
+                token=token,
+                loop=asyncio.get_running_loop(),
+            )
         )
-    )
+        meeting.add_event_listener(handler)
+        active_sessions[meeting_id] = meeting
+        meeting.join()
+
+        try:
+            await asyncio.wait_for(handler.joined.wait(), timeout)
+            error = handler.join_error
+        except asyncio.TimeoutError:
+            error = f"not joined after {timeout}s"
+        if error is None:
+            _record(meeting_id, joinAttempts=attempt,
+                    joinSeconds=round(time.monotonic() - handler.requested_at, 3))
+            return meeting
+
+        active_sessions.pop(meeting_id, None)
+        meeting.remove_event_listener(handler)
+        meeting.leave()
+        if attempt > retries:
+            raise RuntimeError(f"Could not join meeting {meeting_id}: {error}")
+        delay = backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+        print(f"\n[Transcription Bot] Join attempt {attempt} for {meeting_id} failed ({error}), "
+              f"retrying in {delay:.1f}s\n")
+        await asyncio.sleep(delay)
 
-    meeting.add_event_listener(TranscriptionEventHandler(meeting_id))
-    meeting.join()
 
-    # Give a few seconds for the meeting to fully connect
-    await asyncio.sleep(5)
+async def _run_session(meeting_id: str, token: str, requested_at: float, settings: tuple):
+    """Join, start transcription, then finalize idle utterances until cancelled."""
+
+    # Open (or continue, on a rejoin) the meeting's transcript
+    os.makedirs(TRANSCRIPTS_DIR, exist_ok=True)
+    log = _logs[meeting_id] = TranscriptLog(TRANSCRIPTS_DIR, meeting_id,
+                                            segment_bytes=Config.TRANSCRIPT_SEGMENT_BYTES,
+                                            codec=Config.TRANSCRIPT_COMPRESSION)
+    _append(meeting_id, "session", "started")
+    _open_captions(meeting_id)
+    _caption(meeting_id, "session", state="started")
+
+    handler = _handlers[meeting_id] = TranscriptionEventHandler(meeting_id, requested_at)
+    meeting = await _join(meeting_id, token, handler, settings)
 
     config = TranscriptionConfig()
     meeting.start_transcription(config)
 
-    active_sessions[meeting_id] = meeting
     print(f"\n[Transcription Bot] Transcription started for meeting: {meeting_id}")
-    print(f"[Transcription Bot] Saving to: {_files[meeting_id]}\n")
+    print(f"[Transcription Bot] Saving to: {log.path}\n")
 
+    # Finalize utterances when a speaker falls silent, not only when the next one starts
+    while True:
+        await asyncio.sleep(1)
+        handler.flush_idle()
 
-def _run_loop(meeting_id: str, token: str):
-    """Run the async bot inside its own event-loop (called from a thread)."""
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-    _loops[meeting_id] = loop
-    loop.run_until_complete(_start_bot(meeting_id, token))
-    loop.run_forever()
 
+def _spawn(meeting_id: str, token: str, requested_at: float, settings: tuple):
+    """Create the session task (runs on the runtime loop)."""
+    task = _tasks[meeting_id] = asyncio.get_running_loop().create_task(
+        _run_session(meeting_id, token, requested_at, settings))
+    task.add_done_callback(lambda t: _on_session_done(meeting_id, t))
 
-# ──────────────────── PUBLIC API ────────────────────
-def start(meeting_id: str, token: str):
-    """Spawn a daemon thread that joins the meeting and starts transcription."""
-    thread = threading.Thread(
-        target=_run_loop,
-        args=(meeting_id, token),
-        daemon=True,
-    )
-    thread.start()
-    print(f"\n[Transcription Bot] Launching for meeting: {meeting_id}\n")
 
+def _on_session_done(meeting_id: str, task: asyncio.Task):
+    """A session that died on its own is torn down so it can be started again."""
+    if task.cancelled() or _tasks.get(meeting_id) is not task:
+        return
+    print(f"\n[Transcription Bot] Session for {meeting_id} failed: {task.exception()!r}\n")
+    with _running_lock:
+        _running.discard(meeting_id)
+    asyncio.get_running_loop().create_task(_stop_session(meeting_id))
 
-def stop(meeting_id: str) -> str | None:
-    """Stop transcription, leave the meeting, return the transcript file path."""
-    transcript_path = _files.pop(meeting_id, None)
+
+async def _stop_session(meeting_id: str) -> str | None:
+    """Cancel the session task, leave the meeting and close the transcript."""
+    task = _tasks.pop(meeting_id, None)
+    if task:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
 
     meeting = active_sessions.pop(meeting_id, None)
     if meeting:
@@ -131,15 +276,99 @@ def stop(meeting_id: str) -> str | None:
         meeting.leave()
         print(f"\n[Transcription Bot] Stopped for meeting: {meeting_id}\n")
 
-    loop = _loops.pop(meeting_id, None)
-    if loop and loop.is_running():
-        loop.call_soon_threadsafe(loop.stop)
+    handler = _handlers.pop(meeting_id, None)
+    if handler:
+        handler.flush()
+    _caption(meeting_id, "session", state="ended")
+
+    log = _logs.pop(meeting_id, None)
+    if not log:
+        return None
+    # Write final marker and flush whatever is still buffered
+    log.append("session", "ended")
+    return log.close()
+
+
+def _serve(loop: asyncio.AbstractEventLoop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+
+
+def _runtime() -> asyncio.AbstractEventLoop:
+    """Return the shared bot loop, starting its thread on first use."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=_serve, args=(loop,), name="transcription-bots", daemon=True).start()
+            _loop = loop
+        return _loop
+
+
+# ──────────────────── PUBLIC API ────────────────────
+def start(meeting_id: str, token: str) -> bool:
+    """Join the meeting and start transcription on the shared bot loop.
+
+    Thread-safe and idempotent: returns False if a bot is already running
+    for *meeting_id*.
+    """
+    loop = _runtime()
+    settings = _join_settings()
+    with _running_lock:
+        if meeting_id in _running:
+            return False
+        _running.add(meeting_id)
+        # call_soon_threadsafe is FIFO, so a later stop() always finds the task
+        loop.call_soon_threadsafe(_spawn, meeting_id, token, time.monotonic(), settings)
+    print(f"\n[Transcription Bot] Launching for meeting: {meeting_id}\n")
+    return True
 
+
+def stop(meeting_id: str) -> str | None:
+    """Stop transcription, leave the meeting, return the sealed transcript segment's path.
+
+    Thread-safe and idempotent: returns None if no bot is running.
+    """
+    with _running_lock:
+        if meeting_id not in _running:
+            return None
+        _running.discard(meeting_id)
+        future = asyncio.run_coroutine_threadsafe(_stop_session(meeting_id), _loop)
+
+    transcript_path = future.result(timeout=STOP_TIMEOUT)
     if transcript_path:
-        # Write final marker
-        ts = datetime.now().strftime("%H:%M:%S")
-        with open(transcript_path, "a", encoding="utf-8") as f:
-            f.write(f"\n[{ts}] === Transcription ended ===\n")
         print(f"[Transcription Bot] Transcript saved to: {transcript_path}\n")
-
     return transcript_path
+
+
+@atexit.register
+def stop_all():
+    """Stop every running bot (worker or interpreter shutdown), so pending
+    utterances, the "ended" marker and the segment seal reach the disk."""
+    with _running_lock:
+        meeting_ids = list(_running)
+    for meeting_id in meeting_ids:
+        try:
+            stop(meeting_id)
+        except Exception as e:
+            print(f"[Transcription Bot] Could not stop {meeting_id}: {e!r}")
+
+
+def running() -> list:
+    """Meetings with a live bot; one whose session failed drops out."""
+    with _running_lock:
+        return list(_running)
+
+
+def captions(meeting_id: str, after: int = 0) -> list:
+    """Buffered live caption events of *meeting_id* with an id above *after*,
+    as ``(id, event)`` pairs (see services/transcript_stream.py)."""
+    buffer = _captions.get(meeting_id)
+    return buffer.since(after or 0) if buffer else []
+
+
+def metrics() -> dict:
+    """Startup latency of recent meetings: join attempts, seconds from start()
+    to joined, and seconds from start() to the first transcription event."""
+    with _metrics_lock:
+        return {meeting_id: dict(values) for meeting_id, values in _metrics.items()}
@@ -0,0 +1,408 @@
+"""
+Transcription worker mode – shard live meetings across bot processes.
+
+A single process hosting every bot saturates one core under the GIL once
+hundreds of meetings are live. In worker mode a supervisor runs
+``TRANSCRIPTION_WORKERS`` processes, each with its own shared bot loop (see
+transcription_bot). Meetings are assigned to workers by consistent hashing
+of ``meeting_id``, so adding or losing a worker only moves that worker's
+meetings.
+
+The supervisor restarts crashed workers with backoff and re-joins their
+meetings on the remaining ring. Meetings whose session failed inside a
+worker are forgotten, so they can be started again. The API reaches the
+supervisor over a local socket (services/transcription_client.py). It refuses to start with the default
+``SECRET_KEY``, or on a non-loopback address, unless a dedicated
+``TRANSCRIPTION_WORKER_KEY`` is set.
+
+Run:  TRANSCRIPTION_WORKER_ADDRESS=127.0.0.1:6001 python transcription_workers.py
+"""
+
+import bisect
+import hashlib
+import importlib
+import ipaddress
+import os
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing import AuthenticationError, get_context
+from multiprocessing.connection import Listener
+
+from config import DEFAULT_SECRET_KEY, Config
+from services.transcription_client import authkey, parse_address
+
+VNODES           = 64           # ring points per worker
+CALL_TIMEOUT     = 15           # seconds a worker may take to answer
+SUPERVISE_EVERY  = 1.0          # seconds between liveness checks
+RESTART_BACKOFF  = 1.0          # first restart delay; doubles while a worker keeps crashing
+MAX_BACKOFF      = 30.0
+STABLE_AFTER     = 60.0         # a worker alive this long resets its backoff
+STOPPED_KEPT     = 1000         # stopped meetings whose worker is remembered for late caption reads
+
+
+class HashRing:
+    """Consistent-hash ring of integer worker slots."""
+
+    def __init__(self, vnodes: int = VNODES):
+        self.vnodes = vnodes
+        self._points: list[int] = []
+        self._slots:  list[int] = []
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode()).digest()[:8], "big")
+
+    def add(self, slot: int):
+        for i in range(self.vnodes):
+            point = self._hash(f"worker-{slot}#{i}")
+            at = bisect.bisect(self._points, point)
+            self._points.insert(at, point)
+            self._slots.insert(at, slot)
+
+    def remove(self, slot: int):
+        kept = [(p, s) for p, s in zip(self._points, self._slots) if s != slot]
+        self._points = [p for p, _ in kept]
+        self._slots  = [s for _, s in kept]
+
+    def slot_for(self, key: str):
+        """The slot owning *key*, or None if the ring is empty."""
+        if not self._points:
+            return None
+        at = bisect.bisect(self._points, self._hash(key)) % len(self._points)
+        return self._slots[at]
+
+    def __contains__(self, slot: int) -> bool:
+        return slot in self._slots
+
+
+# ──────────────────── WORKER PROCESS ────────────────────
+def _resolve(path: str):
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _worker_main(conn, meeting_factory: str):
+    """Serve commands from the supervisor until the pipe closes."""
+    import transcription_bot
+    if meeting_factory:
+        transcription_bot.init_meeting = _resolve(meeting_factory)
+
+    while True:
+        try:
+            op, meeting_id, token, after = conn.recv()
+        except (EOFError, OSError):
+            break                                   # supervisor went away
+        try:
+            if op == "start":
+                result = transcription_bot.start(meeting_id, token)
+            elif op == "stop":
+                result = transcription_bot.stop(meeting_id)
+            elif op == "metrics":
+                result = transcription_bot.metrics()
+            elif op == "running":
+                result = transcription_bot.running()
+            elif op == "captions":
+                result = transcription_bot.captions(meeting_id, after)
+            elif op == "ping":
+                result = os.getpid()
+            else:
+                raise ValueError(f"Unknown command {op!r}")
+            conn.send((True, result))
+        except Exception as e:
+            conn.send((False, repr(e)))
+    transcription_bot.stop_all()
+
+
+class _Worker:
+    """Supervisor-side handle on one worker process."""
+
+    def __init__(self, slot: int, ctx, meeting_factory: str):
+        self.slot = slot
+        self.started = time.monotonic()
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child, meeting_factory),
+                                   name=f"transcription-worker-{slot}", daemon=True)
+        self.process.start()
+        child.close()
+        self._lock = threading.Lock()
+
+    def call(self, op: str, meeting_id: str = None, token: str = None, after: int = None):
+        with self._lock:
+            try:
+                self.conn.send((op, meeting_id, token, after))
+                if not self.conn.poll(CALL_TIMEOUT):
+                    self.process.kill()             # hung – let the supervisor replace it
+                    raise TimeoutError(f"Worker {self.slot} did not answer {op!r}")
+                ok, result = self.conn.recv()
+            except (EOFError, OSError) as e:
+                raise ConnectionError(f"Worker {self.slot} is gone") from e
+        if not ok:
+            raise RuntimeError(result)
+        return result
+
+    def close(self, timeout: float = 5):
+        self.conn.close()                           # worker sees EOF and stops its bots
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+
+
+# ──────────────────── SUPERVISOR ────────────────────
+class Supervisor:
+    """Owns the worker processes and the meeting → worker assignment."""
+
+    def __init__(self, workers: int, meeting_factory: str = ""):
+        self._ctx = get_context("spawn")
+        self._meeting_factory = meeting_factory
+        self._lock     = threading.Lock()
+        self._ring     = HashRing()
+        self._workers: dict[int, _Worker] = {}
+        self._meetings: dict[str, list]   = {}      # meeting_id → [slot or None, token, started_at or None]
+        self._backoff: dict[int, float]   = {}      # slot → next restart delay
+        self._restart_at: dict[int, float] = {}     # slot → earliest restart time
+        self._stopped_on: OrderedDict = OrderedDict()   # stopped meeting_id → slot it ran on
+        self._stopped = threading.Event()
+        for slot in range(max(workers, 1)):
+            self._spawn(slot)
+
+    def _spawn(self, slot: int):
+        self._workers[slot] = _Worker(slot, self._ctx, self._meeting_factory)
+        self._ring.add(slot)
+
+    # ── commands ──
+    def start(self, meeting_id: str, token: str) -> bool:
+        with self._lock:
+            if meeting_id in self._meetings:
+                return False
+            slot = self._ring.slot_for(meeting_id)
+            entry = self._meetings[meeting_id] = [slot, token, None]
+            worker = self._workers.get(slot)
+        if worker is None:
+            return True                             # no live worker – placed by supervise()
+        try:
+            worker.call("start", meeting_id, token)
+        except ConnectionError:
+            return True                             # worker crashed – supervise() re-homes it
+        except Exception:
+            with self._lock:
+                self._meetings.pop(meeting_id, None)
+            raise
+        with self._lock:
+            entry[2] = time.monotonic()
+        return True
+
+    def stop(self, meeting_id: str):
+        with self._lock:
+            entry = self._meetings.pop(meeting_id, None)
+            worker = self._workers.get(entry[0]) if entry else None
+            if worker is not None:
+                self._remember_stopped(meeting_id, worker.slot)
+        if worker is None:
+            return None
+        try:
+            return worker.call("stop", meeting_id)
+        except ConnectionError:
+            return None
+
+    def assignments(self) -> dict:
+        """meeting_id → worker slot (None while waiting for a worker)."""
+        with self._lock:
+            return {meeting_id: entry[0] for meeting_id, entry in self._meetings.items()}
+
+    def pids(self) -> dict:
+        with self._lock:
+            return {slot: w.process.pid for slot, w in self._workers.items()}
+
+    def metrics(self) -> dict:
+        """Startup metrics from every live worker, merged."""
+        with self._lock:
+            workers = list(self._workers.values())
+        merged = {}
+        for worker in workers:
+            try:
+                merged.update(worker.call("metrics"))
+            except ConnectionError:
+                pass
+        return merged
+
+    def captions(self, meeting_id: str, after: int) -> list:
+        """Caption events from the worker running (or that last ran) *meeting_id*."""
+        with self._lock:
+            entry = self._meetings.get(meeting_id)
+            slot = entry[0] if entry else self._stopped_on.get(meeting_id)
+            worker = self._workers.get(slot)
+        if worker is None:
+            return []
+        try:
+            return worker.call("captions", meeting_id, after=after)
+        except ConnectionError:
+            return []
+
+    def dispatch(self, op: str, meeting_id: str = None, token: str = None, after: int = None):
+        if op == "start":
+            return self.start(meeting_id, token)
+        if op == "stop":
+            return self.stop(meeting_id)
+        if op == "metrics":
+            return self.metrics()
+        if op == "captions":
+            return self.captions(meeting_id, after)
+        if op == "status":
+            return {"workers": self.pids(), "meetings": self.assignments()}
+        raise ValueError(f"Unknown command {op!r}")
+
+    # ── supervision ──
+    def supervise(self):
+        """Replace dead workers and re-home their meetings. Called periodically."""
+        now = time.monotonic()
+        with self._lock:
+            for slot, worker in list(self._workers.items()):
+                if worker.process.is_alive():
+                    if now - worker.started >= STABLE_AFTER:
+                        self._backoff.pop(slot, None)
+                    continue
+                print(f"[Transcription Workers] worker {slot} exited ({worker.process.exitcode}), restarting")
+                del self._workers[slot]
+                self._ring.remove(slot)
+                worker.conn.close()
+                delay = self._backoff.get(slot, RESTART_BACKOFF)
+                self._restart_at[slot] = now + delay
+                self._backoff[slot]    = min(delay * 2, MAX_BACKOFF)
+
+            for slot, at in list(self._restart_at.items()):
+                if at <= now:
+                    del self._restart_at[slot]
+                    self._spawn(slot)
+
+            # Meetings whose worker is gone move to their new owner on the ring
+            moves = []
+            for meeting_id, entry in self._meetings.items():
+                if entry[0] not in self._workers:
+                    entry[0] = self._ring.slot_for(meeting_id)
+                    entry[2] = None
+                    if entry[0] is not None:
+                        moves.append((self._workers[entry[0]], meeting_id, entry))
+            workers = list(self._workers.values())
+
+        for worker, meeting_id, entry in moves:
+            if not self._placed(meeting_id, worker):
+                continue                            # stopped (or moved again) meanwhile
+            try:
+                worker.call("start", meeting_id, entry[1])
+            except Exception as e:
+                print(f"[Transcription Workers] could not re-home {meeting_id}: {e}")
+                continue
+            if not self._placed(meeting_id, worker):
+                try:                                # stop() raced the start – undo it
+                    worker.call("stop", meeting_id)
+                except Exception:
+                    pass
+                continue
+            with self._lock:
+                entry[2] = time.monotonic()
+
+        for worker in workers:
+            self._forget_failed(worker)
+
+    def _forget_failed(self, worker: "_Worker"):
+        """Drop meetings *worker* was running whose session has since failed."""
+        asked = time.monotonic()
+        try:
+            running = set(worker.call("running"))
+        except Exception:
+            return                                  # dead or hung – handled as a crash
+        with self._lock:
+            for meeting_id, entry in list(self._meetings.items()):
+                # Only meetings whose start had returned before we asked
+                if (self._workers.get(entry[0]) is worker and entry[2] is not None
+                        and entry[2] < asked and meeting_id not in running):
+                    print(f"[Transcription Workers] session for {meeting_id} ended in worker {worker.slot}")
+                    del self._meetings[meeting_id]
+                    self._remember_stopped(meeting_id, worker.slot)
+
+    def _remember_stopped(self, meeting_id: str, slot: int):
+        """Keep *slot* for late caption reads (caller holds the lock)."""
+        self._stopped_on[meeting_id] = slot
+        self._stopped_on.move_to_end(meeting_id)
+        while len(self._stopped_on) > STOPPED_KEPT:
+            self._stopped_on.popitem(last=False)
+
+    def _placed(self, meeting_id: str, worker: "_Worker") -> bool:
+        """True if *meeting_id* is still running and assigned to *worker*."""
+        with self._lock:
+            entry = self._meetings.get(meeting_id)
+            return entry is not None and self._workers.get(entry[0]) is worker
+
+    def run(self):
+        while not self._stopped.wait(SUPERVISE_EVERY):
+            self.supervise()
+
+    def close(self):
+        """Stop supervision and every worker (their bots leave their meetings)."""
+        self._stopped.set()
+        with self._lock:
+            workers = list(self._workers.values())
+            self._workers.clear()
+            self._meetings.clear()
+        for worker in workers:
+            worker.close()
+
+
+# ──────────────────── IPC SERVER ────────────────────
+def _handle(supervisor: Supervisor, conn):
+    with conn:
+        while True:
+            try:
+                op, meeting_id, token, after = conn.recv()
+            except (EOFError, OSError):
+                return
+            try:
+                conn.send((True, supervisor.dispatch(op, meeting_id, token, after)))
+            except Exception as e:
+                conn.send((False, repr(e)))
+
+
+def check_key(address: str, worker_key: str, secret_key: str):
+    """Refuse a guessable authkey, and SECRET_KEY on the network, without a dedicated key."""
+    if worker_key:
+        return
+    if secret_key == DEFAULT_SECRET_KEY:
+        raise SystemExit("Refusing to start with the default SECRET_KEY: set SECRET_KEY or TRANSCRIPTION_WORKER_KEY")
+    parsed = parse_address(address)
+    if isinstance(parsed, tuple):
+        host = parsed[0]
+        try:
+            loopback = host == "localhost" or ipaddress.ip_address(host).is_loopback
+        except ValueError:
+            loopback = False
+        if not loopback:
+            raise SystemExit(f"Refusing to listen on {host} with SECRET_KEY as the authkey: "
+                             "set TRANSCRIPTION_WORKER_KEY")
+
+
+def serve(address: str, key: bytes, supervisor: Supervisor):
+    """Accept API connections until interrupted."""
+    threading.Thread(target=supervisor.run, name="transcription-supervisor", daemon=True).start()
+    with Listener(parse_address(address), authkey=key) as listener:
+        print(f"[Transcription Workers] {len(supervisor.pids())} workers, listening on {address}")
+        while True:
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                continue
+            threading.Thread(target=_handle, args=(supervisor, conn), daemon=True).start()
+
+
+if __name__ == "__main__":
+    if not Config.TRANSCRIPTION_WORKER_ADDRESS:
+        raise SystemExit("Set TRANSCRIPTION_WORKER_ADDRESS (e.g. 127.0.0.1:6001)")
+    check_key(Config.TRANSCRIPTION_WORKER_ADDRESS, Config.TRANSCRIPTION_WORKER_KEY, Config.SECRET_KEY)
+    supervisor = Supervisor(Config.TRANSCRIPTION_WORKERS, Config.TRANSCRIPTION_MEETING_FACTORY)
+    try:
+        serve(Config.TRANSCRIPTION_WORKER_ADDRESS,
+              authkey(Config.TRANSCRIPTION_WORKER_KEY, Config.SECRET_KEY), supervisor)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.close()
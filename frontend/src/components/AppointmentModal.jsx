@@ -1,7 +1,7 @@
 import { useState, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
 import { CONSULTATION_TYPES, SYMPTOMS, RELATIONS } from "../constants";
-import { getPatients } from "../services/appointment";
+import { getDoctorSlots, getPatients } from "../services/appointment";
 
 function AppointmentModal({ user, doctors = [], onClose, onSubmit }) {
   const navigate = useNavigate();
@@ -62,6 +62,41 @@ function AppointmentModal({ user, doctors = [], onClose, onSubmit }) {
   const [appointmentDate, setAppointmentDate] = useState("");
   const [appointmentTime, setAppointmentTime] = useState("");
 
+  // Free slots of the chosen doctor on the chosen day
+  const [slotInfo, setSlotInfo] = useState(null); // { scheduled, slotMinutes, slots }
+  const [loadingSlots, setLoadingSlots] = useState(false);
+  const [slotError, setSlotError] = useState("");
+
+  useEffect(() => {
+    setAppointmentTime("");
+    setSlotInfo(null);
+    setSlotError("");
+    if (!selectedDoctor || !appointmentDate) return;
+
+    let cancelled = false;
+    setLoadingSlots(true);
+    getDoctorSlots(selectedDoctor, appointmentDate)
+      .then((data) => {
+        if (cancelled) return;
+        setSlotInfo({
+          scheduled: data.scheduled,
+          slotMinutes: data.slotMinutes || 30,
+          slots: data.days?.[0]?.slots || [],
+        });
+      })
+      .catch((err) => !cancelled && setSlotError(err.message || "Could not load available times."))
+      .finally(() => !cancelled && setLoadingSlots(false));
+    return () => { cancelled = true; };
+  }, [selectedDoctor, appointmentDate]);
+
+  // Doctors without weekly hours accept any multiple of their slot length
+  const onSlotGrid = (time) => {
+    if (!slotInfo || !time) return false;
+    if (slotInfo.scheduled) return slotInfo.slots.includes(time);
+    const [h, m] = time.split(":").map(Number);
+    return (h * 60 + m) % slotInfo.slotMinutes === 0;
+  };
+
   // Step 3 – Mobile verification
   const [mobile, setMobile] = useState(user?.phone || "");
   const [otp, setOtp] = useState("");
@@ -76,7 +111,7 @@ function AppointmentModal({ user, doctors = [], onClose, onSubmit }) {
   };
 
   const canProceedStep1 = patientName && relation && patientAge && patientGender;
-  const canProceedStep2 = consultationType && selectedSymptoms.length > 0 && selectedDoctor && appointmentDate && appointmentTime;
+  const canProceedStep2 = consultationType && selectedSymptoms.length > 0 && selectedDoctor && appointmentDate && onSlotGrid(appointmentTime);
 
   const handleSendOtp = () => {
     if (!mobile || mobile.replace(/\D/g, "").length < 10) return alert("Please enter a valid 10-digit mobile number.");
@@ -327,12 +362,44 @@ function AppointmentModal({ user, doctors = [], onClose, onSubmit }) {
                   </div>
                   <div className="dash-form-group">
                     <label>Preferred Time *</label>
-                    <input
-                      type="time"
-                      value={appointmentTime}
-                      onChange={(e) => setAppointmentTime(e.target.value)}
-                      required
-                    />
+                    {!selectedDoctor || !appointmentDate ? (
+                      <select disabled value="">
+                        <option value="">Choose a doctor and date first</option>
+                      </select>
+                    ) : loadingSlots ? (
+                      <select disabled value="">
+                        <option value="">Loading available times…</option>
+                      </select>
+                    ) : slotError ? (
+                      <p className="dash-step-hint" style={{ margin: 0 }}>{slotError}</p>
+                    ) : slotInfo?.scheduled ? (
+                      <select
+                        value={appointmentTime}
+                        onChange={(e) => setAppointmentTime(e.target.value)}
+                        disabled={slotInfo.slots.length === 0}
+                        required
+                      >
+                        <option value="">
+                          {slotInfo.slots.length ? "Select a time…" : "No free slots on this day"}
+                        </option>
+                        {slotInfo.slots.map((t) => (
+                          <option key={t} value={t}>{t}</option>
+                        ))}
+                      </select>
+                    ) : (
+                      <input
+                        type="time"
+                        value={appointmentTime}
+                        step={(slotInfo?.slotMinutes || 30) * 60}
+                        onChange={(e) => setAppointmentTime(e.target.value)}
+                        required
+                      />
+                    )}
+                    {slotInfo && !slotInfo.scheduled && appointmentTime && !onSlotGrid(appointmentTime) && (
+                      <p className="dash-step-hint" style={{ margin: "6px 0 0" }}>
+                        Appointments start every {slotInfo.slotMinutes} minutes from midnight (e.g. 10:00).
+                      </p>
+                    )}
                   </div>
                 </div>
               </>
@@ -269,7 +269,10 @@ function Meeting() {
     try {
       const res = await fetch(`${API_BASE}/api/meeting/generate-summary`, {
         method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
+        headers: {
+          'Content-Type': 'application/json',
+          Authorization: `Bearer ${localStorage.getItem("accessToken")}`,
+        },
         body: JSON.stringify({
           meetingId: id,
           transcript: transcriptRef.current
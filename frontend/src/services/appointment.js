@@ -35,6 +35,10 @@ export const getDoctors = () => apiFetch(`${API_BASE}/doctors`);
 /** Fetch a single doctor */
 export const getDoctor = (id) => apiFetch(`${API_BASE}/doctors/${id}`);
 
+/** Free consultation slots of a doctor, per day, from `from` to `to` (YYYY-MM-DD) */
+export const getDoctorSlots = (id, from, to = from) =>
+  apiFetch(`${API_BASE}/doctors/${id}/slots?from=${from}&to=${to}`);
+
 // ─────────────────────────────────────────────
 //  PATIENT  endpoints
 // ─────────────────────────────────────────────
@@ -97,15 +97,18 @@ export const login = async (credentials) => {
  */
 export const logout = async () => {
   const accessToken = localStorage.getItem("accessToken");
+  const refreshToken = localStorage.getItem("refreshToken");
   
   if (accessToken) {
     try {
+      // Server revokes both tokens
       await fetch(`${API_BASE_URL}/logout`, {
         method: "POST",
         headers: {
           "Authorization": `Bearer ${accessToken}`,
           "Content-Type": "application/json",
         },
+        body: JSON.stringify({ refreshToken }),
       });
     } catch (error) {
       console.error("Logout error:", error);
@@ -140,7 +143,8 @@ export const refreshAccessToken = async () => {
     throw new Error(data.error || "Token refresh failed");
   }
 
-  localStorage.setItem("accessToken", data.accessToken);
+  // Refresh tokens are single-use: store the rotated one
+  saveAuthData(data);
   return data;
 };
 